@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+# Add the project root to sys.path to allow importing fruina
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import fruina
+from fruina.core.blob import AccessHint
+from fruina.peers.shared_fs import SharedFSPeer
+
+PAGE = 4096
+CHUNK = 8 * 1024 * 1024
+
+def drop_cache(path: str, system: bool):
+    """Evict the object file from the page cache so each run starts cold."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    if system:
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("1\n")
+
+def scan(obj, size: int):
+    """Sequential load: touch every page of the mapping."""
+    buf = obj.buffer
+    total = 0
+    for offset in range(0, size, PAGE):
+        total += buf[offset]
+    return total
+
+def probe(obj, size: int, lookups: int):
+    """Embedding-table style access: random page-sized reads."""
+    buf = obj.buffer
+    total = 0
+    for _ in range(lookups):
+        offset = random.randrange(0, size - PAGE) & ~(PAGE - 1)
+        total += len(bytes(buf[offset:offset + PAGE]))
+    return total
+
+def read_direct(obj, size: int):
+    total = 0
+    for offset in range(0, size, CHUNK):
+        total += len(obj.read(CHUNK, offset))
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-cache load time per access hint for SharedFS objects")
+    parser.add_argument("--root", default=None, help="Directory on the filesystem under test (tmpfs has no page cache to drop)")
+    parser.add_argument("--size-mb", type=int, default=1024, help="Object size in MiB")
+    parser.add_argument("--lookups", type=int, default=20000, help="Random page reads for the random pattern")
+    parser.add_argument("--drop-system-caches", action="store_true", help="Also write /proc/sys/vm/drop_caches (root only)")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="fruina_hints_", dir=args.root)
+    try:
+        peer = SharedFSPeer(root)
+        client = fruina.connect(peer)
+        size = args.size_mb * 1024 * 1024
+
+        with client.create() as obj:
+            block = os.urandom(CHUNK)
+            for offset in range(0, size, CHUNK):
+                obj.write(block[:min(CHUNK, size - offset)])
+            obj.seal()
+            object_id = obj.id
+        path = str(peer._data_path(object_id))
+
+        hints = [None, AccessHint.SEQUENTIAL, AccessHint.RANDOM, AccessHint.WILLNEED, AccessHint.DONTNEED]
+        print(f"{'hint':>12} {'sequential(s)':>14} {'random(s)':>10}")
+        for hint in hints:
+            row = []
+            for pattern in (scan, probe):
+                drop_cache(path, args.drop_system_caches)
+                start = time.perf_counter()
+                with client.get(object_id, access_hint=hint) as obj:
+                    pattern(obj, size) if pattern is scan else pattern(obj, size, args.lookups)
+                row.append(time.perf_counter() - start)
+            name = hint.value if hint else "none"
+            print(f"{name:>12} {row[0]:>14.3f} {row[1]:>10.3f}")
+
+        drop_cache(path, args.drop_system_caches)
+        start = time.perf_counter()
+        with client.get(object_id, direct=True) as obj:
+            read_direct(obj, size)
+        print(f"{'o_direct':>12} {time.perf_counter() - start:>14.3f} {'-':>10}")
+    finally:
+        shutil.rmtree(root)
+
+if __name__ == "__main__":
+    main()
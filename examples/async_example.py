@@ -0,0 +1,89 @@
+import sys
+import os
+import time
+import asyncio
+import multiprocessing
+
+sys.path.append(os.getcwd())
+
+import fruina
+from fruina.peers.memory import MemoryPeer
+from fruina.transport.uds import UdsServer
+
+SOCKET_PATH = "/tmp/fruina_example_async.sock"
+NUM_OBJECTS = 200
+CONCURRENT_GETS = 2000
+
+def run_server():
+    """Function to run the server in a separate process."""
+    server = UdsServer(MemoryPeer(), socket_path=SOCKET_PATH)
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+async def run_client():
+    # Everything below shares one pipelined UDS connection
+    async with fruina.connect_async(SOCKET_PATH) as client:
+        print(f"[Client] --- Creating {NUM_OBJECTS} objects ---")
+        ids = []
+        for i in range(NUM_OBJECTS):
+            data = f"sample-{i}".encode()
+            obj = await client.create(size=len(data), meta={"index": i})
+            obj.buffer[:] = data
+            await obj.seal()
+            await obj.release()
+            ids.append(obj.id)
+
+        # A ticker shows the loop is never blocked while gets are in flight
+        ticks = 0
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+        ticking = asyncio.ensure_future(ticker())
+
+        print(f"[Client] --- {CONCURRENT_GETS} concurrent gets ---")
+        start = time.perf_counter()
+        objs = await asyncio.gather(*(client.get(ids[i % NUM_OBJECTS]) for i in range(CONCURRENT_GETS)))
+        elapsed = time.perf_counter() - start
+        ok = all(bytes(obj.buffer) == f"sample-{i % NUM_OBJECTS}".encode() for i, obj in enumerate(objs))
+        await asyncio.gather(*(obj.release() for obj in objs))
+        ticking.cancel()
+        print(f"[Client] {CONCURRENT_GETS} gets in {elapsed:.3f}s, loop ticked {ticks} times: {'SUCCESS' if ok else 'FAILURE'}")
+
+        print("[Client] --- Batched get_many ---")
+        start = time.perf_counter()
+        objs = await client.get_many(ids)
+        elapsed = time.perf_counter() - start
+        ok = all(obj.get_meta("index") == i for i, obj in enumerate(objs))
+        for obj in objs:
+            await obj.release()
+        print(f"[Client] get_many of {len(ids)} objects in {elapsed:.3f}s: {'SUCCESS' if ok else 'FAILURE'}")
+
+        for object_id in ids:
+            await client.delete(object_id)
+
+def main():
+    print("=== Example: asyncio client over UDS ===")
+    server_process = multiprocessing.Process(target=run_server)
+    server_process.start()
+    try:
+        time.sleep(1)
+        asyncio.run(run_client())
+    finally:
+        server_process.terminate()
+        server_process.join()
+        if os.path.exists(SOCKET_PATH):
+            try:
+                os.unlink(SOCKET_PATH)
+            except OSError:
+                pass
+
+if __name__ == "__main__":
+    main()
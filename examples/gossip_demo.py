@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import argparse
+import logging
+
+# Add the project root to sys.path to allow importing fruina
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fruina.peers.memory import MemoryPeer
+from fruina.p2p import DataServer, GossipNode, MemberState, peer_stats
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+def wait_until(predicate, timeout: float) -> float:
+    start = time.monotonic()
+    while not predicate() and time.monotonic() - start < timeout:
+        time.sleep(0.05)
+    return time.monotonic() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="SWIM gossip membership with N nodes on localhost")
+    parser.add_argument("--nodes", type=int, default=8)
+    args = parser.parse_args()
+
+    nodes = []
+    for i in range(args.nodes):
+        peer = MemoryPeer()
+        server = DataServer(peer)
+        server.start()
+        seeds = [nodes[0][2].address] if nodes else []
+        gossip = GossipNode(data_address=server.address, seeds=seeds,
+                            stats=peer_stats(peer, server, capacity_bytes=1 << 30))
+        gossip.start()
+        nodes.append((peer, server, gossip))
+
+    others = lambda skip: [g for i, (_, _, g) in enumerate(nodes) if i not in skip]
+
+    elapsed = wait_until(lambda: all(len(g.alive_members()) == args.nodes for g in others(())), 10)
+    print(f"All {args.nodes} nodes converged in {elapsed:.2f}s")
+
+    # Crash node 1 (no goodbye) and let failure detection find it
+    crashed = nodes[1][2]
+    crashed._stopped.set()
+    for thread in crashed._threads:
+        thread.join()
+    crashed._sock.close()
+    elapsed = wait_until(lambda: all(len(g.alive_members()) == args.nodes - 1 for g in others({1})), 20)
+    print(f"Crashed node declared dead everywhere in {elapsed:.2f}s")
+
+    # Graceful leave is disseminated immediately
+    nodes[2][2].stop()
+    elapsed = wait_until(lambda: all(len(g.alive_members()) == args.nodes - 2 for g in others({1, 2})), 10)
+    print(f"Leaving node dropped out everywhere in {elapsed:.2f}s")
+
+    observer = nodes[0][2]
+    for member in sorted(observer.members.values(), key=lambda m: m.address):
+        print(f"  {member.address:<22} {member.state.value:<8} {member.stats}")
+    holders = [server.address for _, server, _ in nodes]
+    print(f"Fetch order for all holders: {observer.rank(holders)}")
+
+    for i, (_, server, gossip) in enumerate(nodes):
+        if i not in (1, 2):
+            gossip.stop()
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+# Add the project root to sys.path to allow importing fruina
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import fruina
+from fruina.peers.shared_fs import SharedFSPeer
+
+def copy_tobytes(client, object_ids, buffers):
+    """The baseline: materialize bytes from the mapping, then copy them in."""
+    for object_id, buf in zip(object_ids, buffers):
+        with client.get(object_id) as obj:
+            data = obj.buffer.tobytes()
+            buf[:len(data)] = data
+
+def copy_readinto(client, object_ids, buffers):
+    for object_id, buf in zip(object_ids, buffers):
+        with client.get(object_id) as obj:
+            obj.readinto(buf)
+
+def copy_get_into(client, object_ids, buffers):
+    client.get_into(object_ids, buffers)
+
+def main():
+    parser = argparse.ArgumentParser(description="Copying objects into preallocated buffers")
+    parser.add_argument("--backend", choices=["memory", "shared_fs"], default="memory")
+    parser.add_argument("--object-kb", type=int, default=4096, help="Size of each object in KiB")
+    parser.add_argument("--count", type=int, default=64, help="Number of objects")
+    parser.add_argument("--rounds", type=int, default=5, help="Passes over all objects per method")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="fruina_readinto_") if args.backend == "shared_fs" else None
+    try:
+        client = fruina.connect(SharedFSPeer(root)) if root else fruina.connect()
+        size = args.object_kb * 1024
+
+        object_ids = []
+        for _ in range(args.count):
+            with client.create() as obj:
+                obj.write(os.urandom(size))
+                obj.seal()
+                object_ids.append(obj.id)
+        # Preallocated staging buffers, reused on every pass
+        buffers = [bytearray(size) for _ in object_ids]
+
+        total = size * args.count * args.rounds
+        print(f"{'method':>10} {'time(s)':>8} {'GiB/s':>7}")
+        for name, method in (("tobytes", copy_tobytes), ("readinto", copy_readinto), ("get_into", copy_get_into)):
+            method(client, object_ids, buffers)  # warm up
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                method(client, object_ids, buffers)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>10} {elapsed:>8.3f} {total / elapsed / 2**30:>7.2f}")
+
+        with client.get(object_ids[-1]) as obj:
+            assert buffers[-1] == obj.buffer.tobytes()
+    finally:
+        if root:
+            shutil.rmtree(root)
+
+if __name__ == "__main__":
+    main()
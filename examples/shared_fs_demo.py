@@ -23,12 +23,12 @@ def main():
     try:
         # 2. Start 2 Peers pointing to the same directory
         # Peer 1
-        peer1 = SharedFSPeer(shared_dir)
+        peer1 = SharedFSPeer(shared_dir, gc_bucket_seconds=1)
         peer1.start_maintenance(interval=1) # Fast maintenance for demo
         logger.info("Started Peer 1")
 
         # Peer 2
-        peer2 = SharedFSPeer(shared_dir)
+        peer2 = SharedFSPeer(shared_dir, gc_bucket_seconds=1)
         peer2.start_maintenance(interval=1)
         logger.info("Started Peer 2")
 
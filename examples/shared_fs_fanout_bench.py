@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+# Add the project root to sys.path to allow importing fruina
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fruina.core.lease import AccessType
+from fruina.peers.shared_fs import SharedFSPeer
+
+def populate(peer: SharedFSPeer, count: int):
+    """Create `count` empty sealed-object placeholders straight on disk."""
+    ids = []
+    buckets = set()
+    for i in range(count):
+        object_id = f"obj-{i:09d}"
+        path = peer._data_path(object_id)
+        if path.parent not in buckets:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            buckets.add(path.parent)
+        os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o644))
+        ids.append(object_id)
+    return ids
+
+def bench(root: str, count: int, fanout: int, lookups: int):
+    peer = SharedFSPeer(root, fanout=fanout)
+
+    start = time.perf_counter()
+    ids = populate(peer, count)
+    populate_s = time.perf_counter() - start
+
+    sample = random.sample(ids, min(lookups, len(ids)))
+    start = time.perf_counter()
+    for object_id in sample:
+        _, obj = peer.acquire(object_id, AccessType.READ)
+        obj.blobs[0].close()
+    acquire_us = (time.perf_counter() - start) / len(sample) * 1e6
+
+    start = time.perf_counter()
+    peer._full_scan()
+    scan_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    peer._cleanup_zombies()
+    gc_ms = (time.perf_counter() - start) * 1e3
+
+    print(f"{count:>10} {fanout:>6} {populate_s:>12.1f} {acquire_us:>14.1f} {scan_s:>12.1f} {gc_ms:>10.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="SharedFSPeer flat vs fan-out layout benchmark")
+    parser.add_argument("--root", default=None, help="Directory to benchmark in (e.g. an NFS mount)")
+    parser.add_argument("--counts", default="1000000,5000000,10000000", help="Comma separated object counts")
+    parser.add_argument("--fanouts", default="0,2", help="Comma separated fan-out levels to compare")
+    parser.add_argument("--lookups", type=int, default=10000, help="Random READ acquires per run")
+    args = parser.parse_args()
+
+    print(f"{'objects':>10} {'fanout':>6} {'populate(s)':>12} {'acquire(us)':>14} {'scan(s)':>12} {'gc(ms)':>10}")
+    for count in (int(c) for c in args.counts.split(',')):
+        for fanout in (int(f) for f in args.fanouts.split(',')):
+            root = tempfile.mkdtemp(prefix="fruina_fanout_", dir=args.root)
+            try:
+                bench(root, count, fanout, args.lookups)
+            finally:
+                shutil.rmtree(root)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import hashlib
+import argparse
+import logging
+import threading
+
+# Add the project root to sys.path to allow importing fruina
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import fruina
+from fruina.peers.memory import MemoryPeer
+from fruina.p2p import DataServer, Tracker, SwarmDownloader
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("SwarmDemo")
+
+def main():
+    parser = argparse.ArgumentParser(description="One seed, N nodes swarm-downloading the same object")
+    parser.add_argument("--nodes", type=int, default=8)
+    parser.add_argument("--size-mb", type=int, default=128)
+    parser.add_argument("--chunk-mb", type=int, default=4)
+    args = parser.parse_args()
+    size = args.size_mb << 20
+
+    tracker = Tracker()
+    servers = []
+    try:
+        # Seed node holds the only complete copy
+        seed = MemoryPeer()
+        seed_server = DataServer(seed)
+        seed_server.start()
+        servers.append(seed_server)
+
+        data = os.urandom(size)
+        with fruina.connect(seed).create(meta={"kind": "weights"}) as obj:
+            obj.write(data)
+            obj.seal()
+            object_id = obj.id
+        digest = hashlib.sha256(data).hexdigest()
+        tracker.announce(seed_server.address, [(object_id, size)])
+
+        nodes = []
+        for _ in range(args.nodes):
+            peer = MemoryPeer()
+            server = DataServer(peer)
+            server.start()
+            servers.append(server)
+            nodes.append((peer, SwarmDownloader(peer, tracker, server.address, server=server,
+                                                chunk_size=args.chunk_mb << 20, workers=4)))
+
+        # Everybody starts at once
+        errors = []
+        def run(downloader):
+            try:
+                downloader.download(object_id)
+            except Exception as e:
+                errors.append(e)
+        start = time.perf_counter()
+        threads = [threading.Thread(target=run, args=(d,)) for _, d in nodes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        logger.info(f"{args.nodes} nodes fetched {args.size_mb} MiB each in {elapsed:.2f}s")
+        logger.info(f"Seed sent {seed_server.bytes_sent / size:.2f}x the object size "
+                    f"(a plain fan-out would send {args.nodes}x)")
+        for server in servers[1:]:
+            logger.debug(f"{server.address} uploaded {server.bytes_sent >> 20} MiB")
+
+        ok = not errors
+        for peer, _ in nodes:
+            with fruina.connect(peer).get(object_id) as obj:
+                ok = ok and hashlib.sha256(obj.buffer).hexdigest() == digest and obj.get_meta("kind") == "weights"
+        logger.info(f"Verification on all nodes: {'SUCCESS' if ok else 'FAILURE'}")
+
+        holders = tracker.lookup([object_id])[object_id]
+        ok = len(holders["nodes"]) == args.nodes + 1 and not holders["partial"]
+        logger.info(f"Tracker lists every node as a complete holder: {'SUCCESS' if ok else 'FAILURE'}")
+    finally:
+        for server in servers:
+            server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 """Fruina packaging."""
 
 from .interface.client import Client, connect, Object
+from .interface.stream import ObjectWriter
+from .interface.async_client import AsyncClient, AsyncObject, connect_async
+from .core.blob import AccessHint
 from .peers.memory import MemoryPeer
 
-__all__ = ["Client", "connect", "Object", "MemoryPeer", "backends", "transport", "peers"]
+__all__ = ["Client", "connect", "Object", "ObjectWriter", "AsyncClient", "AsyncObject", "connect_async", "AccessHint", "MemoryPeer", "backends", "transport", "peers"]
@@ -1,7 +1,7 @@
 import os
 import mmap
-from typing import Any
-from ..core.blob import Blob, BlobView
+from typing import Any, Optional
+from ..core.blob import Blob, BlobView, AccessHint, fadvise, madvise, writable_bytes, preadv_into
 
 class FileBlob(Blob):
     def __init__(self, path: str):
@@ -73,6 +73,7 @@ class FileBlobView(BlobView):
         self.fd = None
         self._mmap = None
         self._buffer = None
+        self.access_hint: Optional[AccessHint] = None
         
         flags = os.O_RDONLY
         if 'w' in mode or '+' in mode or 'a' in mode:
@@ -88,6 +89,15 @@ class FileBlobView(BlobView):
             os.lseek(self.fd, offset, os.SEEK_SET)
         return os.read(self.fd, size)
 
+    def readinto(self, buf: Any, offset: int = 0) -> int:
+        view = writable_bytes(buf)
+        if self._buffer is not None:
+            # Already mapped: a single memcpy out of the mapping
+            n = max(min(len(view), len(self._buffer) - offset), 0)
+            view[:n] = self._buffer[offset:offset + n]
+            return n
+        return preadv_into(self.fd, view, offset)
+
     def truncate(self, size: int) -> None:
         os.ftruncate(self.fd, size)
         self._close_mmap()
@@ -112,11 +122,19 @@ class FileBlobView(BlobView):
         
         try:
             self._mmap = mmap.mmap(self.fd, 0, flags=flags, prot=prot)
+            if self.access_hint is not None:
+                madvise(self._mmap, self.access_hint)
             self._buffer = memoryview(self._mmap)
             return self._buffer
         except Exception as e:
             raise ValueError(f"Failed to mmap: {e}")
 
+    def advise(self, hint: AccessHint) -> None:
+        self.access_hint = hint
+        fadvise(self.fd, hint)
+        if self._mmap is not None:
+            madvise(self._mmap, hint)
+
     def seal(self) -> None:
         self._close_mmap()
 
@@ -126,6 +144,9 @@ class FileBlobView(BlobView):
     def close(self) -> None:
         self._close_mmap()
         if self.fd is not None:
+            if self.access_hint is AccessHint.DONTNEED:
+                # Drop what this reader pulled into the page cache
+                fadvise(self.fd, AccessHint.DONTNEED)
             try:
                 os.close(self.fd)
             except OSError:
@@ -4,7 +4,7 @@ import mmap
 import time
 import uuid
 from typing import Any, Optional
-from ..core.blob import Blob, BlobView
+from ..core.blob import Blob, BlobView, AccessHint, fadvise, madvise, writable_bytes, preadv_into
 from ..core.lease import Lease, AccessType
 from ..core.object import Object
 
@@ -74,6 +74,7 @@ class MemoryBlobView(BlobView):
         self.mode = mode
         self._mmap = None
         self._buffer = None
+        self.access_hint: Optional[AccessHint] = None
 
     def write(self, data: bytes) -> int:
         return os.write(self.fd, data)
@@ -83,6 +84,15 @@ class MemoryBlobView(BlobView):
             os.lseek(self.fd, offset, os.SEEK_SET)
         return os.read(self.fd, size)
 
+    def readinto(self, buf: Any, offset: int = 0) -> int:
+        view = writable_bytes(buf)
+        if self._buffer is not None:
+            # Already mapped: a single memcpy out of the mapping
+            n = max(min(len(view), len(self._buffer) - offset), 0)
+            view[:n] = self._buffer[offset:offset + n]
+            return n
+        return preadv_into(self.fd, view, offset)
+
     def truncate(self, size: int) -> None:
         os.ftruncate(self.fd, size)
         self._close_mmap()
@@ -107,11 +117,19 @@ class MemoryBlobView(BlobView):
         
         try:
             self._mmap = mmap.mmap(self.fd, 0, flags=flags, prot=prot)
+            if self.access_hint is not None:
+                madvise(self._mmap, self.access_hint)
             self._buffer = memoryview(self._mmap)
             return self._buffer
         except Exception as e:
             raise ValueError(f"Failed to mmap: {e}")
 
+    def advise(self, hint: AccessHint) -> None:
+        self.access_hint = hint
+        fadvise(self.fd, hint)
+        if self._mmap is not None:
+            madvise(self._mmap, hint)
+
     def seal(self) -> None:
         self._close_mmap()
 
@@ -121,6 +139,9 @@ class MemoryBlobView(BlobView):
     def close(self) -> None:
         self._close_mmap()
         if self.fd is not None:
+            if self.access_hint is AccessHint.DONTNEED:
+                # Drop what this reader pulled into the page cache
+                fadvise(self.fd, AccessHint.DONTNEED)
             try:
                 os.close(self.fd)
             except OSError:
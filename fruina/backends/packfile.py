@@ -0,0 +1,326 @@
+import os
+import mmap
+import time
+import struct
+import threading
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional
+from ..core.blob import Blob
+from .shared_fs import encode_meta, decode_meta
+
+logger = logging.getLogger(__name__)
+
+# Segment files start with a small header so no entry ever sits at offset 0,
+# and entries are aligned so mapped views of them are usable as typed arrays.
+SEGMENT_MAGIC = b'FRUINAPK'
+SEGMENT_HEADER_SIZE = 64
+PACK_ALIGNMENT = 64
+
+# Index Record: Kind(B), Timestamp(d), Generation(H), Offset(Q), Length(Q), ExpiresAt(d), IdLen(H), MetaLen(I)
+# followed by the object id and the meta (header v2 binary encoding).
+RECORD_STRUCT = struct.Struct("!BdHQQdHI")
+RECORD_PUT = 1
+RECORD_DELETE = 2
+RECORD_SEAL = 3  # writer rolled over; the segment will not grow any more
+
+PACK_SUFFIX = '.pack'
+INDEX_SUFFIX = '.idx'
+RETIRED_SUFFIX = '.retired'
+
+class PackEntry(NamedTuple):
+    segment: str
+    offset: int
+    length: int
+    expires_at: float
+    timestamp: float
+    generation: int
+    meta: Dict[str, Any]
+
+    def is_expired(self, now: float) -> bool:
+        return self.expires_at > 0 and self.expires_at <= now
+
+class PackBlob(Blob):
+    """
+    A read-only Blob over one object's region of a pack segment.
+    """
+    def __init__(self, path: str, offset: int, length: int):
+        self.path = path
+        self.offset = offset
+        self.length = length
+
+    def write(self, data: bytes) -> int:
+        raise IOError("Packed objects are read-only")
+
+    def read(self, size: int = -1, offset: int = 0) -> bytes:
+        if size < 0 or offset + size > self.length:
+            size = max(self.length - offset, 0)
+        fd = os.open(self.path, os.O_RDONLY)
+        try:
+            return os.pread(fd, size, self.offset + offset)
+        finally:
+            os.close(fd)
+
+    def truncate(self, size: int) -> None:
+        raise IOError("Packed objects are read-only")
+
+    def memoryview(self, mode: str = "rb") -> memoryview:
+        if self.length == 0:
+            return memoryview(b"")
+        start = self.offset - self.offset % mmap.ALLOCATIONGRANULARITY
+        with open(self.path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), self.offset + self.length - start, offset=start, prot=mmap.PROT_READ)
+        return memoryview(mm)[self.offset - start:]
+
+    def seal(self) -> None:
+        pass
+
+    def get_handle(self) -> Dict[str, Any]:
+        return {
+            'type': 'shared_fs',
+            'path': self.path,
+            'data_offset': self.offset,
+            'length': self.length,
+        }
+
+    def close(self) -> None:
+        pass
+
+    def delete(self) -> None:
+        pass
+
+class PackStore:
+    """
+    Append-only packfile storage for small sealed objects on a shared
+    filesystem.
+
+    Each node appends to its own active segment `<node>.<seq>.pack` and
+    logs PUT/DELETE records to the matching `.idx` file, so no two nodes
+    ever append to the same file. Readers build an in-memory index from
+    all `.idx` files and only read the tails that grew since the last
+    refresh. For each object the record with the highest
+    (timestamp, generation) wins, so compaction can relocate an entry
+    without resurrecting a later delete.
+    """
+    def __init__(self, pack_dir: Path, node_id: str, segment_size: int = 256 * 1024 * 1024):
+        self.pack_dir = pack_dir
+        self.node_id = node_id
+        self.segment_size = segment_size
+        self.pack_dir.mkdir(parents=True, exist_ok=True)
+
+        self._index: Dict[str, PackEntry] = {}
+        self._tombstones: Dict[str, float] = {}
+        self._consumed: Dict[str, int] = {}  # segment -> bytes of its .idx already applied
+        self._sealed = set()
+        self._seq = 0
+        self._active: Optional[str] = None
+        self._pack_fd: Optional[int] = None
+        self._idx_fd: Optional[int] = None
+        self._active_size = 0
+        self._lock = threading.RLock()
+
+    def segment_path(self, segment: str) -> Path:
+        return self.pack_dir / f"{segment}{PACK_SUFFIX}"
+
+    def _index_path(self, segment: str) -> Path:
+        return self.pack_dir / f"{segment}{INDEX_SUFFIX}"
+
+    # --- Writing ---
+
+    def _open_segment(self):
+        self._seq += 1
+        self._active = f"{self.node_id}.{self._seq:06d}"
+        self._pack_fd = os.open(self.segment_path(self._active), os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+        os.pwrite(self._pack_fd, SEGMENT_MAGIC.ljust(SEGMENT_HEADER_SIZE, b'\0'), 0)
+        self._active_size = SEGMENT_HEADER_SIZE
+        self._idx_fd = os.open(self._index_path(self._active), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _close_segment(self):
+        if self._active is None:
+            return
+        self._sealed.add(self._active)
+        self._append_record(RECORD_SEAL, "", 0, 0, 0, 0.0, time.time(), {})
+        os.close(self._pack_fd)
+        os.close(self._idx_fd)
+        self._active = self._pack_fd = self._idx_fd = None
+
+    def _append_record(self, kind: int, object_id: str, generation: int, offset: int, length: int,
+                       expires_at: float, timestamp: float, meta: Dict[str, Any]):
+        oid = object_id.encode('utf-8')
+        meta_bytes = encode_meta(meta) if meta else b''
+        record = RECORD_STRUCT.pack(kind, timestamp, generation, offset, length, expires_at, len(oid), len(meta_bytes))
+        os.write(self._idx_fd, record + oid + meta_bytes)
+
+    def put(self, object_id: str, data, meta: Dict[str, Any], expires_at: float = 0.0,
+            timestamp: Optional[float] = None, generation: int = 0) -> PackEntry:
+        """Append data (any buffer) for object_id to this node's active segment."""
+        with self._lock:
+            length = len(data)
+            if self._active is None or self._active_size + length > self.segment_size:
+                self._close_segment()
+                self._open_segment()
+
+            offset = (self._active_size + PACK_ALIGNMENT - 1) & ~(PACK_ALIGNMENT - 1)
+            os.pwrite(self._pack_fd, data, offset)
+            self._active_size = offset + length
+
+            timestamp = time.time() if timestamp is None else timestamp
+            self._append_record(RECORD_PUT, object_id, generation, offset, length, expires_at, timestamp, meta)
+            entry = PackEntry(self._active, offset, length, expires_at, timestamp, generation, meta)
+            self._apply_put(object_id, entry)
+            # Our own records are already applied
+            self._consumed[self._active] = os.fstat(self._idx_fd).st_size
+            return entry
+
+    def delete(self, object_id: str):
+        with self._lock:
+            if self._active is None:
+                self._open_segment()
+            timestamp = time.time()
+            self._append_record(RECORD_DELETE, object_id, 0, 0, 0, 0.0, timestamp, {})
+            self._consumed[self._active] = os.fstat(self._idx_fd).st_size
+            self._apply_delete(object_id, timestamp)
+
+    def close(self):
+        with self._lock:
+            self._close_segment()
+
+    # --- Index ---
+
+    def _apply_put(self, object_id: str, entry: PackEntry):
+        if self._tombstones.get(object_id, -1.0) >= entry.timestamp:
+            return
+        current = self._index.get(object_id)
+        if current is None or (entry.timestamp, entry.generation) >= (current.timestamp, current.generation):
+            self._index[object_id] = entry
+
+    def _apply_delete(self, object_id: str, timestamp: float):
+        if self._tombstones.get(object_id, -1.0) < timestamp:
+            self._tombstones[object_id] = timestamp
+        current = self._index.get(object_id)
+        if current is not None and current.timestamp <= timestamp:
+            del self._index[object_id]
+
+    def lookup(self, object_id: str) -> Optional[PackEntry]:
+        entry = self._index.get(object_id)
+        if entry is not None and entry.is_expired(time.time()):
+            return None
+        return entry
+
+    def refresh(self):
+        """Apply records appended to any segment index since the last refresh."""
+        with self._lock:
+            present = set()
+            with os.scandir(self.pack_dir) as it:
+                indexes = [e for e in it if e.name.endswith(INDEX_SUFFIX) and not e.name.startswith('.')]
+            for entry in indexes:
+                segment = entry.name[:-len(INDEX_SUFFIX)]
+                present.add(segment)
+                try:
+                    size = entry.stat().st_size
+                except FileNotFoundError:
+                    continue
+                consumed = self._consumed.get(segment, 0)
+                if size > consumed:
+                    self._consumed[segment] = consumed + self._read_records(segment, consumed)
+
+            # Drop entries whose segment was retired by compaction
+            for segment in [s for s in self._consumed if s not in present and s != self._active]:
+                del self._consumed[segment]
+                self._sealed.discard(segment)
+                for object_id in [o for o, e in self._index.items() if e.segment == segment]:
+                    del self._index[object_id]
+
+    def _read_records(self, segment: str, start: int) -> int:
+        """Parse complete records from `start`; returns the bytes consumed."""
+        try:
+            with open(self._index_path(segment), 'rb') as f:
+                f.seek(start)
+                buf = f.read()
+        except FileNotFoundError:
+            return 0
+
+        pos = 0
+        while pos + RECORD_STRUCT.size <= len(buf):
+            kind, timestamp, generation, offset, length, expires_at, id_len, meta_len = RECORD_STRUCT.unpack_from(buf, pos)
+            end = pos + RECORD_STRUCT.size + id_len + meta_len
+            if end > len(buf):
+                break  # record still being written
+            object_id = buf[pos + RECORD_STRUCT.size:pos + RECORD_STRUCT.size + id_len].decode('utf-8')
+            if kind == RECORD_PUT:
+                meta = decode_meta(buf[end - meta_len:end]) if meta_len else {}
+                self._apply_put(object_id, PackEntry(segment, offset, length, expires_at, timestamp, generation, meta))
+            elif kind == RECORD_DELETE:
+                self._apply_delete(object_id, timestamp)
+            elif kind == RECORD_SEAL:
+                self._sealed.add(segment)
+            pos = end
+        return pos
+
+    # --- Compaction ---
+
+    def compact(self, min_live_ratio: float = 0.5, min_age: float = 600.0,
+                should_continue: Callable[[], bool] = lambda: True) -> int:
+        """
+        Copy the live entries of mostly-dead segments into this node's
+        active segment and retire the old segments. A segment is eligible
+        once its writer sealed it or it has not been modified for
+        `min_age` seconds. Returns the number of bytes reclaimed.
+        """
+        with self._lock:
+            self.refresh()
+            now = time.time()
+            live: Dict[str, int] = {}
+            for entry in self._index.values():
+                if not entry.is_expired(now):
+                    live[entry.segment] = live.get(entry.segment, 0) + entry.length
+
+            reclaimed = 0
+            for segment in list(self._consumed):
+                if segment == self._active or not should_continue():
+                    continue
+                pack_path = self.segment_path(segment)
+                try:
+                    st = os.stat(pack_path)
+                except FileNotFoundError:
+                    continue
+                if segment not in self._sealed and now - st.st_mtime < min_age:
+                    continue
+                payload = st.st_size - SEGMENT_HEADER_SIZE
+                if payload > 0 and live.get(segment, 0) / payload >= min_live_ratio:
+                    continue
+
+                moved = 0
+                with open(pack_path, 'rb') as f:
+                    for object_id, entry in list(self._index.items()):
+                        if entry.segment != segment or entry.is_expired(now):
+                            continue
+                        data = os.pread(f.fileno(), entry.length, entry.offset)
+                        self.put(object_id, data, entry.meta, entry.expires_at,
+                                 timestamp=entry.timestamp, generation=entry.generation + 1)
+                        moved += entry.length
+
+                # Readers with the old path open keep working until the grace
+                # period ends; new lookups miss and refresh to the new location.
+                for path in (self._index_path(segment), pack_path):
+                    try:
+                        os.rename(path, path.with_name(path.name + RETIRED_SUFFIX))
+                    except FileNotFoundError:
+                        pass
+                del self._consumed[segment]
+                self._sealed.discard(segment)
+                reclaimed += st.st_size - moved
+                logger.info(f"Compacted pack segment {segment}: moved {moved} bytes, reclaimed {st.st_size - moved}")
+            return reclaimed
+
+    def purge_retired(self, grace: float = 300.0):
+        """Delete retired segments once readers have had `grace` seconds to let go."""
+        now = time.time()
+        with os.scandir(self.pack_dir) as it:
+            retired = [e for e in it if e.name.endswith(RETIRED_SUFFIX)]
+        for entry in retired:
+            try:
+                if now - entry.stat().st_ctime >= grace:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
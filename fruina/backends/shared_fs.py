@@ -3,7 +3,7 @@ import mmap
 import struct
 import json
 from typing import Any, Dict, Tuple, Optional
-from ..core.blob import Blob, BlobView
+from ..core.blob import Blob, BlobView, AccessHint, fadvise, madvise, writable_bytes, preadv_into
 
 # Header Format: Magic(8s), Version(H), Flags(B), TTL(I), Reserved(1x), MetaLen(Q), DataOffset(Q)
 # Total Size: 8 + 2 + 1 + 4 + 1 + 8 + 8 = 32 bytes
@@ -13,21 +13,136 @@ MAGIC = b'FRUINA!!'
 ALIGNMENT = 4096
 FLAG_SEALED = 0x01
 
+# Header version 1 stores meta as JSON. Version 2 stores it in a compact
+# typed binary form with a sorted key directory, so a single key can be
+# read straight out of the mapped header page:
+#   Count(H), Count x Entry(KeyOff(I), KeyLen(H), Type(B), ValOff(I), ValLen(I)), Keys, Values
+# Offsets are relative to the start of the meta region.
+HEADER_VERSION = 2
+META_COUNT_STRUCT = struct.Struct("!H")
+META_ENTRY_STRUCT = struct.Struct("!IHBII")
+
+META_NONE = 0
+META_BOOL = 1
+META_INT = 2
+META_FLOAT = 3
+META_STR = 4
+META_INT_LIST = 5
+META_JSON = 6
+
+# O_DIRECT reads must use offsets, lengths and buffers aligned to the
+# logical block size; a page covers every common device.
+DIRECT_IO_ALIGNMENT = 4096
+DIRECT_IO_CHUNK = 64 * 1024 * 1024
+
+_INT64 = struct.Struct("!q")
+_FLOAT64 = struct.Struct("!d")
+
+def _encode_meta_value(value: Any) -> Tuple[int, bytes]:
+    if value is None:
+        return META_NONE, b''
+    if isinstance(value, bool):
+        return META_BOOL, b'\x01' if value else b'\x00'
+    if isinstance(value, int) and -2**63 <= value < 2**63:
+        return META_INT, _INT64.pack(value)
+    if isinstance(value, float):
+        return META_FLOAT, _FLOAT64.pack(value)
+    if isinstance(value, str):
+        return META_STR, value.encode('utf-8')
+    if (isinstance(value, (list, tuple)) and value
+            and all(type(v) is int and -2**63 <= v < 2**63 for v in value)):
+        return META_INT_LIST, struct.pack(f"!{len(value)}q", *value)
+    return META_JSON, json.dumps(value).encode('utf-8')
+
+def _decode_meta_value(vtype: int, raw) -> Any:
+    if vtype == META_NONE:
+        return None
+    if vtype == META_BOOL:
+        return raw[0] != 0
+    if vtype == META_INT:
+        return _INT64.unpack(raw)[0]
+    if vtype == META_FLOAT:
+        return _FLOAT64.unpack(raw)[0]
+    if vtype == META_STR:
+        return str(raw, 'utf-8')
+    if vtype == META_INT_LIST:
+        return list(struct.unpack(f"!{len(raw) // 8}q", raw))
+    if vtype == META_JSON:
+        return json.loads(bytes(raw))
+    raise ValueError(f"Unknown meta value type: {vtype}")
+
+def encode_meta(meta: Dict[str, Any]) -> bytes:
+    """Encode meta in the header version 2 binary form."""
+    items = sorted((str(k).encode('utf-8'), _encode_meta_value(v)) for k, v in meta.items())
+    keys_start = META_COUNT_STRUCT.size + len(items) * META_ENTRY_STRUCT.size
+    values_start = keys_start + sum(len(k) for k, _ in items)
+
+    directory = [META_COUNT_STRUCT.pack(len(items))]
+    key_off, val_off = keys_start, values_start
+    for key, (vtype, raw) in items:
+        directory.append(META_ENTRY_STRUCT.pack(key_off, len(key), vtype, val_off, len(raw)))
+        key_off += len(key)
+        val_off += len(raw)
+    return b''.join(directory + [k for k, _ in items] + [raw for _, (_, raw) in items])
+
+def decode_meta(buf) -> Dict[str, Any]:
+    """Decode a whole header version 2 meta region."""
+    buf = bytes(buf)
+    (count,) = META_COUNT_STRUCT.unpack_from(buf, 0)
+    end = META_COUNT_STRUCT.size + count * META_ENTRY_STRUCT.size
+    meta = {}
+    for key_off, key_len, vtype, val_off, val_len in META_ENTRY_STRUCT.iter_unpack(buf[META_COUNT_STRUCT.size:end]):
+        meta[buf[key_off:key_off + key_len].decode('utf-8')] = _decode_meta_value(vtype, buf[val_off:val_off + val_len])
+    return meta
+
+def lookup_meta(buf, key: str, default: Any = None) -> Any:
+    """Binary search a header version 2 meta region for a single key."""
+    buf = memoryview(buf)
+    target = key.encode('utf-8')
+    (count,) = META_COUNT_STRUCT.unpack_from(buf, 0)
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        key_off, key_len, vtype, val_off, val_len = META_ENTRY_STRUCT.unpack_from(
+            buf, META_COUNT_STRUCT.size + mid * META_ENTRY_STRUCT.size)
+        probe = bytes(buf[key_off:key_off + key_len])
+        if probe == target:
+            return _decode_meta_value(vtype, buf[val_off:val_off + val_len])
+        if probe < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    return default
+
 class SharedFSBlobView(BlobView):
     """
     Client-side view of a SharedFSBlob.
     Wraps a file path and offset to access the data portion of the file.
+    With `length` set, the view is a read-only region of a larger file
+    (an entry in a pack segment) rather than a whole object file.
+    With `direct` set, read() bypasses the page cache with aligned
+    O_DIRECT reads where the platform and filesystem allow it.
     """
-    def __init__(self, path: str, mode: str = "rb", data_offset: int = 0):
+    def __init__(self, path: str, mode: str = "rb", data_offset: int = 0, length: Optional[int] = None,
+                 direct: bool = False):
         self.path = path
-        self.mode = mode
+        self.length = length
         self.data_offset = data_offset
         self.file = None
         self.is_sealed = False
+        self.access_hint: Optional[AccessHint] = None
+        self.direct = direct and hasattr(os, 'O_DIRECT')
+        self._direct_fd: Optional[int] = None
+
+        if length is not None:
+            # Packed entries are immutable and share their file with neighbours
+            mode = "rb"
+            self.is_sealed = True
+        self.mode = mode
         
         self.file = open(path, mode)
         
-        if self.data_offset == 0:
+        if self.data_offset == 0 and length is None:
             self._read_header_offset()
             
         if self.data_offset > 0:
@@ -62,9 +177,66 @@ class SharedFSBlobView(BlobView):
         return self.file.write(data)
 
     def read(self, size: int = -1, offset: int = 0) -> bytes:
+        if self.length is not None and (size < 0 or offset + size > self.length):
+            size = max(self.length - offset, 0)
+        if self.direct and self.is_sealed:
+            data = self._read_direct(size, self.data_offset + offset)
+            if data is not None:
+                return data
         self.file.seek(self.data_offset + offset)
         return self.file.read(size)
 
+    def _read_direct(self, size: int, position: int) -> Optional[bytes]:
+        """
+        Read through an O_DIRECT descriptor into a page-aligned buffer.
+        Returns None if the filesystem refuses O_DIRECT (e.g. tmpfs).
+        """
+        if self._direct_fd is None:
+            try:
+                self._direct_fd = os.open(self.path, os.O_RDONLY | os.O_DIRECT)
+            except OSError:
+                self.direct = False
+                return None
+        if size < 0:
+            size = max(os.fstat(self._direct_fd).st_size - position, 0)
+        if size == 0:
+            return b""
+
+        start = position - position % DIRECT_IO_ALIGNMENT
+        end = -(-(position + size) // DIRECT_IO_ALIGNMENT) * DIRECT_IO_ALIGNMENT
+        # Anonymous mappings are page aligned, as O_DIRECT requires
+        buf = mmap.mmap(-1, end - start)
+        try:
+            view = memoryview(buf)
+            filled = 0
+            try:
+                while filled < end - start:
+                    chunk = view[filled:filled + DIRECT_IO_CHUNK]
+                    n = os.preadv(self._direct_fd, [chunk], start + filled)
+                    chunk.release()
+                    if n == 0:
+                        break
+                    filled += n
+                    if n % DIRECT_IO_ALIGNMENT:
+                        break  # short read at end of file
+            except OSError:
+                self.direct = False
+                return None
+            lo = position - start
+            data = bytes(view[lo:min(lo + size, filled)])
+            view.release()
+            return data
+        finally:
+            buf.close()
+
+    def readinto(self, buf: Any, offset: int = 0) -> int:
+        view = writable_bytes(buf)
+        if self.length is not None:
+            view = view[:max(min(len(view), self.length - offset), 0)]
+        if not self.is_sealed:
+            self.file.flush()
+        return preadv_into(self.file.fileno(), view, self.data_offset + offset)
+
     def truncate(self, size: int) -> None:
         if self.is_sealed:
             raise ValueError("Blob is sealed")
@@ -76,21 +248,40 @@ class SharedFSBlobView(BlobView):
         if 'w' in mode or '+' in mode:
             prot |= mmap.PROT_WRITE
         
+        if self.length is not None:
+            if self.length == 0:
+                return memoryview(b"")
+            start = self.data_offset - self.data_offset % mmap.ALLOCATIONGRANULARITY
+            mm = mmap.mmap(self.file.fileno(), self.data_offset + self.length - start,
+                           offset=start, prot=mmap.PROT_READ)
+            self._advise_mapping(mm)
+            return memoryview(mm)[self.data_offset - start:]
+
         try:
             length = 0
             offset = self.data_offset
             
             if offset % mmap.ALLOCATIONGRANULARITY != 0:
                 mm = mmap.mmap(self.file.fileno(), 0, prot=prot)
+                self._advise_mapping(mm)
                 return memoryview(mm)[offset:]
             
             mm = mmap.mmap(self.file.fileno(), length, offset=offset, prot=prot)
+            self._advise_mapping(mm)
             return memoryview(mm)
         except ValueError:
             if os.fstat(self.file.fileno()).st_size == 0:
                 return memoryview(b"")
             raise
 
+    def advise(self, hint: AccessHint) -> None:
+        self.access_hint = hint
+        fadvise(self.file.fileno(), hint, self.data_offset, self.length or 0)
+
+    def _advise_mapping(self, mm: mmap.mmap):
+        if self.access_hint is not None:
+            madvise(mm, self.access_hint)
+
     def seal(self) -> None:
         """
         Sets the sealed flag in the header.
@@ -120,23 +311,32 @@ class SharedFSBlobView(BlobView):
             self.file.seek(current_pos)
 
     def close(self) -> None:
-        if self.is_sealed:
-            pass
+        if self._direct_fd is not None:
+            os.close(self._direct_fd)
+            self._direct_fd = None
         try:
             self.file.flush()
         except ValueError:
             pass
+        if self.access_hint is AccessHint.DONTNEED and not self.file.closed:
+            # Drop what this reader pulled into the page cache
+            fadvise(self.file.fileno(), AccessHint.DONTNEED, self.data_offset, self.length or 0)
         self.file.close()
 
     def get_handle(self) -> Dict[str, Any]:
-        return {
+        handle = {
             'type': 'shared_fs',
             'path': self.path,
             'data_offset': self.data_offset,
         }
+        if self.length is not None:
+            handle['length'] = self.length
+        return handle
 
     def delete(self) -> None:
         self.close()
+        if self.length is not None:
+            return
         if os.path.exists(self.path):
             try:
                 os.remove(self.path)
@@ -155,11 +355,13 @@ class SharedFSBlob(Blob):
     A Blob implementation for Shared Filesystem.
     Used by the Peer to create files with headers.
     """
-    def __init__(self, path: str, mode: str = "rb", data_offset: int = 0, meta: Optional[Dict[str, Any]] = None, ttl: int = 0):
+    def __init__(self, path: str, mode: str = "rb", data_offset: int = 0, meta: Optional[Dict[str, Any]] = None, ttl: int = 0,
+                 header_version: int = HEADER_VERSION):
         self.path = path
         self.mode = mode
         self.data_offset = data_offset
         self.ttl = ttl
+        self.header_version = header_version
         self.file = None
         self.is_sealed = False
         
@@ -176,17 +378,20 @@ class SharedFSBlob(Blob):
             self.file.seek(self.data_offset)
 
     def _write_header(self, meta: Dict[str, Any]):
-        meta_json = json.dumps(meta).encode('utf-8')
-        meta_len = len(meta_json)
+        if self.header_version >= 2:
+            meta_bytes = encode_meta(meta)
+        else:
+            meta_bytes = json.dumps(meta).encode('utf-8')
+        meta_len = len(meta_bytes)
 
         raw_header_size = HEADER_SIZE + meta_len
 
         self.data_offset = (raw_header_size + ALIGNMENT - 1) & ~(ALIGNMENT - 1)
         padding_len = self.data_offset - raw_header_size
         
-        header_bytes = HEADER_STRUCT.pack(MAGIC, 1, 0, self.ttl, meta_len, self.data_offset)
+        header_bytes = HEADER_STRUCT.pack(MAGIC, self.header_version, 0, self.ttl, meta_len, self.data_offset)
         self.file.write(header_bytes)
-        self.file.write(meta_json)
+        self.file.write(meta_bytes)
         if padding_len > 0:
             self.file.write(b'\0' * padding_len)
 
@@ -238,14 +443,40 @@ class SharedFSBlob(Blob):
                 return {}
             
             if meta_len > 0:
-                meta_json = self.file.read(meta_len)
-                return json.loads(meta_json)
+                meta_bytes = self.file.read(meta_len)
+                if ver >= 2:
+                    return decode_meta(meta_bytes)
+                return json.loads(meta_bytes)
             return {}
         except Exception:
             return {}
         finally:
             self.file.seek(current_pos)
 
+    def get_meta_value(self, key: str, default: Any = None) -> Any:
+        """
+        Read a single meta key. For version 2 headers the key is looked up
+        directly in a mapping of the header page; version 1 headers are
+        decoded in full.
+        """
+        try:
+            length = ALIGNMENT
+            while True:
+                with mmap.mmap(self.file.fileno(), length, prot=mmap.PROT_READ) as mm:
+                    with memoryview(mm) as view:
+                        magic, ver, flags, ttl, meta_len, data_offset = HEADER_STRUCT.unpack_from(view, 0)
+                        if magic != MAGIC or meta_len == 0:
+                            return default
+                        if ver < 2:
+                            break
+                        if HEADER_SIZE + meta_len <= length:
+                            return lookup_meta(view[HEADER_SIZE:HEADER_SIZE + meta_len], key, default)
+                # Meta spills past the first page; map the whole header
+                length = HEADER_SIZE + meta_len
+            return self.get_meta().get(key, default)
+        except (ValueError, OSError, struct.error):
+            return default
+
     def seal(self, new_ttl: Optional[int] = None) -> None:
         """
         Sets the sealed flag in the header.
@@ -1,7 +1,74 @@
 import os
 import mmap
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from enum import Enum
+from typing import Any, Optional, Tuple
+
+class AccessHint(Enum):
+    """
+    How a reader intends to access a blob. Mapped onto posix_fadvise for the
+    file descriptor and madvise for mappings, where the platform has them.
+    """
+    NORMAL = "normal"
+    SEQUENTIAL = "sequential"  # aggressive readahead
+    RANDOM = "random"          # readahead off
+    WILLNEED = "willneed"      # start reading the whole range in now
+    DONTNEED = "dontneed"      # read once; drop the pages from the cache afterwards
+
+def fadvise(fd: int, hint: AccessHint, offset: int = 0, length: int = 0) -> None:
+    """Best-effort posix_fadvise; a no-op where unsupported."""
+    advice = getattr(os, f"POSIX_FADV_{hint.name}", None)
+    if advice is None or not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        os.posix_fadvise(fd, offset, length, advice)
+    except OSError:
+        pass
+
+def madvise(mm: mmap.mmap, hint: AccessHint) -> None:
+    """Best-effort madvise on a whole mapping; a no-op where unsupported."""
+    advice = getattr(mmap, f"MADV_{hint.name}", None)
+    if advice is None or not hasattr(mm, 'madvise'):
+        return
+    try:
+        mm.madvise(advice)
+    except (OSError, ValueError):
+        pass
+
+def file_of(view: Any) -> Tuple[int, int, Optional[int]]:
+    """
+    (fd, data_offset, length) behind a file-backed BlobView; length is
+    None when the data runs to the end of the file. The fd stays owned
+    by the view.
+    """
+    fd = getattr(view, 'fd', None)
+    if fd is None:
+        # Buffered views (shared_fs): anything buffered must hit the file first
+        view.file.flush()
+        fd = view.file.fileno()
+    return fd, getattr(view, 'data_offset', 0), getattr(view, 'length', None)
+
+def writable_bytes(buf: Any) -> memoryview:
+    """A flat, writable byte view of a caller's buffer (bytearray, mmap, array, ...)."""
+    view = memoryview(buf)
+    if view.readonly:
+        raise TypeError("readinto() needs a writable buffer")
+    if not view.c_contiguous:
+        raise ValueError("readinto() needs a C-contiguous buffer")
+    return view.cast('B') if view.ndim != 1 or view.format != 'B' else view
+
+def preadv_into(fd: int, view: memoryview, position: int) -> int:
+    """
+    Fill `view` from `fd` at `position` with preadv, straight into the
+    caller's memory. Returns the bytes read, short only at end of file.
+    """
+    total = 0
+    while total < len(view):
+        n = os.preadv(fd, [view[total:]] if total else [view], position + total)
+        if n == 0:
+            break
+        total += n
+    return total
 
 class Blob(ABC):
     """
@@ -51,6 +118,21 @@ class Blob(ABC):
         """Delete the blob data."""
         pass
 
+    def advise(self, hint: AccessHint) -> None:
+        """Hint the expected access pattern. Optional; ignored by default."""
+        pass
+
+    def readinto(self, buf: Any, offset: int = 0) -> int:
+        """
+        Read up to len(buf) bytes at `offset` into a writable buffer and
+        return how many were read. This default goes through read();
+        file-backed views override it to copy without the temporary.
+        """
+        view = writable_bytes(buf)
+        data = self.read(len(view), offset)
+        view[:len(data)] = data
+        return len(data)
+
 class BlobView(Blob):
     """
     Abstract base class for client-side views of a Blob.
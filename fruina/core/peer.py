@@ -1,6 +1,8 @@
 import uuid
 import time
-from typing import Dict, Optional, Callable, Any, Tuple
+import heapq
+import threading
+from typing import Dict, List, Optional, Callable, Any, Tuple
 from .object import Object, ObjectState
 from .lease import Lease, AccessType
 from .blob import Blob
@@ -14,6 +16,13 @@ class Peer:
         self._lease_factory = lease_factory
         self.objects: Dict[str, Object] = {}
         self.leases: Dict[str, Lease] = {}
+        # Guards the object and lease tables; servers call in from many threads
+        self._table_lock = threading.RLock()
+        # Expiry index: a min-heap of (deadline, lease_id). Renewing pushes a
+        # new entry; _deadlines holds each lease's latest, so older ones are
+        # skipped when popped.
+        self._expiry: List[Tuple[float, str]] = []
+        self._deadlines: Dict[str, float] = {}
 
     def create_blob(self, object_id: str) -> Blob:
         """Creates a new Blob for the given object_id.
@@ -32,73 +41,96 @@ class Peer:
         raise NotImplementedError("Peer subclasses must implement create_lease or provide a lease_factory")
 
     def acquire(self, object_id: Optional[str], access: AccessType, ttl: Optional[float] = None, meta: Optional[Dict[str, Any]] = None) -> Tuple[Lease, Object]:
-        self._cleanup_expired_leases()
+        with self._table_lock:
+            self._cleanup_expired_leases()
 
-        if object_id is None:
-            if access in (AccessType.READ, AccessType.WRITE):
-                raise ValueError(f"Cannot acquire {access.value} lease without object_id")
-            object_id = str(uuid.uuid4())
+            if object_id is None:
+                if access in (AccessType.READ, AccessType.WRITE):
+                    raise ValueError(f"Cannot acquire {access.value} lease without object_id")
+                object_id = str(uuid.uuid4())
 
-        obj = self.objects.get(object_id)
+            obj = self.objects.get(object_id)
 
-        if access == AccessType.CREATE:
-            if obj is not None:
-                raise ValueError(f"Object {object_id} already exists")
+            if access == AccessType.CREATE:
+                if obj is not None:
+                    raise ValueError(f"Object {object_id} already exists")
             
-            blob = self.create_blob(object_id)
-            obj = Object(object_id, [blob], meta)
-            self.objects[object_id] = obj
+                blob = self.create_blob(object_id)
+                obj = Object(object_id, [blob], meta)
+                self.objects[object_id] = obj
         
-        elif access == AccessType.READ:
-            if obj is None:
-                raise KeyError(f"Object {object_id} not found")
-            if not obj.is_sealed():
-                raise ValueError(f"Object {object_id} is not sealed yet")
-
-        elif access == AccessType.WRITE:
-            if obj is None:
-                raise KeyError(f"Object {object_id} not found")
-
-        lease = self.create_lease(object_id, access, ttl)
-        self.leases[lease.lease_id] = lease
+            elif access == AccessType.READ:
+                if obj is None:
+                    raise KeyError(f"Object {object_id} not found")
+                if not obj.is_sealed():
+                    raise ValueError(f"Object {object_id} is not sealed yet")
+
+            elif access == AccessType.WRITE:
+                if obj is None:
+                    raise KeyError(f"Object {object_id} not found")
+
+            lease = self.create_lease(object_id, access, ttl)
+            self.leases[lease.lease_id] = lease
+            self._schedule_expiry(lease)
         
-        return lease, obj
+            return lease, obj
+
+    def renew(self, lease_id: str):
+        """Extend a lease by its ttl from now. KeyError if it is gone or expired."""
+        with self._table_lock:
+            lease = self._get_active_lease(lease_id)
+            lease.renew()
+            self._schedule_expiry(lease)
+
+    def renew_many(self, lease_ids: List[str]) -> List[str]:
+        """Renew several leases; returns the ids of those no longer held."""
+        lost = []
+        for lease_id in lease_ids:
+            try:
+                self.renew(lease_id)
+            except KeyError:
+                lost.append(lease_id)
+        return lost
 
     def seal(self, lease_id: str):
-        lease = self._get_active_lease(lease_id)
-        if lease.access != AccessType.CREATE:
-            raise ValueError("Cannot seal a read lease")
+        with self._table_lock:
+            lease = self._get_active_lease(lease_id)
+            if lease.access != AccessType.CREATE:
+                raise ValueError("Cannot seal a read lease")
         
-        obj = self.objects.get(lease.object_id)
-        if obj is None:
-             raise KeyError(f"Object {lease.object_id} not found for lease {lease_id}")
+            obj = self.objects.get(lease.object_id)
+            if obj is None:
+                 raise KeyError(f"Object {lease.object_id} not found for lease {lease_id}")
 
-        obj.seal()
+            obj.seal()
 
     def discard(self, lease_id: str):
         """
         Permanently deletes the object associated with the lease.
         Requires a CREATE or WRITE lease.
         """
-        lease = self._get_active_lease(lease_id)
-        if lease.access not in (AccessType.CREATE, AccessType.WRITE):
-            raise ValueError("Cannot discard with a read lease")
+        with self._table_lock:
+            lease = self._get_active_lease(lease_id)
+            if lease.access not in (AccessType.CREATE, AccessType.WRITE):
+                raise ValueError("Cannot discard with a read lease")
         
-        object_id = lease.object_id
-        obj = self.objects.get(object_id)
+            object_id = lease.object_id
+            obj = self.objects.get(object_id)
         
-        if obj:
-            obj.delete()
-            del self.objects[object_id]
+            if obj:
+                obj.delete()
+                del self.objects[object_id]
         
-        self.release(lease_id)
+            self.release(lease_id)
 
     def release(self, lease_id: str):
-        if lease_id not in self.leases:
-            return
-        lease = self.leases[lease_id]
-        lease.release()
-        del self.leases[lease_id]
+        with self._table_lock:
+            if lease_id not in self.leases:
+                return
+            lease = self.leases[lease_id]
+            lease.release()
+            del self.leases[lease_id]
+            self._deadlines.pop(lease_id, None)
 
     def _get_active_lease(self, lease_id: str, raise_error=True) -> Lease:
         lease = self.leases.get(lease_id)
@@ -112,7 +144,29 @@ class Peer:
             return None
         return lease
 
+    def _schedule_expiry(self, lease: Lease):
+        if lease.ttl is None:
+            return
+        deadline = time.time() + lease.ttl
+        self._deadlines[lease.lease_id] = deadline
+        heapq.heappush(self._expiry, (deadline, lease.lease_id))
+        if len(self._expiry) > 2 * len(self._deadlines) + 64:
+            # Mostly stale entries of renewed or released leases; rebuild
+            self._expiry = [(d, lid) for lid, d in self._deadlines.items()]
+            heapq.heapify(self._expiry)
+
     def _cleanup_expired_leases(self):
-        expired = [lid for lid, l in self.leases.items() if l.is_expired()]
-        for lid in expired:
-            self.release(lid)
+        """Release the leases whose deadline has passed; O(expired * log n)."""
+        now = time.time()
+        while self._expiry and self._expiry[0][0] < now:
+            deadline, lid = heapq.heappop(self._expiry)
+            if self._deadlines.get(lid) != deadline:
+                continue
+            lease = self.leases.get(lid)
+            if lease is None:
+                self._deadlines.pop(lid, None)
+            elif lease.is_expired():
+                self.release(lid)
+            else:
+                # Renewed directly on the Lease rather than through renew()
+                self._schedule_expiry(lease)
@@ -1 +1,2 @@
 from .client import connect, Client
+from .async_client import connect_async, AsyncClient
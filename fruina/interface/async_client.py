@@ -0,0 +1,150 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Union
+from ..transport.aio import AsyncTransport, AsyncDirectTransport, AsyncHttpTransport, AsyncUdsTransport
+from ..core.blob import AccessHint
+from .client import Object, _LOCAL_PEERS, _create_default_peer
+from .heartbeat import AsyncLeaseKeeper, BEATS_PER_TTL
+
+# Forward declaration for type hinting
+try:
+    from ..core.peer import Peer
+except ImportError:
+    Peer = Any
+
+class AsyncObject(Object):
+    """
+    An Object whose lease operations are coroutines. Data access (buffer,
+    read, write, truncate) works on the local mapping and stays synchronous.
+    """
+    async def renew(self):
+        if await self.transport.renew([self.lease_id]):
+            raise KeyError(f"Lease {self.lease_id} not found or expired")
+
+    async def seal(self):
+        self._blob.seal()
+        await self.transport.seal(self.lease_id)
+
+    async def discard(self):
+        self._close_blob()
+        # discard ends the lease as well
+        await self.transport.discard(self.lease_id)
+
+    async def release(self):
+        self._close_blob()
+        await self.transport.release(self.lease_id)
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' for AsyncObject")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.release()
+
+class AsyncClient:
+    """
+    asyncio counterpart of Client: create/get/get_many/seal/release are
+    coroutines that never block the event loop.
+
+    UDS targets use one persistent pipelined connection (with fd passing)
+    shared by all coroutines on the loop; HTTP targets use asyncio streams.
+    Use from a single event loop. Leases are renewed by a task on that
+    loop, as Client does with a thread (lease_ttl, heartbeat).
+    """
+    def __init__(self, target: Union[str, Peer], lease_ttl: float = 60.0, heartbeat: bool = True):
+        if isinstance(target, str):
+            if target.startswith("http://") or target.startswith("https://"):
+                self.transport: AsyncTransport = AsyncHttpTransport(target)
+            else:
+                self.transport = AsyncUdsTransport(target)
+        else:
+            # Assume it's a Peer instance
+            self.transport = AsyncDirectTransport(target)
+        self.lease_ttl = lease_ttl
+        self.heartbeat = AsyncLeaseKeeper(self.transport, lease_ttl / BEATS_PER_TTL) if heartbeat else None
+
+    def _object(self, info: Dict, handles: List[Any], access_hint: Optional[AccessHint] = None,
+                direct: bool = False) -> AsyncObject:
+        return AsyncObject(self.transport, info, handles, access_hint=access_hint, direct=direct,
+                           keeper=self.heartbeat)
+
+    async def create(self, size: int = 0, meta: dict = None) -> AsyncObject:
+        """
+        Create a new object.
+        """
+        info, handles = await self.transport.acquire(None, "create", self.lease_ttl, meta)
+        obj = self._object(info, handles)
+        if size > 0:
+            obj.truncate(size)
+        return obj
+
+    async def get(self, object_id: str, access_hint: Union[AccessHint, str, None] = None,
+                  direct: bool = False) -> AsyncObject:
+        """
+        Get an existing object for reading (see Client.get).
+        """
+        if isinstance(access_hint, str):
+            access_hint = AccessHint(access_hint.lower())
+        info, handles = await self.transport.acquire(object_id, "read", self.lease_ttl)
+        return self._object(info, handles, access_hint, direct)
+
+    async def get_many(self, object_ids: List[str], access_hint: Union[AccessHint, str, None] = None,
+                       direct: bool = False) -> List[AsyncObject]:
+        """
+        Get several objects for reading, in as few round trips as the
+        transport allows (batched frames over UDS). If any of them fails,
+        the others are released and the first error is raised.
+        """
+        if isinstance(access_hint, str):
+            access_hint = AccessHint(access_hint.lower())
+        results = await self.transport.acquire_many(
+            [{"object_id": object_id, "intent": "read", "ttl_seconds": self.lease_ttl} for object_id in object_ids])
+        error = next((r for r in results if isinstance(r, BaseException)), None)
+        if error is not None:
+            await asyncio.gather(*(self.transport.release(r[0]["lease_id"]) for r in results
+                                   if not isinstance(r, BaseException)), return_exceptions=True)
+            raise error
+        return [self._object(info, handles, access_hint, direct) for info, handles in results]
+
+    async def seal(self, obj: AsyncObject):
+        await obj.seal()
+
+    async def release(self, obj: AsyncObject):
+        await obj.release()
+
+    async def delete(self, object_id: str):
+        """
+        Helper to delete an object.
+        Acquires a WRITE lease and then discards it.
+        """
+        info, handles = await self.transport.acquire(object_id, "write", self.lease_ttl)
+        await self._object(info, handles).discard()
+
+    async def close(self):
+        if self.heartbeat is not None:
+            await self.heartbeat.close()
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+def connect_async(target: Union[str, Peer, None] = None, **kwargs) -> AsyncClient:
+    """
+    Helper to create an AsyncClient; targets are the same as for connect(),
+    keyword arguments (lease_ttl, heartbeat) are passed on to AsyncClient.
+    The connection is opened on first use, from the running event loop.
+    """
+    if target is None:
+        return AsyncClient(_create_default_peer(), **kwargs)
+
+    if isinstance(target, str) and target.startswith("memory://"):
+        name = target.replace("memory://", "") or "default"
+        if name not in _LOCAL_PEERS:
+            _LOCAL_PEERS[name] = _create_default_peer()
+        return AsyncClient(_LOCAL_PEERS[name], **kwargs)
+
+    return AsyncClient(target, **kwargs)
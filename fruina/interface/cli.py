@@ -6,6 +6,7 @@ from ..peers.memory import MemoryPeer
 from ..peers.fs import FileSystemPeer
 from ..transport.http import HttpServer
 from ..transport.uds import UdsServer
+from ..p2p.server import DataServer
 
 def main():
     parser = argparse.ArgumentParser(description="Fruina Peer")
@@ -14,6 +15,8 @@ def main():
     parser.add_argument("--port", type=int, default=8080, help="HTTP port")
     parser.add_argument("--socket", default="/tmp/fruina.sock", help="UDS socket path")
     parser.add_argument("--data-dir", default="./data", help="Data directory for FS impl")
+    parser.add_argument("--p2p-port", type=int, default=None, help="Also serve sealed objects to other nodes on this TCP port")
+    parser.add_argument("--p2p-host", default="0.0.0.0", help="Bind address for the P2P data server")
     
     args = parser.parse_args()
 
@@ -36,6 +39,12 @@ def main():
         server.start()
     else:
         raise ValueError(f"Unknown transport: {args.transport}")
+
+    data_server = None
+    if args.p2p_port is not None:
+        data_server = DataServer(peer, host=args.p2p_host, port=args.p2p_port)
+        data_server.start()
+        print(f"P2P data server on {data_server.address}")
         
     print("Node started. Press Ctrl+C to stop.")
     try:
@@ -44,6 +53,8 @@ def main():
     except KeyboardInterrupt:
         print("Stopping...")
         server.stop()
+        if data_server:
+            data_server.stop()
 
 if __name__ == "__main__":
     main()
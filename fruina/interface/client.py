@@ -1,12 +1,14 @@
 from typing import Any, Dict, Optional, IO, List, Union, Tuple
 import os
 import mmap
-from ..transport.base import Transport
+import threading
+from ..transport.base import Transport, open_handle
 from ..transport.http import HttpTransport
-from ..transport.uds import UdsTransport
+from ..transport.uds import UdsTransport, BATCH_SIZE
 from ..transport.direct import DirectTransport
-from ..backends.memory import MemoryBlobView
-from ..backends.fs import FileBlobView
+from ..core.blob import AccessHint
+from .stream import ObjectWriter, INITIAL_CAPACITY
+from .heartbeat import LeaseKeeper, BEATS_PER_TTL
 
 # Forward declaration for type hinting
 try:
@@ -19,13 +21,21 @@ class Object:
     Represents a Fruina object handle.
     Wraps the underlying lease and provides access to the object data.
     """
-    def __init__(self, transport: Transport, info: Dict, handles: List[Any]):
+    def __init__(self, transport: Transport, info: Dict, handles: List[Any],
+                 access_hint: Optional[AccessHint] = None, direct: bool = False, keeper=None):
         self.transport = transport
         self.info = info
         self.handles = handles
         self.lease_id = info['lease_id']
         self.object_id = info['object_id']
+        self.direct = direct
         self._blob = self._reconstruct_blob()
+        if access_hint is not None:
+            self._blob.advise(access_hint)
+        # Renews the lease in the background until it is released
+        self._keeper = keeper
+        if keeper is not None:
+            keeper.add(self)
 
     def _reconstruct_blob(self):
         if not self.handles:
@@ -34,16 +44,7 @@ class Object:
         handle = self.handles[0]
         intent = self.info.get('intent', 'read')
         mode = "r+b" if intent in ('write', 'create') else "rb"
-        
-        if isinstance(handle, int):
-            return MemoryBlobView(handle, mode=mode)
-        elif isinstance(handle, str):
-            return FileBlobView(handle, mode=mode)
-        elif isinstance(handle, dict) and handle.get('type') == 'shared_fs':
-            from ..backends.shared_fs import SharedFSBlobView
-            return SharedFSBlobView(handle['path'], mode=mode, data_offset=handle.get('data_offset', 0))
-        else:
-            raise ValueError(f"Unknown handle type: {type(handle)}")
+        return open_handle(handle, mode=mode, direct=self.direct)
 
     @property
     def id(self) -> str:
@@ -56,6 +57,20 @@ class Object:
     def truncate(self, size: int):
         self._blob.truncate(size)
 
+    def read(self, size: int = -1, offset: int = 0) -> bytes:
+        """Read data from the object (O_DIRECT for shared_fs objects opened with direct=True)."""
+        return self._blob.read(size, offset)
+
+    def readinto(self, buf: Any, offset: int = 0) -> int:
+        """
+        Copy object bytes starting at `offset` into a caller-supplied
+        writable buffer (bytearray, mmap, array, NumPy array, ...) and
+        return how many were copied -- fewer than len(buf) only at the end
+        of the object. Reads with preadv on the descriptor, or with one
+        memcpy if .buffer is already mapped; no bytes objects are made.
+        """
+        return self._blob.readinto(buf, offset)
+
     def write(self, data: bytes):
         """Write data to the object."""
         self._blob.write(data)
@@ -83,21 +98,33 @@ class Object:
             return self.info['meta'].get(key)
         return None
 
+    def renew(self):
+        """Extend the lease by its ttl now; KeyError if it has already expired."""
+        if self.transport.renew([self.lease_id]):
+            raise KeyError(f"Lease {self.lease_id} not found or expired")
+
     def seal(self):
         self._blob.seal()
         self.transport.seal(self.lease_id)
 
     def discard(self):
-        self._close()
+        self._close_blob()
+        # discard ends the lease as well
         self.transport.discard(self.lease_id)
 
     def release(self):
         self._close()
 
-    def _close(self):
+    def _close_blob(self):
+        # The lease ends with the blob; stop renewing it
+        if self._keeper is not None:
+            self._keeper.discard(self.lease_id)
         if self._blob:
             self._blob.close()
             self._blob = None
+
+    def _close(self):
+        self._close_blob()
         self.transport.release(self.lease_id)
 
     def __enter__(self):
@@ -107,7 +134,20 @@ class Object:
         self._close()
 
 class Client:
-    def __init__(self, target: Union[str, Peer]):
+    """
+    A Client is thread-safe and meant to be shared: any number of threads
+    can create and get objects through one instance. UDS and HTTP requests
+    go over a pool of at most `pool_size` persistent connections; a thread
+    waits up to `pool_timeout` seconds for one to free up. Each Object
+    belongs to the thread that acquired it.
+
+    Leases are taken with a ttl of `lease_ttl` seconds. With `heartbeat`
+    a background thread renews those of all unreleased Objects in one
+    request every lease_ttl / 3 seconds (see heartbeat.LeaseKeeper), so
+    Objects can be held indefinitely; without it they lapse after lease_ttl.
+    """
+    def __init__(self, target: Union[str, Peer], pool_size: int = 16, pool_timeout: float = 30.0,
+                 lease_ttl: float = 60.0, heartbeat: bool = True):
         """
         Initialize Client with an address or a Peer instance.
         If target is a Peer instance, uses DirectTransport.
@@ -117,16 +157,48 @@ class Client:
         """
         if isinstance(target, str):
             if target.startswith("http://") or target.startswith("https://"):
-                self.transport = HttpTransport(target)
+                self.transport = HttpTransport(target, pool_size=pool_size, pool_timeout=pool_timeout)
             else:
-                self.transport = UdsTransport(target)
+                self.transport = UdsTransport(target, pool_size=pool_size, pool_timeout=pool_timeout)
         else:
             # Assume it's a Peer instance
             self.transport = DirectTransport(target)
+        self.lease_ttl = lease_ttl
+        self.heartbeat = LeaseKeeper(self.transport, lease_ttl / BEATS_PER_TTL) if heartbeat else None
 
-    def _acquire(self, object_id: Optional[str] = None, intent: str = "read", ttl: int = 60, meta: dict = None) -> Object:
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Connection pool counters: connections created, reused and broken,
+        how often a thread got its previous connection back (affinity_hits),
+        how often and how long callers waited for a free one, and the
+        current size/idle/in_use. Empty for direct clients.
+        """
+        return self.transport.stats()
+
+    def health_check(self) -> bool:
+        """Drop dead pooled connections and report whether the server answers."""
+        return self.transport.health_check()
+
+    def close(self):
+        """
+        Stop renewing leases and close pooled connections. Objects still
+        held stay usable until released (or until their leases lapse).
+        """
+        if self.heartbeat is not None:
+            self.heartbeat.close()
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _acquire(self, object_id: Optional[str] = None, intent: str = "read", ttl: Optional[float] = None,
+                 meta: dict = None, access_hint: Optional[AccessHint] = None, direct: bool = False) -> Object:
+        ttl = self.lease_ttl if ttl is None else ttl
         info, handles = self.transport.acquire(object_id, intent, ttl, meta)
-        return Object(self.transport, info, handles)
+        return Object(self.transport, info, handles, access_hint=access_hint, direct=direct, keeper=self.heartbeat)
 
     def create(self, size: int = 0, meta: dict = None) -> Object:
         """
@@ -137,11 +209,105 @@ class Client:
             obj.truncate(size)
         return obj
 
-    def get(self, object_id: str) -> Object:
+    def create_stream(self, meta: dict = None, initial_capacity: int = INITIAL_CAPACITY) -> ObjectWriter:
+        """
+        Create a new object of unknown size and return a writer for it.
+
+        The blob grows geometrically as data is written and is trimmed to
+        the exact size on seal:
+
+            with client.create_stream() as w:
+                for chunk in encoder:
+                    w.write(chunk)
+            object_id = w.id
+        """
+        return ObjectWriter(self._acquire(intent="create", meta=meta), initial_capacity)
+
+    def get(self, object_id: str, access_hint: Union[AccessHint, str, None] = None, direct: bool = False) -> Object:
         """
         Get an existing object for reading.
+
+        access_hint: "sequential", "random", "willneed" or "dontneed"
+            (or an AccessHint), applied with posix_fadvise/madvise.
+        direct: serve Object.read() of shared_fs objects with O_DIRECT,
+            bypassing the page cache.
+        """
+        if isinstance(access_hint, str):
+            access_hint = AccessHint(access_hint.lower())
+        return self._acquire(object_id, intent="read", access_hint=access_hint, direct=direct)
+
+    def get_many(self, object_ids: List[str], access_hint: Union[AccessHint, str, None] = None,
+                 direct: bool = False) -> List[Object]:
+        """
+        Get several objects for reading, in as few round trips as the
+        transport allows (batched requests over UDS). If any of them fails,
+        the others are released and the first error is raised.
+        """
+        if isinstance(access_hint, str):
+            access_hint = AccessHint(access_hint.lower())
+        results = self.transport.acquire_many(
+            [{"object_id": object_id, "intent": "read", "ttl_seconds": self.lease_ttl} for object_id in object_ids])
+        error = next((r for r in results if isinstance(r, BaseException)), None)
+        if error is not None:
+            for r in results:
+                if not isinstance(r, BaseException):
+                    _close_handles(r[1])
+                    self.transport.release(r[0]["lease_id"])
+            raise error
+        return [Object(self.transport, info, handles, access_hint=access_hint, direct=direct, keeper=self.heartbeat)
+                for info, handles in results]
+
+    def get_into(self, object_ids: List[str], buffers: List[Any], offset: int = 0) -> List[int]:
+        """
+        Read each object, from `offset`, into the matching caller-supplied
+        buffer (see Object.readinto) and release it. Returns the number of
+        bytes copied per object. Objects are acquired a batch at a time, so
+        only that many leases and descriptors are held at once.
+        """
+        if len(object_ids) != len(buffers):
+            raise ValueError(f"{len(object_ids)} objects but {len(buffers)} buffers")
+        counts = []
+        for i in range(0, len(object_ids), BATCH_SIZE):
+            objs = self.get_many(object_ids[i:i + BATCH_SIZE])
+            try:
+                counts.extend(obj.readinto(buf, offset) for obj, buf in zip(objs, buffers[i:i + BATCH_SIZE]))
+            finally:
+                for obj in objs:
+                    obj.release()
+        return counts
+
+    def put_array(self, array: Any, order: str = "A", meta: dict = None) -> str:
+        """
+        Store a NumPy array as a new object; returns its id. See
+        fruina.interface.integrations.numpy (requires numpy).
         """
-        return self._acquire(object_id, intent="read")
+        from .integrations.numpy import put_array
+        return put_array(self, array, order=order, meta=meta)
+
+    def get_array(self, object_id: str):
+        """
+        Return a zero-copy, read-only ndarray over an object stored with
+        put_array; the lease lives as long as the array does.
+        """
+        from .integrations.numpy import get_array
+        return get_array(self, object_id)
+
+    def put_object(self, value: Any, meta: dict = None) -> str:
+        """
+        Pickle any Python value into a new object with protocol 5,
+        writing large buffers out-of-band and aligned; returns its id.
+        See fruina.interface.integrations.pickle.
+        """
+        from .integrations.pickle import put_object
+        return put_object(self, value, meta=meta)
+
+    def get_object(self, object_id: str) -> Any:
+        """
+        Unpickle an object stored with put_object; large buffers come back
+        as views over the mapping rather than copies.
+        """
+        from .integrations.pickle import get_object
+        return get_object(self, object_id)
 
     def delete(self, object_id: str):
         """
@@ -151,16 +317,26 @@ class Client:
         obj = self._acquire(object_id, intent="write")
         obj.discard()
 
+def _close_handles(handles: List[Any]):
+    for handle in handles:
+        if isinstance(handle, int):
+            try:
+                os.close(handle)
+            except OSError:
+                pass
+
 _LOCAL_PEERS: Dict[str, Any] = {}
+_LOCAL_PEERS_LOCK = threading.Lock()
 
 def _create_default_peer() -> Peer:
     from ..peers.memory import MemoryPeer
     
     return MemoryPeer()
 
-def connect(target: Union[str, Peer, None] = None) -> Client:
+def connect(target: Union[str, Peer, None] = None, **kwargs) -> Client:
     """
-    Helper to create a Client.
+    Helper to create a Client. Keyword arguments (pool_size, pool_timeout,
+    lease_ttl, heartbeat) are passed on to Client.
     
     Usage:
     - connect(): Connects to a new, isolated in-memory Peer.
@@ -170,16 +346,17 @@ def connect(target: Union[str, Peer, None] = None) -> Client:
     - connect(peer_instance): Connects to an existing Peer instance.
     """
     if target is None:
-        return Client(_create_default_peer())
+        return Client(_create_default_peer(), **kwargs)
     
     if isinstance(target, str) and target.startswith("memory://"):
         name = target.replace("memory://", "")
         if not name:
             name = "default"
             
-        if name not in _LOCAL_PEERS:
-            _LOCAL_PEERS[name] = _create_default_peer()
+        with _LOCAL_PEERS_LOCK:
+            if name not in _LOCAL_PEERS:
+                _LOCAL_PEERS[name] = _create_default_peer()
         
-        return Client(_LOCAL_PEERS[name])
+        return Client(_LOCAL_PEERS[name], **kwargs)
     
-    return Client(target)
+    return Client(target, **kwargs)
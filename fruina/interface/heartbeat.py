@@ -0,0 +1,145 @@
+"""
+Background lease renewal.
+
+Every lease a Client acquires has a ttl (lease_ttl, 60s by default). A
+LeaseKeeper tracks the leases of the client's live Objects and renews all
+of them with a single transport.renew() request every `interval` seconds,
+so a reader can hold an object for as long as it needs while servers keep
+ttls short and reclaim the leases of crashed clients soon after.
+
+The keeper only holds weak references: an Object dropped without being
+released stops being renewed, and its lease lapses on the server. The
+renewing thread (or task, for AsyncClient) is started by the first lease
+and exits once none are left.
+"""
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Renew three times per ttl, so two beats can be missed before a lease lapses
+BEATS_PER_TTL = 3
+
+class _Leases:
+    """The weakly held Objects whose leases are kept alive, by lease id."""
+    def __init__(self, transport, interval: float):
+        self.transport = transport
+        self.interval = interval
+        # lease_id -> weakref to its Object; single dict operations are
+        # atomic, so releasing threads and finalizers need no lock
+        self._refs: Dict[str, weakref.ref] = {}
+        self.stats: Dict[str, int] = {"beats": 0, "renewed": 0, "lost": 0, "errors": 0}
+
+    def _track(self, obj):
+        lease_id = obj.lease_id
+        self._refs[lease_id] = weakref.ref(obj, lambda ref: self._forget(lease_id, ref))
+
+    def _forget(self, lease_id: str, ref: weakref.ref):
+        # Garbage collected without a release: let the lease lapse
+        if self._refs.get(lease_id) is ref:
+            self._refs.pop(lease_id, None)
+
+    def discard(self, lease_id: str):
+        self._refs.pop(lease_id, None)
+
+    def _renewed(self, lease_ids: List[str], lost: List[str]):
+        self.stats["beats"] += 1
+        self.stats["renewed"] += len(lease_ids) - len(lost)
+        for lease_id in lost:
+            ref = self._refs.pop(lease_id, None)
+            obj = ref() if ref is not None else None
+            if obj is not None:
+                # Not released in the meantime: the server let it expire
+                self.stats["lost"] += 1
+                logger.warning(f"Lease {lease_id} on object {obj.id} expired before it could be renewed")
+
+class LeaseKeeper(_Leases):
+    """Renews a Client's leases from a daemon thread."""
+    def __init__(self, transport, interval: float):
+        super().__init__(transport, interval)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def add(self, obj):
+        self._track(obj)
+        with self._lock:
+            if self._thread is None and not self._stopped.is_set():
+                self._thread = threading.Thread(target=self._run, name="fruina-heartbeat", daemon=True)
+                self._thread.start()
+
+    def renew(self) -> List[str]:
+        """Renew every tracked lease now; returns the ids that were lost."""
+        lease_ids = list(self._refs)
+        if not lease_ids:
+            return []
+        lost = self.transport.renew(lease_ids)
+        self._renewed(lease_ids, lost)
+        return lost
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                if not self._refs:
+                    self._thread = None
+                    return
+            try:
+                self.renew()
+            except Exception as e:
+                # Leases survive a missed beat or two; try again next time
+                self.stats["errors"] += 1
+                logger.warning(f"Lease renewal failed: {e}")
+
+    def close(self):
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+class AsyncLeaseKeeper(_Leases):
+    """Renews an AsyncClient's leases from a task on its event loop."""
+    def __init__(self, transport, interval: float):
+        super().__init__(transport, interval)
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def add(self, obj):
+        self._track(obj)
+        if self._task is None and not self._closed:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def renew(self) -> List[str]:
+        """Renew every tracked lease now; returns the ids that were lost."""
+        lease_ids = list(self._refs)
+        if not lease_ids:
+            return []
+        lost = await self.transport.renew(lease_ids)
+        self._renewed(lease_ids, lost)
+        return lost
+
+    async def _run(self):
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                if not self._refs:
+                    return
+                try:
+                    await self.renew()
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    logger.warning(f"Lease renewal failed: {e}")
+        finally:
+            self._task = None
+
+    async def close(self):
+        self._closed = True
+        task = self._task
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,29 @@
+import os
+import mmap
+import weakref
+
+from ...core.blob import file_of
+
+def map_object(obj) -> memoryview:
+    """
+    A read-only memoryview over a private mapping of a read Object's data,
+    which takes over the Object: its lease is released once nothing (no
+    view, array or PickleBuffer built on the mapping) references the
+    mapping any more. Only the descriptor is closed then; the pages stay
+    mapped until the mmap itself is freed.
+    """
+    fd, base, length = file_of(obj._blob)
+    if length is None:
+        length = max(os.fstat(fd).st_size - base, 0)
+    if length == 0:
+        obj.release()
+        return memoryview(b"")
+    start = base - base % mmap.ALLOCATIONGRANULARITY
+    try:
+        mm = mmap.mmap(fd, base - start + length, offset=start, prot=mmap.PROT_READ)
+    except BaseException:
+        obj.release()
+        raise
+    # At interpreter exit the lease just lapses with the process
+    weakref.finalize(mm, obj.release).atexit = False
+    return memoryview(mm)[base - start:]
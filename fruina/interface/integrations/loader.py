@@ -0,0 +1,284 @@
+"""
+Prefetching dataset loader.
+
+DatasetLoader iterates over decoded samples of a list of object ids, or
+of a sharded manifest (see put_manifest), without tying itself to any
+training framework. Gets are issued in batches ahead of the consumer on
+a thread pool, at most `prefetch` items ahead, and each sample is decoded
+as soon as it arrives -- in the fetching threads, or in worker processes
+that are passed the object's file descriptors rather than its bytes.
+A lease is held only from the batched get until the sample is decoded,
+so memory pinned in the cache stays bounded by the prefetch depth.
+
+    loader = DatasetLoader(client, ids, decode=parse, prefetch=256, workers=4)
+    for epoch in range(10):
+        for sample in loader:
+            train_step(sample)
+"""
+import os
+import queue
+import random
+import socket
+import time
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing.reduction import recvfds, sendfds
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from ...transport.base import open_handle
+from ._mapping import map_object
+
+# Decoder: (object data, object meta) -> sample
+Decoder = Callable[[memoryview, Dict[str, Any]], Any]
+
+MANIFEST_KEY = "manifest"
+MANIFEST_SHARD_SIZE = 10000
+
+def put_manifest(client, object_ids: Sequence[str], shard_size: int = MANIFEST_SHARD_SIZE) -> List[str]:
+    """
+    Store a list of object ids as manifest shards of `shard_size` ids each
+    (newline-separated objects); returns the shard ids, in order.
+    """
+    shards = []
+    for i in range(0, len(object_ids), shard_size):
+        chunk = object_ids[i:i + shard_size]
+        with client.create_stream(meta={MANIFEST_KEY: {"count": len(chunk)}}) as writer:
+            writer.write("\n".join(chunk).encode())
+        shards.append(writer.id)
+    return shards
+
+def read_manifest(client, shard_id: str) -> List[str]:
+    """The object ids listed in one manifest shard."""
+    with client.get(shard_id) as obj:
+        data = bytes(obj.buffer)
+    return data.decode().split("\n") if data else []
+
+def _copy(buffer: memoryview, meta: Dict[str, Any]) -> bytes:
+    return bytes(buffer)
+
+class DatasetLoader:
+    """
+    Iterable over the decoded samples of a dataset stored in Fruina.
+
+    ids / manifest: the samples, either as object ids or as manifest
+        shard ids (put_manifest); shards are read lazily as iteration
+        reaches them.
+    decode: turns (data, meta) into a sample; by default the bytes.
+        In-process the data is a read-only view of the object's mapping,
+        and a sample may keep referencing it (zero-copy) -- the lease then
+        lasts as long as the sample does. With workers it runs in a worker
+        process and its result is pickled back, so it must be picklable,
+        as must `decode` itself unless the "fork" start method is used.
+    prefetch: samples fetched ahead of the consumer at most.
+    batch_size: ids per batched get.
+    threads: fetch/decode threads.
+    workers: decode processes; 0 decodes in the fetch threads.
+    shuffle, seed: reshuffle every epoch (shard order and ids within a
+        shard for manifests), reproducibly from seed and epoch.
+    rank, world_size: iterate over this rank's share only -- every
+        world_size-th id, or every world_size-th manifest shard.
+
+    Samples come out in dataset order. A sample that could not be fetched
+    or decoded raises its error when the consumer reaches it, ending the
+    epoch. `stats` counts how often, and for how long, the consumer had
+    to wait.
+    """
+    def __init__(self, client, ids: Optional[Sequence[str]] = None, manifest: Optional[Sequence[str]] = None,
+                 decode: Optional[Decoder] = None, prefetch: int = 64, batch_size: int = 16, threads: int = 4,
+                 workers: int = 0, shuffle: bool = False, seed: int = 0, rank: int = 0, world_size: int = 1,
+                 mp_context: Optional[str] = None):
+        if (ids is None) == (manifest is None):
+            raise ValueError("Pass exactly one of ids or manifest")
+        self.client = client
+        self.ids = list(ids) if ids is not None else None
+        self.manifest = list(manifest) if manifest is not None else None
+        self.decode = decode or _copy
+        self.prefetch = max(1, prefetch)
+        self.batch_size = max(1, min(batch_size, self.prefetch))
+        self.threads = max(1, threads)
+        self.workers = workers
+        self.shuffle = shuffle
+        self.seed = seed
+        self.rank = rank
+        self.world_size = world_size
+        self.mp_context = mp_context
+        self.epoch = 0
+        self.stats = {"samples": 0, "waits": 0, "wait_seconds": 0.0}
+
+    def __len__(self) -> int:
+        if self.ids is None:
+            raise TypeError("Length of a manifest-backed loader is not known up front")
+        return len(self.ids[self.rank::self.world_size])
+
+    def _id_stream(self, rng: random.Random) -> Iterator[str]:
+        if self.ids is not None:
+            ids = self.ids[self.rank::self.world_size]
+            if self.shuffle:
+                rng.shuffle(ids)
+            yield from ids
+            return
+        shards = self.manifest[self.rank::self.world_size]
+        if self.shuffle:
+            rng.shuffle(shards)
+        for shard in shards:
+            ids = read_manifest(self.client, shard)
+            if self.shuffle:
+                rng.shuffle(ids)
+            yield from ids
+
+    def __iter__(self) -> Iterator[Any]:
+        rng = random.Random(self.seed + self.epoch)
+        self.epoch += 1
+        ids = self._id_stream(rng)
+        pending: deque = deque()
+        workers = _WorkerPool(self.workers, self.decode, self.mp_context) if self.workers > 0 else None
+        # Threads that hand samples to worker processes block on them, hence the extra ones
+        pool = ThreadPoolExecutor(self.threads + self.workers, thread_name_prefix="fruina-loader")
+        try:
+            exhausted = False
+            while True:
+                # Top the window up to `prefetch` samples, a batch at a time
+                while not exhausted and len(pending) + self.batch_size <= self.prefetch:
+                    batch = [object_id for _, object_id in zip(range(self.batch_size), ids)]
+                    if not batch:
+                        exhausted = True
+                        break
+                    futures = [Future() for _ in batch]
+                    pending.extend(futures)
+                    pool.submit(self._fetch, pool, workers, batch, futures)
+                if not pending:
+                    return
+                future = pending.popleft()
+                if not future.done():
+                    self.stats["waits"] += 1
+                    start = time.perf_counter()
+                    future.result()
+                    self.stats["wait_seconds"] += time.perf_counter() - start
+                self.stats["samples"] += 1
+                yield future.result()
+        finally:
+            # Let in-flight fetches finish so that every lease is given back
+            pool.shutdown(wait=True)
+            if workers is not None:
+                workers.close()
+
+    def _fetch(self, pool: ThreadPoolExecutor, workers: Optional["_WorkerPool"], batch: List[str],
+               futures: List[Future]):
+        try:
+            objs = self.client.get_many(batch)
+        except Exception:
+            # Find out which ids failed; the rest still load
+            objs = []
+            for object_id, future in zip(batch, futures):
+                try:
+                    objs.append(self.client.get(object_id))
+                except Exception as e:
+                    future.set_exception(e)
+                    objs.append(None)
+        for obj, future in zip(objs, futures):
+            if obj is None:
+                continue
+            try:
+                pool.submit(self._decode, workers, obj, future)
+            except RuntimeError:
+                # The consumer stopped iterating and the pool is shutting down
+                obj.release()
+                future.cancel()
+
+    def _decode(self, workers: Optional["_WorkerPool"], obj, future: Future):
+        try:
+            if workers is not None:
+                try:
+                    future.set_result(workers.decode(obj))
+                finally:
+                    obj.release()
+            else:
+                # The mapping owns the lease from here on
+                meta = obj.info.get("meta") or {}
+                future.set_result(self.decode(map_object(obj), meta))
+        except BaseException as e:
+            future.set_exception(e)
+
+class _Worker:
+    def __init__(self, ctx, decode: Decoder):
+        self.conn, child = ctx.Pipe(duplex=True)
+        self.process = ctx.Process(target=_worker_main, args=(child, decode), daemon=True)
+        self.process.start()
+        child.close()
+        # For SCM_RIGHTS alongside the Connection's own messages
+        self.sock = socket.socket(fileno=os.dup(self.conn.fileno()))
+
+    def decode(self, obj) -> Any:
+        fds = [h for h in obj.handles if isinstance(h, int)]
+        handles = [None if isinstance(h, int) else h for h in obj.handles]
+        self.conn.send({"handles": handles, "meta": obj.info.get("meta") or {}, "nfds": len(fds)})
+        if fds:
+            sendfds(self.sock, fds)
+        status, value = self.conn.recv()
+        if status == "error":
+            raise value
+        return value
+
+    def close(self):
+        self.sock.close()
+        self.conn.close()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+
+class _WorkerPool:
+    """Decode processes, each serving one request at a time."""
+    def __init__(self, size: int, decode: Decoder, mp_context: Optional[str]):
+        self.ctx = multiprocessing.get_context(mp_context)
+        self.decoder = decode
+        self.workers = [_Worker(self.ctx, decode) for _ in range(size)]
+        self.idle: "queue.Queue[_Worker]" = queue.Queue()
+        for worker in self.workers:
+            self.idle.put(worker)
+
+    def decode(self, obj) -> Any:
+        worker = self.idle.get()
+        try:
+            result = worker.decode(obj)
+        except (EOFError, OSError):
+            # The worker died (or its channel broke); replace it
+            worker.close()
+            self.workers.remove(worker)
+            worker = _Worker(self.ctx, self.decoder)
+            self.workers.append(worker)
+            raise RuntimeError(f"Decode worker failed on object {obj.id}")
+        finally:
+            self.idle.put(worker)
+        return result
+
+    def close(self):
+        for worker in self.workers:
+            worker.close()
+
+def _worker_main(conn, decode: Decoder):
+    sock = socket.socket(fileno=os.dup(conn.fileno()))
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        fds = deque(recvfds(sock, request["nfds"])) if request["nfds"] else deque()
+        handles = [fds.popleft() if h is None else h for h in request["handles"]]
+        views = [open_handle(h) for h in handles]
+        try:
+            reply = ("ok", decode(views[0].memoryview(), request["meta"]))
+        except Exception as e:
+            reply = ("error", e)
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # An unpicklable sample or error
+            conn.send(("error", RuntimeError(f"Cannot send decoded sample back: {e!r}")))
+        del reply
+        for view in views:
+            try:
+                view.close()
+            except BufferError:
+                pass  # decode kept a view of the data; the mapping goes with it
+    sock.close()
@@ -0,0 +1,82 @@
+"""
+Zero-copy NumPy integration.
+
+put_array() writes an array's buffer straight into a new object and
+records how to interpret it in the object's meta:
+
+    {"ndarray": {"dtype": ..., "shape": [...], "strides": [...],
+                 "order": "C" | "F", "alignment": 8}}
+
+get_array() returns a read-only ndarray over the object's mapping; no
+bytes are copied. The read lease is held until the last array (or view
+of it) that uses the mapping is garbage collected.
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+from numpy.lib.format import descr_to_dtype, dtype_to_descr
+
+from ._mapping import map_object
+
+META_KEY = "ndarray"
+
+def put_array(client, array: Any, order: str = "A", meta: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Store an array and return the new object's id.
+
+    order: "C" or "F" for the memory layout of the stored copy; "A" keeps
+        Fortran order for arrays that already are Fortran-contiguous, so
+        no reordering copy is made.
+    meta: extra metadata to store alongside the array description.
+
+    Structured dtypes are supported; object arrays are not (their
+    elements are pointers into this process).
+    """
+    array = np.asarray(array)
+    if array.dtype.hasobject:
+        raise TypeError("Arrays of Python objects cannot be stored as raw buffers")
+    if order == "A":
+        order = "F" if array.flags.f_contiguous and not array.flags.c_contiguous else "C"
+    if order not in ("C", "F"):
+        raise ValueError(f"order must be 'C', 'F' or 'A', not {order!r}")
+    # Copies only if the array is not laid out that way already
+    array = np.asarray(array, order=order)
+
+    meta = dict(meta or {})
+    meta[META_KEY] = {
+        "dtype": dtype_to_descr(array.dtype),
+        "shape": list(array.shape),
+        "strides": list(array.strides),
+        "order": order,
+        "alignment": array.dtype.alignment,
+    }
+    with client.create_stream(meta=meta, initial_capacity=array.nbytes) as writer:
+        # A flat byte view of the contiguous buffer, in memory order
+        writer.write(array.ravel(order="K").view(np.uint8))
+    return writer.id
+
+def get_array(client, object_id: str) -> np.ndarray:
+    """
+    Return a read-only ndarray over a stored array without copying it.
+
+    The object's read lease stays alive as long as the array or any view
+    derived from it does. If the mapping is not aligned for the dtype
+    (possible for file-backed objects with an odd data offset), an aligned
+    copy is returned instead and the lease is released at once.
+    """
+    obj = client.get(object_id)
+    try:
+        layout = obj.get_meta(META_KEY)
+        if layout is None:
+            raise ValueError(f"Object {object_id} does not hold a NumPy array")
+        dtype = descr_to_dtype(layout["dtype"])
+    except BaseException:
+        obj.release()
+        raise
+    # From here the lease belongs to the mapping
+    mapped = np.frombuffer(map_object(obj), dtype=np.uint8)
+    array = np.ndarray(tuple(layout["shape"]), dtype=dtype, buffer=mapped,
+                       strides=tuple(layout["strides"]))
+    if mapped.ctypes.data % layout.get("alignment", dtype.alignment):
+        return array.copy(order="K")
+    return array
@@ -0,0 +1,214 @@
+"""
+Zero-copy safetensors checkpoints.
+
+A safetensors file is stored as-is in one object (put_file, or
+put_tensors to write the format from NumPy arrays):
+
+    [u64 little-endian header size N][N bytes of JSON header][tensor data]
+
+load() parses the header straight from the object's mapping and returns
+NumPy arrays that are read-only views of it; no tensor bytes are copied
+and the read lease is held until the last of them is freed. With `names`
+only those tensors are read, each with a range read (preadv) into an
+array of its own, and the lease is released before returning.
+load_shards() does either for a multi-shard checkpoint, acquiring all
+shards with one batched get and loading them on a thread pool.
+
+BF16 and FP8 tensors use ml_dtypes when it is installed; without it they
+come back as unsigned integers holding the raw bit patterns.
+"""
+import os
+import json
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ...core.blob import file_of
+from ._mapping import map_object
+
+META_KEY = "safetensors"
+HEADER_LENGTH = struct.Struct("<Q")
+# Headers beyond this are rejected as corrupt (the reference limit)
+MAX_HEADER_SIZE = 100 * 1024 * 1024
+COPY_CHUNK = 8 * 1024 * 1024
+
+DTYPES = {
+    "F64": np.dtype("<f8"), "F32": np.dtype("<f4"), "F16": np.dtype("<f2"),
+    "I64": np.dtype("<i8"), "I32": np.dtype("<i4"), "I16": np.dtype("<i2"), "I8": np.dtype("i1"),
+    "U64": np.dtype("<u8"), "U32": np.dtype("<u4"), "U16": np.dtype("<u2"), "U8": np.dtype("u1"),
+    "BOOL": np.dtype("?"),
+}
+try:
+    import ml_dtypes
+    DTYPES.update({"BF16": np.dtype(ml_dtypes.bfloat16), "F8_E4M3": np.dtype(ml_dtypes.float8_e4m3fn),
+                   "F8_E5M2": np.dtype(ml_dtypes.float8_e5m2)})
+except ImportError:
+    DTYPES.update({"BF16": np.dtype("<u2"), "F8_E4M3": np.dtype("u1"), "F8_E5M2": np.dtype("u1")})
+CODES = {dtype: code for code, dtype in DTYPES.items() if not code.startswith(("BF16", "F8"))}
+
+def put_file(client, path: str, meta: Optional[Dict[str, Any]] = None) -> str:
+    """Store a .safetensors file as a new object; returns its id."""
+    with open(path, "rb", buffering=0) as f:
+        header = f.read(HEADER_LENGTH.size)
+        if len(header) < HEADER_LENGTH.size:
+            raise ValueError(f"{path} is not a safetensors file")
+        (header_size,) = HEADER_LENGTH.unpack(header)
+        if header_size > MAX_HEADER_SIZE:
+            raise ValueError(f"{path}: header of {header_size} bytes is too large")
+        meta = dict(meta or {})
+        meta[META_KEY] = {"header_size": header_size}
+        buf = bytearray(COPY_CHUNK)
+        view = memoryview(buf)
+        with client.create_stream(meta=meta) as writer:
+            writer.write(header)
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                writer.write(view[:n])
+    return writer.id
+
+def put_tensors(client, tensors: Dict[str, Any], metadata: Optional[Dict[str, str]] = None,
+                meta: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Write NumPy arrays as a safetensors object; returns its id. Tensors
+    are laid out by decreasing alignment, then name, as the reference
+    writer does, so each one is aligned in the mapping.
+    """
+    arrays = {name: np.asarray(array) for name, array in tensors.items()}
+    order = sorted(arrays, key=lambda name: (-arrays[name].dtype.alignment, name))
+    header: Dict[str, Any] = {}
+    if metadata:
+        header["__metadata__"] = metadata
+    offset = 0
+    for name in order:
+        array = arrays[name]
+        if array.dtype.byteorder == ">":
+            array = arrays[name] = array.astype(array.dtype.newbyteorder("<"))
+        code = CODES.get(array.dtype)
+        if code is None:
+            raise TypeError(f"Tensor {name}: dtype {array.dtype} has no safetensors equivalent")
+        header[name] = {"dtype": code, "shape": list(array.shape), "data_offsets": [offset, offset + array.nbytes]}
+        offset += array.nbytes
+    encoded = json.dumps(header, separators=(",", ":")).encode()
+    # Pad with spaces so tensor data starts 8-byte aligned
+    encoded += b" " * (-len(encoded) % 8)
+
+    meta = dict(meta or {})
+    meta[META_KEY] = {"header_size": len(encoded)}
+    with client.create_stream(meta=meta, initial_capacity=HEADER_LENGTH.size + len(encoded) + offset) as writer:
+        writer.write(HEADER_LENGTH.pack(len(encoded)))
+        writer.write(encoded)
+        for name in order:
+            writer.write(np.ascontiguousarray(arrays[name]).ravel().view(np.uint8))
+    return writer.id
+
+def load(client, object_id: str, names: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Load the tensors of a safetensors object: all of them as zero-copy
+    views of the mapping, or only `names` with range reads.
+    """
+    return _load(client.get(object_id), names)
+
+def load_shards(client, object_ids: List[str], names: Optional[Iterable[str]] = None,
+                threads: int = 8) -> Dict[str, np.ndarray]:
+    """
+    Load a checkpoint split over several safetensors objects into one
+    dict. All shards are acquired with a single batched get, then parsed
+    (or range-read, with `names`) in parallel. A tensor name appearing in
+    two shards is an error.
+    """
+    wanted = set(names) if names is not None else None
+    objs = client.get_many(object_ids)
+    with ThreadPoolExecutor(max(1, min(threads, len(objs)))) as pool:
+        futures = [pool.submit(_load, obj, wanted, False) for obj in objs]
+        shards = [future.result() for future in futures]
+    tensors: Dict[str, np.ndarray] = {}
+    for object_id, shard in zip(object_ids, shards):
+        for name, array in shard.items():
+            if name in tensors:
+                raise ValueError(f"Tensor {name} appears in more than one shard (again in {object_id})")
+            tensors[name] = array
+    if wanted is not None and wanted - tensors.keys():
+        raise KeyError(f"Tensors not found: {sorted(wanted - tensors.keys())}")
+    return tensors
+
+def _load(obj, names: Optional[Iterable[str]] = None, require_all: bool = True) -> Dict[str, np.ndarray]:
+    """Load from an acquired read Object, which this takes over."""
+    if names is None:
+        mapped = map_object(obj)
+        header_size, header = _parse_header(mapped[:HEADER_LENGTH.size], len(mapped),
+                                            lambda size: mapped[HEADER_LENGTH.size:HEADER_LENGTH.size + size])
+        start = HEADER_LENGTH.size + header_size
+        return {name: np.frombuffer(mapped, dtype=DTYPES[info["dtype"]], count=_count(info),
+                                    offset=start + info["data_offsets"][0]).reshape(info["shape"])
+                for name, info in header.items()}
+
+    try:
+        wanted = set(names)
+        length = bytearray(HEADER_LENGTH.size)
+        obj.readinto(length, 0)
+        fd, base, size = file_of(obj._blob)
+        if size is None:
+            size = os.fstat(fd).st_size - base
+
+        def read_header(header_size: int) -> bytearray:
+            buf = bytearray(header_size)
+            if obj.readinto(buf, HEADER_LENGTH.size) != header_size:
+                raise ValueError(f"Object {obj.id}: truncated safetensors header")
+            return buf
+
+        header_size, header = _parse_header(length, size, read_header)
+        missing = wanted - header.keys()
+        if missing and require_all:
+            raise KeyError(f"Tensors not found in {obj.id}: {sorted(missing)}")
+        start = HEADER_LENGTH.size + header_size
+        tensors = {}
+        for name in wanted & header.keys():
+            info = header[name]
+            array = np.empty(info["shape"], dtype=DTYPES[info["dtype"]])
+            begin, end = info["data_offsets"]
+            if end > begin and obj.readinto(array, start + begin) != end - begin:
+                raise ValueError(f"Object {obj.id}: tensor {name} is truncated")
+            tensors[name] = array
+        return tensors
+    finally:
+        obj.release()
+
+def _parse_header(length: Any, size: int, read_header) -> tuple:
+    """(header size, tensor entries) -- validated against the object size."""
+    if len(length) < HEADER_LENGTH.size:
+        raise ValueError("Not a safetensors object")
+    (header_size,) = HEADER_LENGTH.unpack(length)
+    if header_size > MAX_HEADER_SIZE or HEADER_LENGTH.size + header_size > size:
+        raise ValueError(f"Invalid safetensors header size {header_size}")
+    header = json.loads(bytes(read_header(header_size)))
+    header.pop("__metadata__", None)
+    data_size = size - HEADER_LENGTH.size - header_size
+    for name, info in header.items():
+        if info.get("dtype") not in DTYPES:
+            raise ValueError(f"Tensor {name}: unsupported dtype {info.get('dtype')}")
+        begin, end = info["data_offsets"]
+        if not 0 <= begin <= end <= data_size or end - begin != _count(info) * DTYPES[info["dtype"]].itemsize:
+            raise ValueError(f"Tensor {name}: data_offsets {info['data_offsets']} do not fit its shape and the object")
+    return header_size, header
+
+def _count(info: Dict[str, Any]) -> int:
+    count = 1
+    for dim in info["shape"]:
+        count *= dim
+    return count
+
+def metadata(client, object_id: str) -> Dict[str, str]:
+    """The free-form __metadata__ of a safetensors object."""
+    with client.get(object_id) as obj:
+        length = bytearray(HEADER_LENGTH.size)
+        obj.readinto(length, 0)
+        (header_size,) = HEADER_LENGTH.unpack(length)
+        if header_size > MAX_HEADER_SIZE:
+            raise ValueError(f"Invalid safetensors header size {header_size}")
+        buf = bytearray(header_size)
+        obj.readinto(buf, HEADER_LENGTH.size)
+    return json.loads(bytes(buf)).get("__metadata__", {})
@@ -0,0 +1,134 @@
+import os
+import mmap
+from typing import Any, Iterable, Optional
+from ..core.blob import file_of
+
+# First capacity reserved for a stream; it doubles each time it fills up
+INITIAL_CAPACITY = 64 * 1024
+GROWTH_FACTOR = 2
+# Writes of a page or more go to the file with pwrite: one syscall beats
+# faulting (and zero-filling) fresh pages through the mapping
+WRITE_THROUGH_SIZE = mmap.PAGESIZE
+
+class ObjectWriter:
+    """
+    Streaming writer for a new object whose final size is not known up front.
+
+    Small writes are copied straight into a shared mapping of the blob, so
+    they cost a memcpy rather than a syscall each; large ones go to the
+    file with a single pwrite. When the blob fills up it is grown
+    geometrically (ftruncate, then remap), making growth amortized O(1)
+    per byte; seal() trims the blob to the bytes actually written.
+
+    Used as a context manager the object is sealed and released on a clean
+    exit and discarded if the block raises.
+    """
+    def __init__(self, obj, initial_capacity: int = INITIAL_CAPACITY):
+        self.object = obj
+        self._fd, self._base, _ = file_of(obj._blob)
+        self._initial_capacity = max(initial_capacity, mmap.PAGESIZE)
+        self._capacity = 0
+        self._position = 0
+        self._mmap: Optional[mmap.mmap] = None
+        # The mapping starts at the page boundary at or below the data offset
+        self._map_start = self._base - self._base % mmap.ALLOCATIONGRANULARITY
+        self._skew = self._base - self._map_start
+        self.closed = False
+        self.sealed = False
+
+    @property
+    def id(self) -> str:
+        return self.object.id
+
+    def writable(self) -> bool:
+        return not self.closed
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data: Any) -> int:
+        """Append any buffer-protocol object. Returns the number of bytes written."""
+        if self.closed:
+            raise ValueError("Stream is closed")
+        if type(data) is bytes or type(data) is bytearray:
+            view, n = data, len(data)
+        else:
+            view = memoryview(data)
+            if not view.contiguous:
+                view = memoryview(view.tobytes())
+            n = view.nbytes
+        if n == 0:
+            return 0
+        end = self._position + n
+        if end > self._capacity:
+            self._grow(end)
+        if n >= WRITE_THROUGH_SIZE:
+            written = os.pwrite(self._fd, view, self._base + self._position)
+            if written < n:
+                self._pwrite(memoryview(view).cast('B')[written:], self._position + written)
+        else:
+            start = self._skew + self._position
+            self._mmap[start:start + n] = view
+        self._position = end
+        return n
+
+    def _pwrite(self, view: memoryview, position: int):
+        while len(view):
+            n = os.pwrite(self._fd, view, self._base + position)
+            view, position = view[n:], position + n
+
+    def writelines(self, chunks: Iterable[Any]) -> None:
+        for chunk in chunks:
+            self.write(chunk)
+
+    def flush(self) -> None:
+        pass
+
+    def _grow(self, needed: int):
+        capacity = max(self._capacity * GROWTH_FACTOR, self._initial_capacity)
+        while capacity < needed:
+            capacity *= GROWTH_FACTOR
+        self._unmap()
+        os.ftruncate(self._fd, self._base + capacity)
+        self._mmap = mmap.mmap(self._fd, self._skew + capacity, flags=mmap.MAP_SHARED,
+                               prot=mmap.PROT_READ | mmap.PROT_WRITE, offset=self._map_start)
+        self._capacity = capacity
+
+    def _unmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _finish(self):
+        """Unmap and trim the blob to the written size."""
+        if self.closed:
+            return
+        self.closed = True
+        self._unmap()
+        os.ftruncate(self._fd, self._base + self._position)
+
+    def seal(self):
+        """Trim to the exact size and seal the object."""
+        self._finish()
+        self.object.seal()
+        self.sealed = True
+
+    def release(self):
+        self._finish()
+        self.object.release()
+
+    def discard(self):
+        self.closed = True
+        self._unmap()
+        self.object.discard()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.discard()
+            return
+        if not self.sealed:
+            self.seal()
+        self.object.release()
@@ -1 +1,6 @@
-from .transport import P2PTransport, RemoteBlob
+from .transport import P2PTransport, RemoteBlob, PartialObject
+from .shaping import BandwidthScheduler, Priority
+from .server import DataServer
+from .tracker import Tracker, TrackerServer, RemoteTracker, TrackedPeer
+from .gossip import GossipNode, Member, MemberState, peer_stats
+from .swarm import SwarmDownloader
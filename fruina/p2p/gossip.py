@@ -0,0 +1,413 @@
+import os
+import math
+import json
+import time
+import random
+import socket
+import logging
+import threading
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from ..core.peer import Peer
+from .protocol import parse_address
+
+logger = logging.getLogger(__name__)
+
+MAX_DATAGRAM = 65000
+MAX_PIGGYBACK = 16
+
+class MemberState(Enum):
+    ALIVE = "alive"
+    SUSPECT = "suspect"
+    DEAD = "dead"
+
+# Within one incarnation a worse state overrides a better one
+_STATE_RANK = {MemberState.ALIVE: 0, MemberState.SUSPECT: 1, MemberState.DEAD: 2}
+
+class Member:
+    def __init__(self, address: str, data_address: Optional[str], incarnation: int, state: MemberState,
+                 stats: Optional[Dict[str, Any]] = None, stats_version: int = 0):
+        self.address = address
+        self.data_address = data_address
+        self.incarnation = incarnation
+        self.state = state
+        self.stats = stats or {}
+        self.stats_version = stats_version
+        self.changed_at = time.monotonic()
+
+    def to_update(self) -> Dict[str, Any]:
+        return {"a": self.address, "d": self.data_address, "i": self.incarnation,
+                "s": self.state.value, "v": self.stats_version, "st": self.stats}
+
+    def __repr__(self):
+        return f"Member({self.address}, {self.state.value}, inc={self.incarnation}, stats={self.stats})"
+
+def _object_bytes(peer: Peer) -> int:
+    """Bytes held by the objects a Peer tracks in memory (fd- and path-backed blobs)."""
+    total = 0
+    for obj in list(peer.objects.values()):
+        for blob in obj.blobs:
+            handle = blob.get_handle()
+            try:
+                if isinstance(handle, int):
+                    total += os.fstat(handle).st_size
+                elif isinstance(handle, str):
+                    total += os.path.getsize(handle)
+            except OSError:
+                pass
+    return total
+
+def peer_stats(peer: Peer, data_server=None, capacity_bytes: Optional[int] = None,
+               used_bytes: Optional[Callable[[], int]] = None) -> Callable[[], Dict[str, Any]]:
+    """
+    Build a stats callback for GossipNode reporting bytes free, outstanding
+    leases and egress rate (bytes/s, from the DataServer's counters).
+    """
+    last = {"bytes": 0, "at": time.monotonic()}
+
+    def stats() -> Dict[str, Any]:
+        result = {"outstanding_leases": len(peer.leases)}
+        if capacity_bytes is not None:
+            used = used_bytes() if used_bytes else _object_bytes(peer)
+            result["bytes_free"] = max(capacity_bytes - used, 0)
+        if data_server is not None:
+            now = time.monotonic()
+            sent = data_server.bytes_sent
+            result["egress_rate"] = int((sent - last["bytes"]) / max(now - last["at"], 1e-3))
+            result["active_transfers"] = data_server.active_transfers
+            last["bytes"], last["at"] = sent, now
+        return result
+    return stats
+
+class GossipNode:
+    """
+    SWIM-style membership over UDP.
+
+    Every `interval` seconds the node pings one member (round robin over a
+    shuffled list). If no ack arrives within `ack_timeout`, it asks
+    `indirect_probes` other members to ping the target on its behalf; if
+    that fails too the target becomes SUSPECT, and DEAD after
+    `suspect_timeout` unless it refutes by bumping its incarnation.
+    Membership changes and each node's load stats ride on pings and acks,
+    each retransmitted about 3*log2(N) times, so a dead node is known
+    cluster-wide within a few seconds without any extra traffic.
+
+    `data_address` is the node's DataServer address, so load and liveness
+    can be matched against tracker holders; `stats` is a callable
+    returning a small JSON-able dict (see peer_stats()).
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, data_address: Optional[str] = None,
+                 seeds: Optional[List[str]] = None, stats: Optional[Callable[[], Dict[str, Any]]] = None,
+                 interval: float = 0.5, ack_timeout: float = 0.2, indirect_probes: int = 3,
+                 suspect_timeout: float = 2.0, dead_retention: float = 30.0):
+        self.host = host
+        self.port = port
+        self.data_address = data_address
+        self.seeds = list(seeds or [])
+        self.stats_fn = stats
+        self.interval = interval
+        self.ack_timeout = ack_timeout
+        self.indirect_probes = indirect_probes
+        self.suspect_timeout = suspect_timeout
+        self.dead_retention = dead_retention
+
+        # Wall-clock incarnation: a restarted node always outranks its old self
+        self.incarnation = int(time.time() * 1000)
+        self.stats_version = 0
+        self.members: Dict[str, Member] = {}
+        self._updates: Dict[str, int] = {}  # address -> remaining retransmissions
+        self._acks: Dict[int, threading.Event] = {}
+        self._relays: Dict[int, Tuple[str, int, float]] = {}  # our seq -> (requester, their seq, sent at)
+        self._seq = 0
+        self._probe_order: List[str] = []
+        self._listeners: List[Callable[[Member, Optional[MemberState]], None]] = []
+        self._lock = threading.RLock()
+        self._sock: Optional[socket.socket] = None
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def subscribe(self, callback: Callable[[Member, Optional[MemberState]], None]):
+        """callback(member, previous_state) on every state change (previous is None for joins)."""
+        self._listeners.append(callback)
+
+    # --- Lifecycle ---
+
+    def start(self):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((self.host, self.port))
+        self._sock.settimeout(0.1)
+        self.port = self._sock.getsockname()[1]
+        self._refresh_self()
+
+        for target in (self._receive_loop, self._protocol_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        for seed in self.seeds:
+            if seed != self.address:
+                self._send(seed, {"t": "join", "u": [self._self_update()]})
+        logger.info(f"Gossip node {self.address} started (seeds: {self.seeds})")
+
+    def stop(self, leave: bool = True):
+        """Stop gossiping; with `leave`, tell a few members first so we drop out at once."""
+        if leave:
+            with self._lock:
+                update = dict(self._self_update(), s=MemberState.DEAD.value)
+                targets = [m.address for m in self._live_members()][:self.indirect_probes + 1]
+            for address in targets:
+                self._send(address, {"t": "ping", "seq": 0, "u": [update]})
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join()
+        self._sock.close()
+
+    # --- Queries ---
+
+    def alive_members(self) -> List[Member]:
+        with self._lock:
+            return [m for m in self.members.values() if m.state != MemberState.DEAD]
+
+    def rank(self, data_addresses: List[str]) -> List[str]:
+        """
+        Order DataServer addresses for fetching: known-dead nodes removed,
+        least loaded first (active transfers, egress rate, outstanding
+        leases), unknown nodes last.
+        """
+        with self._lock:
+            by_data = {m.data_address: m for m in self.members.values() if m.data_address}
+        ranked = []
+        for i, address in enumerate(data_addresses):
+            member = by_data.get(address)
+            if member is None:
+                ranked.append(((2, 0, 0, 0), i, address))
+            elif member.state != MemberState.DEAD:
+                st = member.stats
+                load = (_STATE_RANK[member.state], st.get("active_transfers", 0),
+                        st.get("egress_rate", 0), st.get("outstanding_leases", 0))
+                ranked.append((load, i, address))
+        return [address for _, _, address in sorted(ranked)]
+
+    # --- Membership state ---
+
+    def _self_update(self) -> Dict[str, Any]:
+        return self.members[self.address].to_update()
+
+    def _refresh_self(self):
+        stats = {}
+        if self.stats_fn is not None:
+            try:
+                stats = self.stats_fn()
+            except Exception as e:
+                logger.warning(f"Gossip stats callback failed: {e}")
+        with self._lock:
+            me = self.members.get(self.address)
+            if me is None:
+                me = self.members[self.address] = Member(self.address, self.data_address, self.incarnation, MemberState.ALIVE)
+            me.incarnation = self.incarnation
+            if stats != me.stats:
+                self.stats_version += 1
+                me.stats, me.stats_version = stats, self.stats_version
+                self._enqueue(self.address)
+
+    def _live_members(self) -> List[Member]:
+        return [m for m in self.members.values() if m.address != self.address and m.state != MemberState.DEAD]
+
+    def _enqueue(self, address: str):
+        n = max(len(self.members), 1)
+        self._updates[address] = 3 * max(1, math.ceil(math.log2(n + 1)))
+
+    def _piggyback(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            chosen = sorted(self._updates.items(), key=lambda kv: -kv[1])[:MAX_PIGGYBACK]
+            updates = []
+            for address, remaining in chosen:
+                member = self.members.get(address)
+                if member is not None:
+                    updates.append(member.to_update())
+                if remaining <= 1:
+                    del self._updates[address]
+                else:
+                    self._updates[address] = remaining - 1
+            return updates
+
+    def _apply(self, update: Dict[str, Any]):
+        address = update["a"]
+        state = MemberState(update["s"])
+        incarnation = update["i"]
+
+        with self._lock:
+            if address == self.address:
+                if state != MemberState.ALIVE and incarnation >= self.incarnation:
+                    # Refute: we are alive, outrank the rumour
+                    self.incarnation = incarnation + 1
+                    self.members[self.address].incarnation = self.incarnation
+                    self._enqueue(self.address)
+                return
+
+            member = self.members.get(address)
+            if member is None:
+                if state == MemberState.DEAD:
+                    return
+                member = Member(address, update.get("d"), incarnation, state, update.get("st"), update.get("v", 0))
+                self.members[address] = member
+                self._probe_order.append(address)
+                self._enqueue(address)
+                self._notify(member, None)
+                return
+
+            previous = member.state
+            changed = False
+            if incarnation > member.incarnation or (
+                    incarnation == member.incarnation and _STATE_RANK[state] > _STATE_RANK[member.state]):
+                member.incarnation = incarnation
+                if state != member.state:
+                    member.state = state
+                    member.changed_at = time.monotonic()
+                changed = True
+            if incarnation >= member.incarnation and update.get("v", 0) > member.stats_version:
+                member.stats, member.stats_version = update.get("st") or {}, update["v"]
+                changed = True
+            if update.get("d"):
+                member.data_address = update["d"]
+            if changed:
+                self._enqueue(address)
+            if member.state != previous:
+                self._notify(member, previous)
+
+    def _set_state(self, address: str, state: MemberState):
+        with self._lock:
+            member = self.members.get(address)
+            if member is None or _STATE_RANK[state] <= _STATE_RANK[member.state]:
+                return
+            previous = member.state
+            member.state = state
+            member.changed_at = time.monotonic()
+            self._enqueue(address)
+            self._notify(member, previous)
+
+    def _notify(self, member: Member, previous: Optional[MemberState]):
+        if previous is not None:
+            logger.info(f"[{self.address}] {member.address}: {previous.value} -> {member.state.value}")
+        for callback in self._listeners:
+            try:
+                callback(member, previous)
+            except Exception as e:
+                logger.warning(f"Gossip listener failed: {e}")
+
+    # --- Failure detection ---
+
+    def _protocol_loop(self):
+        while not self._stopped.wait(self.interval):
+            self._refresh_self()
+            self._expire()
+            target = self._next_target()
+            if target is not None and not self._probe(target):
+                self._set_state(target, MemberState.SUSPECT)
+
+    def _next_target(self) -> Optional[str]:
+        with self._lock:
+            while True:
+                if not self._probe_order:
+                    self._probe_order = [m.address for m in self._live_members()]
+                    random.shuffle(self._probe_order)
+                    if not self._probe_order:
+                        return None
+                address = self._probe_order.pop()
+                member = self.members.get(address)
+                if member is not None and member.state != MemberState.DEAD:
+                    return address
+
+    def _probe(self, target: str) -> bool:
+        seq, acked = self._expect_ack()
+        self._send(target, {"t": "ping", "seq": seq})
+        if acked.wait(self.ack_timeout):
+            return True
+
+        with self._lock:
+            helpers = [m.address for m in self._live_members() if m.address != target]
+        for helper in random.sample(helpers, min(self.indirect_probes, len(helpers))):
+            self._send(helper, {"t": "ping_req", "seq": seq, "target": target})
+        ok = acked.wait(max(self.interval - self.ack_timeout, self.ack_timeout))
+        with self._lock:
+            self._acks.pop(seq, None)
+        return ok
+
+    def _expect_ack(self) -> Tuple[int, threading.Event]:
+        with self._lock:
+            self._seq += 1
+            event = self._acks[self._seq] = threading.Event()
+            return self._seq, event
+
+    def _expire(self):
+        now = time.monotonic()
+        with self._lock:
+            for member in list(self.members.values()):
+                if member.state == MemberState.SUSPECT and now - member.changed_at >= self.suspect_timeout:
+                    self._set_state(member.address, MemberState.DEAD)
+                elif member.state == MemberState.DEAD and now - member.changed_at >= self.dead_retention:
+                    del self.members[member.address]
+                    self._updates.pop(member.address, None)
+            for seq in [s for s, relay in self._relays.items() if now - relay[2] > self.interval]:
+                del self._relays[seq]
+
+    # --- Wire ---
+
+    def _send(self, address: str, message: Dict[str, Any]):
+        message["from"] = self.address
+        if "u" not in message:
+            message["u"] = self._piggyback()
+        try:
+            self._sock.sendto(json.dumps(message).encode('utf-8'), parse_address(address))
+        except OSError as e:
+            logger.debug(f"Gossip send to {address} failed: {e}")
+
+    def _receive_loop(self):
+        while not self._stopped.is_set():
+            try:
+                data, _ = self._sock.recvfrom(MAX_DATAGRAM)
+                message = json.loads(data.decode('utf-8'))
+            except socket.timeout:
+                continue
+            except (OSError, ValueError):
+                if self._stopped.is_set():
+                    break
+                continue
+            try:
+                self._handle(message)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.debug(f"Bad gossip message: {e}")
+
+    def _handle(self, message: Dict[str, Any]):
+        for update in message.get("u", ()):
+            self._apply(update)
+
+        kind = message["t"]
+        sender = message["from"]
+        if kind == "ping":
+            if message["seq"]:
+                self._send(sender, {"t": "ack", "seq": message["seq"]})
+        elif kind == "ack":
+            with self._lock:
+                event = self._acks.get(message["seq"])
+                relay = self._relays.pop(message["seq"], None)
+            if event is not None:
+                event.set()
+            if relay is not None:
+                self._send(relay[0], {"t": "ack", "seq": relay[1]})
+        elif kind == "ping_req":
+            with self._lock:
+                self._seq += 1
+                self._relays[self._seq] = (sender, message["seq"], time.monotonic())
+                seq = self._seq
+            self._send(message["target"], {"t": "ping", "seq": seq})
+        elif kind == "join":
+            with self._lock:
+                state = [m.to_update() for m in self.members.values() if m.state != MemberState.DEAD]
+            # Full state for the newcomer, in datagram-sized pieces
+            for i in range(0, len(state), MAX_PIGGYBACK * 4):
+                self._send(sender, {"t": "sync", "u": state[i:i + MAX_PIGGYBACK * 4]})
@@ -0,0 +1,81 @@
+import json
+import socket
+import struct
+import zlib
+import hashlib
+from typing import Any, Dict, Tuple
+
+# Every message is a length-prefixed JSON frame: Length(I) + JSON body.
+# Raw payload bytes (e.g. a fetched range) follow the frame that announces them.
+FRAME_STRUCT = struct.Struct("!I")
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# Objects are split into fixed-size chunks for swarm transfers, each
+# verified against its digest in the object's manifest.
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+class RemoteError(RuntimeError):
+    """An error reported by the remote node."""
+
+class ChecksumError(IOError):
+    """Received data does not match the digest the source listed for it."""
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """'host:port' -> (host, port)."""
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+def connect(address: str, timeout: float = 30.0) -> socket.socket:
+    sock = socket.create_connection(parse_address(address), timeout=timeout)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+def send_frame(sock: socket.socket, message: Dict[str, Any]) -> None:
+    body = json.dumps(message).encode('utf-8')
+    sock.sendall(FRAME_STRUCT.pack(len(body)) + body)
+
+def recv_exact_into(sock: socket.socket, view: memoryview) -> None:
+    """Fill `view` completely from the socket."""
+    received = 0
+    while received < len(view):
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise ConnectionError("Connection closed by remote node")
+        received += n
+
+def recv_exact(sock: socket.socket, size: int) -> bytes:
+    buf = bytearray(size)
+    recv_exact_into(sock, memoryview(buf))
+    return bytes(buf)
+
+def recv_frame(sock: socket.socket) -> Dict[str, Any]:
+    """Receive one frame. Returns {} if the peer closed the connection cleanly."""
+    header = bytearray(FRAME_STRUCT.size)
+    view = memoryview(header)
+    n = sock.recv_into(view)
+    if n == 0:
+        return {}
+    if n < len(header):
+        recv_exact_into(sock, view[n:])
+    (length,) = FRAME_STRUCT.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {length} bytes exceeds the limit")
+    return json.loads(recv_exact(sock, length).decode('utf-8'))
+
+# Chunk digests: blake2b for swarm manifests (chunks come from untrusted
+# partial holders), crc32 for cheap integrity checks of direct transfers.
+DIGESTS = ('blake2b', 'crc32')
+
+def chunk_digest(data, algorithm: str = 'blake2b') -> str:
+    if algorithm == 'crc32':
+        return f"{zlib.crc32(data):08x}"
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def check_response(resp: Dict[str, Any]) -> Dict[str, Any]:
+    """Raise the remote error carried by `resp`, if any."""
+    status = resp.get("status")
+    if status == "not_found":
+        raise KeyError(resp.get("message"))
+    if status != "ok":
+        raise RemoteError(resp.get("message", "Connection closed by remote node"))
+    return resp
@@ -0,0 +1,277 @@
+import os
+import errno
+import base64
+import socket
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from ..core.peer import Peer
+from ..core.blob import Blob
+from ..core.lease import AccessType
+from ..transport.compression import choose_codec, compress_chunks, COMPRESSION_CHUNK
+from .protocol import send_frame, recv_frame, chunk_digest, DEFAULT_CHUNK_SIZE, DIGESTS
+
+logger = logging.getLogger(__name__)
+
+SENDFILE_CHUNK = 16 * 1024 * 1024
+COPY_CHUNK = 1024 * 1024
+MANIFEST_CACHE_SIZE = 256
+
+COMMANDS = ('stat', 'fetch', 'manifest', 'have')
+
+def open_source(blob: Blob) -> Tuple[Optional[int], int, int]:
+    """
+    Resolve a sealed blob to (fd, data_offset, size) so its bytes can be
+    sent with sendfile. The fd is owned by the caller. Returns
+    (None, 0, size) for blobs without a file behind them.
+    """
+    handle = blob.get_handle()
+    if isinstance(handle, int):
+        fd, base, length = os.dup(handle), 0, None
+    elif isinstance(handle, str):
+        fd, base, length = os.open(handle, os.O_RDONLY), 0, None
+    elif isinstance(handle, dict) and handle.get('type') == 'shared_fs':
+        fd, base, length = os.open(handle['path'], os.O_RDONLY), handle.get('data_offset', 0), handle.get('length')
+    else:
+        return None, 0, len(blob.read())
+
+    if length is None:
+        length = max(os.fstat(fd).st_size - base, 0)
+    return fd, base, length
+
+def send_range(sock: socket.socket, blob: Blob, fd: Optional[int], position: int, length: int, offset: int):
+    """Send `length` bytes of a blob, at `position` in fd (`offset` in the blob), with sendfile if possible."""
+    sent = 0
+    if fd is not None and hasattr(os, 'sendfile'):
+        try:
+            while sent < length:
+                n = os.sendfile(sock.fileno(), fd, position + sent, min(length - sent, SENDFILE_CHUNK))
+                if n == 0:
+                    raise ConnectionError(f"Source ended {length - sent} bytes early")
+                sent += n
+            return
+        except OSError as e:
+            # Only fall back if sendfile is unsupported for this fd pair
+            if sent or e.errno not in (errno.EINVAL, errno.EOPNOTSUPP):
+                raise
+    # Fallback: copy through userspace
+    while sent < length:
+        data = blob.read(min(length - sent, COPY_CHUNK), offset + sent)
+        if not data:
+            raise ConnectionError(f"Source ended {length - sent} bytes early")
+        sock.sendall(data)
+        sent += len(data)
+
+class DataServer:
+    """
+    Serves sealed objects of a Peer to other nodes over TCP.
+
+    Connections are persistent; each request is a frame (see protocol.py):
+      {"command": "stat", "object_id"}                    -> {"status", "size", "meta"}
+      {"command": "fetch", "object_id", "offset", "length", "accept"} -> {"status", "length", "codec"} + payload
+      {"command": "manifest", "object_id", "chunk_size", "digest"} -> {"status", "size", "chunk_size", "digest", "checksums"}
+      {"command": "have", "object_id"}                    -> {"status", "complete", "chunks"}
+    Range payloads are streamed with os.sendfile straight from the blob's
+    memfd or file, so they never pass through Python buffers.
+
+    When the request lists codecs it "accept"s and `compression` is on, the
+    range may instead be sent as independently compressed chunks (see
+    transport/compression.py); the response then names the "codec". The
+    codec comes from the object's meta or a sample-compressibility check,
+    and data that does not compress well is sent raw.
+
+    Objects still being swarm-downloaded can be shared with share_partial();
+    their verified chunks are served to other nodes while the rest arrive.
+    """
+    def __init__(self, peer: Peer, host: str = "127.0.0.1", port: int = 0, compression: bool = True):
+        self.peer = peer
+        self.host = host
+        self.port = port
+        self.compression = compression
+        self.server_socket = None
+        self.running = False
+        self.thread = None
+
+        # Egress accounting for load reporting
+        self.bytes_sent = 0
+        self.active_transfers = 0
+        self._stats_lock = threading.Lock()
+
+        # object_id -> partially downloaded object (see swarm.PartialObject)
+        self._partials: Dict[str, Any] = {}
+        # (object_id, chunk_size, digest) -> (size, checksums)
+        self._manifests: OrderedDict = OrderedDict()
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def start(self):
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server_socket.bind((self.host, self.port))
+        self.server_socket.listen(64)
+        self.port = self.server_socket.getsockname()[1]
+        self.running = True
+
+        logger.info(f"P2P data server listening on {self.address}")
+        self.thread = threading.Thread(target=self._accept_loop)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.server_socket:
+            self.server_socket.close()
+
+    def share_partial(self, object_id: str, partial):
+        self._partials[object_id] = partial
+
+    def unshare_partial(self, object_id: str):
+        self._partials.pop(object_id, None)
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                client_sock, _ = self.server_socket.accept()
+                client_thread = threading.Thread(target=self._handle_client, args=(client_sock,))
+                client_thread.daemon = True
+                client_thread.start()
+            except OSError:
+                break
+
+    def _handle_client(self, sock: socket.socket):
+        try:
+            with sock:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                while True:
+                    req = recv_frame(sock)
+                    if not req:
+                        break
+                    self._process_request(sock, req)
+        except (OSError, ValueError) as e:
+            logger.debug(f"P2P client disconnected: {e}")
+
+    def _process_request(self, sock: socket.socket, req: Dict[str, Any]):
+        cmd = req.get('command')
+        object_id = req.get('object_id')
+
+        if cmd not in COMMANDS:
+            send_frame(sock, {"status": "error", "message": f"Unknown command: {cmd}"})
+            return
+
+        partial = self._partials.get(object_id)
+        if partial is not None:
+            self._serve_partial(sock, cmd, req, partial)
+            return
+
+        try:
+            lease, obj = self.peer.acquire(object_id, AccessType.READ)
+        except (KeyError, ValueError, FileNotFoundError) as e:
+            send_frame(sock, {"status": "not_found", "message": str(e)})
+            return
+
+        try:
+            blob = obj.blobs[0]
+            fd, base, size = open_source(blob)
+            try:
+                if cmd == 'stat':
+                    send_frame(sock, {"status": "ok", "size": size, "meta": obj.meta})
+                elif cmd == 'have':
+                    send_frame(sock, {"status": "ok", "complete": True})
+                elif cmd == 'manifest':
+                    chunk_size = req.get('chunk_size') or DEFAULT_CHUNK_SIZE
+                    digest = req.get('digest') or DIGESTS[0]
+                    if digest not in DIGESTS:
+                        send_frame(sock, {"status": "error", "message": f"Unknown digest: {digest}"})
+                        return
+                    checksums = self._manifest(object_id, blob, fd, base, size, chunk_size, digest)
+                    send_frame(sock, {"status": "ok", "size": size, "chunk_size": chunk_size, "digest": digest,
+                                      "checksums": checksums})
+                else:
+                    offset, length = self._clamp(req, size)
+                    if fd is not None:
+                        read_range = lambda start, n: os.pread(fd, n, base + offset + start)
+                    else:
+                        read_range = lambda start, n: blob.read(n, offset + start)
+                    self._send_data(sock, req, obj.meta, length, read_range,
+                                    lambda: send_range(sock, blob, fd, base + offset, length, offset))
+            finally:
+                if fd is not None:
+                    os.close(fd)
+        finally:
+            self.peer.release(lease.lease_id)
+
+    @staticmethod
+    def _clamp(req: Dict[str, Any], size: int) -> Tuple[int, int]:
+        offset = min(max(req.get('offset', 0), 0), size)
+        length = req.get('length', -1)
+        if length is None or length < 0 or offset + length > size:
+            length = size - offset
+        return offset, length
+
+    def _manifest(self, object_id: str, blob: Blob, fd: Optional[int], base: int, size: int, chunk_size: int,
+                  digest: str) -> List[str]:
+        key = (object_id, chunk_size, digest)
+        cached = self._manifests.get(key)
+        if cached is not None and cached[0] == size:
+            self._manifests.move_to_end(key)
+            return cached[1]
+
+        checksums = []
+        for offset in range(0, size, chunk_size):
+            length = min(chunk_size, size - offset)
+            data = os.pread(fd, length, base + offset) if fd is not None else blob.read(length, offset)
+            checksums.append(chunk_digest(data, digest))
+        self._manifests[key] = (size, checksums)
+        if len(self._manifests) > MANIFEST_CACHE_SIZE:
+            self._manifests.popitem(last=False)
+        return checksums
+
+    def _serve_partial(self, sock: socket.socket, cmd: str, req: Dict[str, Any], partial):
+        if cmd == 'stat':
+            send_frame(sock, {"status": "ok", "size": partial.size, "meta": partial.meta, "partial": True})
+        elif cmd == 'have':
+            chunks = base64.b64encode(partial.bitfield()).decode('ascii')
+            send_frame(sock, {"status": "ok", "complete": False, "chunks": chunks})
+        elif cmd == 'manifest':
+            if req.get('chunk_size') not in (None, partial.chunk_size) or req.get('digest') not in (None, partial.digest):
+                send_frame(sock, {"status": "not_found", "message": "Manifest differs from the partial copy"})
+                return
+            send_frame(sock, {"status": "ok", "size": partial.size, "chunk_size": partial.chunk_size,
+                              "digest": partial.digest, "checksums": partial.checksums})
+        else:
+            offset, length = self._clamp(req, partial.size)
+            if not partial.has_range(offset, length):
+                send_frame(sock, {"status": "not_found", "message": "Range not downloaded yet"})
+                return
+            view = partial.view
+            self._send_data(sock, req, partial.meta, length,
+                            lambda start, n: view[offset + start:offset + start + n],
+                            lambda: sock.sendall(view[offset:offset + length]))
+
+    def _send_data(self, sock: socket.socket, req: Dict[str, Any], meta: Dict[str, Any], length: int,
+                   read_range: Callable[[int, int], Any], send_raw: Callable[[], None]):
+        """Answer a fetch with the range raw or, if negotiated, compressed."""
+        codec = None
+        if self.compression and req.get('accept'):
+            codec = choose_codec(meta, length, req['accept'], read_range)
+
+        sent = 0
+        with self._stats_lock:
+            self.active_transfers += 1
+        try:
+            if codec is None:
+                send_frame(sock, {"status": "ok", "length": length})
+                send_raw()
+                sent = length
+            else:
+                send_frame(sock, {"status": "ok", "length": length, "codec": codec, "chunk_size": COMPRESSION_CHUNK})
+                for frame in compress_chunks(read_range, length, codec):
+                    sock.sendall(frame)
+                    sent += len(frame)
+        finally:
+            with self._stats_lock:
+                self.active_transfers -= 1
+                self.bytes_sent += sent
@@ -0,0 +1,70 @@
+import time
+import threading
+from enum import IntEnum
+from typing import Optional
+
+class Priority(IntEnum):
+    """Traffic classes; lower values are served first."""
+    FOREGROUND = 0
+    BACKGROUND = 1
+
+class TokenBucket:
+    """`rate` bytes per second, with bursts of up to `burst` bytes. Not thread-safe on its own."""
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self.tokens = self.burst
+        self.stamp = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def delay(self, nbytes: int) -> float:
+        """Seconds until `nbytes` tokens are available (0 if they are now)."""
+        # Requests larger than the bucket only need it full
+        need = min(nbytes, self.burst)
+        return 0.0 if self.tokens >= need else (need - self.tokens) / self.rate
+
+class BandwidthScheduler:
+    """
+    Shapes the bytes a node receives across all its transfers.
+
+    `rate` caps everything (None for no overall cap) and `background_rate`
+    caps BACKGROUND traffic such as replication and rebalancing. Callers
+    ask for tokens with throttle() before receiving each piece; while any
+    FOREGROUND caller is waiting, BACKGROUND callers are held back, so
+    latency-sensitive fetches go first and background copies only use
+    what is left, up to their cap.
+    """
+    def __init__(self, rate: Optional[float] = None, background_rate: Optional[float] = None,
+                 burst: Optional[float] = None):
+        self._total = TokenBucket(rate, burst) if rate else None
+        self._background = TokenBucket(background_rate, burst) if background_rate else None
+        self._waiting = {priority: 0 for priority in Priority}
+        self._cond = threading.Condition()
+
+    def throttle(self, nbytes: int, priority: Priority = Priority.FOREGROUND):
+        """Block until `nbytes` may be transferred at `priority`."""
+        buckets = [b for b in (self._total, self._background if priority == Priority.BACKGROUND else None) if b]
+        if not buckets:
+            return
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    if any(self._waiting[p] for p in Priority if p < priority):
+                        self._cond.wait()
+                        continue
+                    now = time.monotonic()
+                    for bucket in buckets:
+                        bucket.refill(now)
+                    delay = max(bucket.delay(nbytes) for bucket in buckets)
+                    if delay == 0:
+                        for bucket in buckets:
+                            bucket.tokens -= nbytes
+                        return
+                    self._cond.wait(delay)
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
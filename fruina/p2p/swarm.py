@@ -0,0 +1,285 @@
+import base64
+import random
+import socket
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from ..core.peer import Peer
+from ..core.lease import AccessType
+from ..transport.compression import DEFAULT_ACCEPT
+from .protocol import connect, send_frame, recv_frame, check_response, ChecksumError, DEFAULT_CHUNK_SIZE
+from .transport import RemoteBlob, PartialObject
+
+logger = logging.getLogger(__name__)
+
+MAX_SOURCE_FAILURES = 3
+MAX_REQUESTS_PER_SOURCE = 2
+
+def _bit(bitfield: bytes, index: int) -> bool:
+    return bool(bitfield[index >> 3] & (1 << (index & 7)))
+
+class SwarmDownloader:
+    """
+    BitTorrent-style download of large objects from every node that holds
+    the object or part of it.
+
+    The object is split into `chunk_size` chunks listed, with their
+    digests, in a manifest served by any complete holder. `workers`
+    threads fetch chunks rarest-first, each from the least busy node that
+    has it (preferring other downloaders over complete holders, to take
+    load off the seeds), and verify each chunk before marking it. While
+    the download runs the partial object is shared through the local
+    DataServer and announced to the tracker as a partial holder, so later
+    downloaders fetch chunks from us instead of from the seeds.
+    """
+    def __init__(self, peer: Peer, tracker, node_address: str, server=None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 8,
+                 refresh_interval: float = 0.25, timeout: float = 30.0, membership=None,
+                 compression: Tuple[str, ...] = DEFAULT_ACCEPT):
+        self.peer = peer
+        self.tracker = tracker
+        self.node_address = node_address
+        self.server = server
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self.membership = membership
+        self.compression = tuple(compression)
+
+    def download(self, object_id: str, ttl: Optional[float] = None) -> str:
+        """Swarm-download `object_id` into a new sealed object on the local peer."""
+        holders = self.tracker.lookup([object_id]).get(object_id)
+        if not holders or not holders["nodes"]:
+            raise KeyError(f"No complete copy of {object_id} is known to the tracker")
+        seeds = self._rank([n for n in holders["nodes"] if n != self.node_address])
+        info = self._manifest(object_id, seeds)
+
+        size = info["size"]
+        ttl_arg = {} if ttl is None else {"ttl": ttl}
+        lease, obj = self.peer.acquire(object_id, AccessType.CREATE, meta=dict(info.get("meta") or {}), **ttl_arg)
+        try:
+            blob = obj.blobs[0]
+            blob.truncate(size)
+            view = blob.memoryview("r+b") if size else memoryview(bytearray())
+            partial = PartialObject(object_id, size, info["chunk_size"], info["checksums"], info.get("meta") or {}, view)
+            if self.server is not None:
+                self.server.share_partial(object_id, partial)
+                self.tracker.announce(self.node_address, [(object_id, size)], partial=True)
+            try:
+                _Swarm(self, partial, seeds).run()
+                self.peer.seal(lease.lease_id)
+            finally:
+                if self.server is not None:
+                    self.server.unshare_partial(object_id)
+        except BaseException:
+            self.peer.discard(lease.lease_id)
+            if self.server is not None:
+                self.tracker.withdraw(self.node_address, [object_id])
+            raise
+        self.peer.release(lease.lease_id)
+
+        if self.server is not None:
+            self.tracker.announce(self.node_address, [(object_id, size)])
+        return object_id
+
+    def _rank(self, nodes: List[str]) -> List[str]:
+        if self.membership is not None:
+            return self.membership.rank(nodes)
+        return random.sample(nodes, len(nodes))
+
+    def _manifest(self, object_id: str, seeds: List[str]) -> Dict[str, Any]:
+        error: Exception = KeyError(f"No holder of {object_id} answered")
+        for node in seeds:
+            try:
+                with connect(node, self.timeout) as sock:
+                    send_frame(sock, {"command": "stat", "object_id": object_id})
+                    meta = check_response(recv_frame(sock)).get("meta")
+                    send_frame(sock, {"command": "manifest", "object_id": object_id, "chunk_size": self.chunk_size})
+                    info = check_response(recv_frame(sock))
+                    info["meta"] = meta
+                    return info
+            except (KeyError, OSError) as e:
+                error = e
+        raise error
+
+class _Swarm:
+    """State of one running swarm download."""
+    def __init__(self, downloader: SwarmDownloader, partial: PartialObject, seeds: List[str]):
+        self.d = downloader
+        self.partial = partial
+        self.seeds = list(seeds)
+        self.peers: Dict[str, bytes] = {}  # partial holders -> their last bitfield
+        self.availability = [len(self.seeds)] * partial.num_chunks
+        self.in_flight: set = set()
+        self.busy: Dict[str, int] = {}
+        self.failures: Dict[str, int] = {}
+        self.lock = threading.Condition()
+        self.done = threading.Event()
+        self.error: Optional[Exception] = None
+        self._local = threading.local()
+        self._sockets: List[socket.socket] = []
+
+    def run(self):
+        if self.partial.complete:
+            return
+        refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+        refresher.start()
+        threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(self.d.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.done.set()
+        refresher.join()
+        for sock in self._sockets:
+            sock.close()
+        if self.error is not None:
+            raise self.error
+        if not self.partial.complete:
+            raise ConnectionError(f"Swarm download of {self.partial.object_id} ran out of sources")
+
+    # --- Scheduling ---
+
+    def _pick(self) -> Optional[Tuple[int, str]]:
+        """Rarest missing chunk that someone has, and the least busy node that has it."""
+        best = None
+        # Scan from a random point so concurrent downloaders spread over
+        # different chunks instead of all asking the seed for the same ones.
+        n = self.partial.num_chunks
+        start = random.randrange(n)
+        for index in (i % n for i in range(start, start + n)):
+            if self.partial.has(index) or index in self.in_flight or self.availability[index] == 0:
+                continue
+            if best is None or self.availability[index] < self.availability[best]:
+                best = index
+                if self.availability[index] == 1:
+                    break
+        if best is None:
+            return None
+        sources = [n for n, bits in self.peers.items() if _bit(bits, best)]
+        # Other downloaders first unless they are already busy serving us,
+        # then the least busy seed
+        sources += self.seeds
+        source = min(sources, key=lambda n: (self.busy.get(n, 0) >= MAX_REQUESTS_PER_SOURCE,
+                                             n in self.seeds, self.busy.get(n, 0), random.random()))
+        return best, source
+
+    def _worker(self):
+        try:
+            self._work()
+        except Exception as e:
+            with self.lock:
+                self.error = self.error or e
+                self.lock.notify_all()
+
+    def _work(self):
+        while True:
+            with self.lock:
+                while True:
+                    if self.partial.complete or self.error is not None:
+                        return
+                    choice = self._pick()
+                    if choice is not None:
+                        break
+                    if not self.in_flight and not self.seeds and not self.peers:
+                        return  # nobody left to fetch from
+                    self.lock.wait(self.d.refresh_interval)
+                index, source = choice
+                self.in_flight.add(index)
+                self.busy[source] = self.busy.get(source, 0) + 1
+
+            ok = self._fetch_chunk(index, source)
+            with self.lock:
+                self.in_flight.discard(index)
+                self.busy[source] -= 1
+                if ok:
+                    self.partial.mark(index)
+                self.lock.notify_all()
+
+    def _fetch_chunk(self, index: int, source: str) -> bool:
+        offset, length = self.partial.chunk_range(index)
+        part = self.partial.view[offset:offset + length]
+        try:
+            sock = self._connection(source)
+            RemoteBlob(source, self.partial.object_id, compression=self.d.compression).fetch_into(sock, part, offset)
+            if not self.partial.verify(index, part):
+                raise ChecksumError(f"Checksum mismatch for chunk {index} from {source}")
+            return True
+        except KeyError:
+            # A partial holder no longer has it / bitfield was stale; not its fault
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"Chunk {index} of {self.partial.object_id} from {source} failed: {e}")
+            self._drop_connection(source)
+            self._source_failed(source)
+            return False
+        finally:
+            part.release()
+
+    def _source_failed(self, source: str):
+        with self.lock:
+            self.failures[source] = self.failures.get(source, 0) + 1
+            if self.failures[source] < MAX_SOURCE_FAILURES:
+                return
+            if source in self.seeds:
+                self.seeds.remove(source)
+            self.peers.pop(source, None)
+            self._recount()
+
+    def _connection(self, source: str) -> socket.socket:
+        conns = self._local.__dict__.setdefault('conns', {})
+        sock = conns.get(source)
+        if sock is None:
+            sock = conns[source] = connect(source, self.d.timeout)
+            with self.lock:
+                self._sockets.append(sock)
+        return sock
+
+    def _drop_connection(self, source: str):
+        sock = self._local.__dict__.get('conns', {}).pop(source, None)
+        if sock is not None:
+            sock.close()
+
+    # --- Discovery ---
+
+    def _recount(self):
+        counts = [len(self.seeds)] * self.partial.num_chunks
+        for bits in self.peers.values():
+            for index in range(self.partial.num_chunks):
+                if _bit(bits, index):
+                    counts[index] += 1
+        self.availability = counts
+
+    def _refresh_loop(self):
+        """Pick up new holders from the tracker and poll partial holders' bitfields."""
+        while not self.done.wait(self.d.refresh_interval):
+            try:
+                holders = self.d.tracker.lookup([self.partial.object_id]).get(self.partial.object_id) or {}
+            except OSError as e:
+                logger.debug(f"Tracker lookup failed: {e}")
+                continue
+            me = self.d.node_address
+            failed = {n for n, count in self.failures.items() if count >= MAX_SOURCE_FAILURES}
+            seeds = [n for n in holders.get("nodes", []) if n != me and n not in failed]
+            bitfields = {}
+            for node in holders.get("partial", []):
+                if node == me or node in failed or node in seeds:
+                    continue
+                try:
+                    with connect(node, self.d.timeout) as sock:
+                        send_frame(sock, {"command": "have", "object_id": self.partial.object_id})
+                        resp = check_response(recv_frame(sock))
+                except (KeyError, OSError):
+                    continue
+                if resp.get("complete"):
+                    seeds.append(node)
+                else:
+                    bitfields[node] = base64.b64decode(resp["chunks"])
+            with self.lock:
+                for node in seeds:
+                    if node not in self.seeds:
+                        self.seeds.append(node)
+                self.peers = bitfields
+                self._recount()
+                self.lock.notify_all()
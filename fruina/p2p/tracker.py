@@ -0,0 +1,346 @@
+import os
+import time
+import socket
+import logging
+import argparse
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from ..core.peer import Peer
+from ..core.object import Object
+from ..core.lease import Lease, AccessType
+from .protocol import connect, send_frame, recv_frame, check_response
+from .server import open_source
+from .transport import P2PTransport, RemoteBlob
+
+logger = logging.getLogger(__name__)
+
+class Tracker:
+    """
+    Maps object ids to the nodes holding sealed copies, plus their sizes.
+    Nodes are identified by their DataServer address ("host:port").
+    All operations are batched: one call covers any number of objects.
+    Nodes part-way through a swarm download announce with `partial=True`
+    and are listed separately, since they only serve the chunks they have.
+    """
+    def __init__(self):
+        # object_id -> (size, {complete holders}, {partial holders})
+        self._objects: Dict[str, Tuple[int, set, set]] = {}
+        # node_address -> {object_id, ...}
+        self._nodes: Dict[str, set] = {}
+        self._lock = threading.Lock()
+
+    def announce(self, node: str, objects: Iterable[Tuple[str, int]], partial: bool = False) -> None:
+        """Record that `node` holds (or, with `partial`, is downloading) each (object_id, size)."""
+        with self._lock:
+            held = self._nodes.setdefault(node, set())
+            for object_id, size in objects:
+                entry = self._objects.get(object_id)
+                if entry is None:
+                    entry = self._objects[object_id] = (size, set(), set())
+                if not partial:
+                    entry[1].add(node)
+                    entry[2].discard(node)
+                elif node not in entry[1]:
+                    entry[2].add(node)
+                held.add(object_id)
+
+    def withdraw(self, node: str, object_ids: Iterable[str]) -> None:
+        with self._lock:
+            held = self._nodes.get(node, set())
+            for object_id in object_ids:
+                held.discard(object_id)
+                self._forget(object_id, node)
+
+    def lookup(self, object_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """object_id -> {"size", "nodes", "partial"} for every object with at least one holder."""
+        with self._lock:
+            result = {}
+            for object_id in object_ids:
+                entry = self._objects.get(object_id)
+                if entry is not None:
+                    result[object_id] = {"size": entry[0], "nodes": sorted(entry[1]), "partial": sorted(entry[2])}
+            return result
+
+    def drop_node(self, node: str) -> None:
+        """Forget everything `node` announced (it left or died)."""
+        with self._lock:
+            for object_id in self._nodes.pop(node, ()):
+                self._forget(object_id, node)
+
+    def _forget(self, object_id: str, node: str):
+        entry = self._objects.get(object_id)
+        if entry is None:
+            return
+        entry[1].discard(node)
+        entry[2].discard(node)
+        if not entry[1] and not entry[2]:
+            del self._objects[object_id]
+
+class TrackerServer:
+    """
+    Standalone TCP front end for a Tracker. Speaks the P2P frame protocol:
+      {"command": "announce", "node", "objects": [[object_id, size], ...], "partial"}
+      {"command": "withdraw", "node", "object_ids": [...]}
+      {"command": "lookup", "object_ids": [...]}   -> {"status", "objects"}
+      {"command": "drop_node", "node"}
+    """
+    def __init__(self, tracker: Optional[Tracker] = None, host: str = "127.0.0.1", port: int = 0):
+        self.tracker = tracker or Tracker()
+        self.host = host
+        self.port = port
+        self.server_socket = None
+        self.running = False
+        self.thread = None
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def start(self):
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server_socket.bind((self.host, self.port))
+        self.server_socket.listen(64)
+        self.port = self.server_socket.getsockname()[1]
+        self.running = True
+
+        logger.info(f"Tracker listening on {self.address}")
+        self.thread = threading.Thread(target=self._accept_loop)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.server_socket:
+            self.server_socket.close()
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                client_sock, _ = self.server_socket.accept()
+                client_thread = threading.Thread(target=self._handle_client, args=(client_sock,))
+                client_thread.daemon = True
+                client_thread.start()
+            except OSError:
+                break
+
+    def _handle_client(self, sock: socket.socket):
+        try:
+            with sock:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                while True:
+                    req = recv_frame(sock)
+                    if not req:
+                        break
+                    try:
+                        send_frame(sock, self._process_request(req))
+                    except (KeyError, TypeError, ValueError) as e:
+                        send_frame(sock, {"status": "error", "message": str(e)})
+        except (OSError, ValueError) as e:
+            logger.debug(f"Tracker client disconnected: {e}")
+
+    def _process_request(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        cmd = req.get('command')
+        if cmd == 'announce':
+            self.tracker.announce(req['node'], [tuple(o) for o in req['objects']], req.get('partial', False))
+        elif cmd == 'withdraw':
+            self.tracker.withdraw(req['node'], req['object_ids'])
+        elif cmd == 'lookup':
+            return {"status": "ok", "objects": self.tracker.lookup(req['object_ids'])}
+        elif cmd == 'drop_node':
+            self.tracker.drop_node(req['node'])
+        else:
+            return {"status": "error", "message": f"Unknown command: {cmd}"}
+        return {"status": "ok"}
+
+class RemoteTracker:
+    """
+    Client for a TrackerServer with the same interface as Tracker.
+    Keeps one persistent connection and reconnects once on failure.
+    """
+    def __init__(self, address: str, timeout: float = 10.0):
+        self.address = address
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+
+    def _call(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            for attempt in (0, 1):
+                try:
+                    if self._sock is None:
+                        self._sock = connect(self.address, self.timeout)
+                    send_frame(self._sock, req)
+                    return check_response(recv_frame(self._sock))
+                except OSError:
+                    self.close()
+                    if attempt:
+                        raise
+
+    def announce(self, node: str, objects: Iterable[Tuple[str, int]], partial: bool = False) -> None:
+        self._call({"command": "announce", "node": node, "objects": [list(o) for o in objects], "partial": partial})
+
+    def withdraw(self, node: str, object_ids: Iterable[str]) -> None:
+        self._call({"command": "withdraw", "node": node, "object_ids": list(object_ids)})
+
+    def lookup(self, object_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        return self._call({"command": "lookup", "object_ids": list(object_ids)})["objects"]
+
+    def drop_node(self, node: str) -> None:
+        self._call({"command": "drop_node", "node": node})
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+class TrackedPeer(Peer):
+    """
+    Wraps a node's Peer and keeps the tracker up to date: seals are
+    announced and discards withdrawn, batched and flushed every
+    `flush_interval` seconds from a background thread. A READ of an object
+    the node does not hold is resolved with one tracker lookup and fetched
+    from a holder over P2P, then served locally (and announced). With a
+    gossip `membership`, dead holders are skipped and the least loaded
+    holder is tried first.
+    """
+    def __init__(self, peer: Peer, tracker, node_address: str, transport=None,
+                 flush_interval: float = 0.05, fetch_missing: bool = True, membership=None):
+        super().__init__()
+        self.peer = peer
+        self.tracker = tracker
+        self.node_address = node_address
+        self.transport = transport or P2PTransport()
+        self.flush_interval = flush_interval
+        self.fetch_missing = fetch_missing
+        self.membership = membership
+
+        # lease_id -> (object_id, Object) for CREATE/WRITE leases
+        self._writes: Dict[str, Tuple[str, Object]] = {}
+        self._announce: Dict[str, int] = {}
+        self._withdraw: set = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    def acquire(self, object_id: Optional[str], access: AccessType, ttl: Optional[float] = None, meta: Optional[Dict[str, Any]] = None) -> Tuple[Lease, Object]:
+        try:
+            lease, obj = self.peer.acquire(object_id, access, ttl, meta)
+        except (KeyError, FileNotFoundError):
+            if access != AccessType.READ or not self.fetch_missing or not self._fetch(object_id):
+                raise
+            lease, obj = self.peer.acquire(object_id, access, ttl, meta)
+        if access != AccessType.READ:
+            self._writes[lease.lease_id] = (lease.object_id, obj)
+        return lease, obj
+
+    def seal(self, lease_id: str):
+        self.peer.seal(lease_id)
+        entry = self._writes.get(lease_id)
+        if entry is not None:
+            self._queue_announce(entry[0], entry[1])
+
+    def discard(self, lease_id: str):
+        entry = self._writes.pop(lease_id, None)
+        self.peer.discard(lease_id)
+        if entry is not None:
+            with self._lock:
+                self._announce.pop(entry[0], None)
+                self._withdraw.add(entry[0])
+            self._wakeup.set()
+
+    def renew(self, lease_id: str):
+        self.peer.renew(lease_id)
+
+    def renew_many(self, lease_ids: List[str]) -> List[str]:
+        return self.peer.renew_many(lease_ids)
+
+    def release(self, lease_id: str):
+        self._writes.pop(lease_id, None)
+        self.peer.release(lease_id)
+
+    def _queue_announce(self, object_id: str, obj: Object):
+        fd, _, size = open_source(obj.blobs[0])
+        if fd is not None:
+            os.close(fd)
+        with self._lock:
+            self._withdraw.discard(object_id)
+            self._announce[object_id] = size
+        self._wakeup.set()
+
+    def _fetch(self, object_id: str) -> bool:
+        holders = self.tracker.lookup([object_id]).get(object_id)
+        if not holders:
+            return False
+        nodes = holders["nodes"]
+        if self.membership is not None:
+            nodes = self.membership.rank(nodes)
+        for node in nodes:
+            if node == self.node_address:
+                continue
+            try:
+                self.transport.fetch(RemoteBlob(node, object_id), self.peer)
+            except ValueError:
+                return True  # fetched concurrently by another reader
+            except (KeyError, OSError) as e:
+                logger.warning(f"Fetch of {object_id} from {node} failed: {e}")
+                continue
+            with self._lock:
+                self._announce[object_id] = holders["size"]
+            self._wakeup.set()
+            return True
+        return False
+
+    def flush(self):
+        """Send queued announces and withdrawals now."""
+        with self._lock:
+            announce, self._announce = self._announce, {}
+            withdraw, self._withdraw = self._withdraw, set()
+        try:
+            if announce:
+                self.tracker.announce(self.node_address, list(announce.items()))
+            if withdraw:
+                self.tracker.withdraw(self.node_address, list(withdraw))
+        except OSError as e:
+            logger.warning(f"Tracker update failed, will retry: {e}")
+            with self._lock:
+                for object_id, size in announce.items():
+                    self._announce.setdefault(object_id, size)
+                self._withdraw |= withdraw - set(self._announce)
+
+    def _flush_loop(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            # Let a burst of seals accumulate into one batch
+            self._stopped.wait(self.flush_interval)
+            self.flush()
+
+    def close(self):
+        """Flush pending updates and stop the background thread."""
+        self._stopped.set()
+        self._wakeup.set()
+        self._flusher.join()
+        self.flush()
+
+def main():
+    parser = argparse.ArgumentParser(description="Fruina object location tracker")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address")
+    parser.add_argument("--port", type=int, default=7070, help="TCP port")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = TrackerServer(host=args.host, port=args.port)
+    server.start()
+    print("Tracker started. Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("Stopping...")
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,107 @@
-from typing import Any, Optional
+import time
+import socket
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from ..core.blob import Blob
+from ..core.peer import Peer
+from ..core.lease import Lease, AccessType
+from ..core.object import Object
+from ..transport.compression import decompress_into, DEFAULT_ACCEPT
+from .protocol import (connect, send_frame, recv_frame, recv_exact, recv_exact_into, check_response,
+                       chunk_digest, RemoteError, ChecksumError, DEFAULT_CHUNK_SIZE)
+from .shaping import BandwidthScheduler, Priority
+
+logger = logging.getLogger(__name__)
+
+# Received bytes are shaped in pieces of this size
+THROTTLE_PIECE = 256 * 1024
 
 class RemoteBlob(Blob):
     """
     A Blob that represents data stored on a remote peer.
     It holds the necessary information to fetch the data but does not store the data itself.
+    Reads go over the remote node's DataServer ("host:port"), which may
+    compress them with any of the `compression` codecs (empty to disable).
     """
-    def __init__(self, peer_address: str, object_id: str):
+    def __init__(self, peer_address: str, object_id: str, timeout: float = 30.0,
+                 compression: Tuple[str, ...] = DEFAULT_ACCEPT):
         self.peer_address = peer_address
         self.object_id = object_id
+        self.timeout = timeout
+        self.compression = tuple(compression)
+        self.bytes_received = 0
         self._is_sealed = True # Remote blobs are usually read-only views
+        self._info: Optional[Dict[str, Any]] = None
+
+    def stat(self) -> Dict[str, Any]:
+        """Size and meta of the remote object (fetched once)."""
+        if self._info is None:
+            with connect(self.peer_address, self.timeout) as sock:
+                send_frame(sock, {"command": "stat", "object_id": self.object_id})
+                self._info = check_response(recv_frame(sock))
+        return self._info
+
+    @property
+    def size(self) -> int:
+        return self.stat()["size"]
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return self.stat().get("meta") or {}
+
+    def manifest(self, chunk_size: int = DEFAULT_CHUNK_SIZE, digest: str = 'blake2b') -> Dict[str, Any]:
+        """Size and per-chunk digests of the remote object."""
+        with connect(self.peer_address, self.timeout) as sock:
+            send_frame(sock, {"command": "manifest", "object_id": self.object_id,
+                              "chunk_size": chunk_size, "digest": digest})
+            return check_response(recv_frame(sock))
+
+    def fetch_into(self, sock: socket.socket, view: memoryview, offset: int,
+                   throttle: Optional[Callable[[int], None]] = None) -> None:
+        """
+        Receive len(view) bytes starting at `offset` over an open connection.
+        throttle(n), if given, is called before each piece of n wire bytes.
+        """
+        req = {"command": "fetch", "object_id": self.object_id, "offset": offset, "length": len(view)}
+        if self.compression:
+            req["accept"] = list(self.compression)
+        send_frame(sock, req)
+        resp = check_response(recv_frame(sock))
+        if resp["length"] != len(view):
+            raise ValueError(f"Remote returned {resp['length']} bytes for a {len(view)} byte range")
+        if resp.get("codec"):
+            def recv(n: int) -> bytes:
+                if throttle:
+                    throttle(n)
+                return recv_exact(sock, n)
+            received = decompress_into(recv, view, resp["codec"], resp["chunk_size"])
+        elif throttle:
+            for start in range(0, len(view), THROTTLE_PIECE):
+                piece = view[start:start + THROTTLE_PIECE]
+                throttle(len(piece))
+                recv_exact_into(sock, piece)
+            received = len(view)
+        else:
+            recv_exact_into(sock, view)
+            received = len(view)
+        # Wire bytes, to see what compression saved
+        self.bytes_received += received
 
     def write(self, data: bytes) -> int:
         raise NotImplementedError("RemoteBlob is read-only")
 
     def read(self, size: int = -1, offset: int = 0) -> bytes:
-        # In a real implementation, this might trigger a synchronous fetch
-        # or raise an error suggesting to use P2PTransport.
-        raise NotImplementedError("Use P2PTransport to transfer data from RemoteBlob")
+        total = self.size
+        if size < 0 or offset + size > total:
+            size = max(total - offset, 0)
+        buf = bytearray(size)
+        if size:
+            with connect(self.peer_address, self.timeout) as sock:
+                self.fetch_into(sock, memoryview(buf), offset)
+        return bytes(buf)
 
     def truncate(self, size: int) -> None:
         raise NotImplementedError("RemoteBlob is read-only")
@@ -38,24 +122,272 @@ class RemoteBlob(Blob):
         # Remote deletion logic would go here
         pass
 
+class PartialObject:
+    """
+    An object being downloaded: its manifest, the writable view the chunks
+    land in (None if it cannot be mapped), and a bitfield of the chunks
+    verified so far.
+    """
+    def __init__(self, object_id: str, size: int, chunk_size: int, checksums: List[str],
+                 meta: Dict[str, Any], view: Optional[memoryview], digest: str = 'blake2b'):
+        self.object_id = object_id
+        self.size = size
+        self.chunk_size = chunk_size
+        self.checksums = checksums
+        self.digest = digest
+        self.meta = meta
+        self.view = view
+        self.have = bytearray((len(checksums) + 7) // 8)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def num_chunks(self) -> int:
+        return len(self.checksums)
+
+    @property
+    def complete(self) -> bool:
+        return self.count == self.num_chunks
+
+    def chunk_range(self, index: int) -> Tuple[int, int]:
+        offset = index * self.chunk_size
+        return offset, min(self.chunk_size, self.size - offset)
+
+    def has(self, index: int) -> bool:
+        return bool(self.have[index >> 3] & (1 << (index & 7)))
+
+    def mark(self, index: int):
+        with self._lock:
+            if not self.has(index):
+                self.have[index >> 3] |= 1 << (index & 7)
+                self.count += 1
+
+    def missing(self) -> List[int]:
+        return [i for i in range(self.num_chunks) if not self.has(i)]
+
+    def verify(self, index: int, data) -> bool:
+        return chunk_digest(data, self.digest) == self.checksums[index]
+
+    def has_range(self, offset: int, length: int) -> bool:
+        if length <= 0:
+            return True
+        first, last = offset // self.chunk_size, (offset + length - 1) // self.chunk_size
+        return all(self.has(i) for i in range(first, last + 1))
+
+    def bitfield(self) -> bytes:
+        with self._lock:
+            return bytes(self.have)
+
+class _Connection:
+    """A lazily (re)opened connection to one DataServer."""
+    def __init__(self, address: str, timeout: float):
+        self.address = address
+        self.timeout = timeout
+        self.sock: Optional[socket.socket] = None
+
+    def get(self) -> socket.socket:
+        if self.sock is None:
+            self.sock = connect(self.address, self.timeout)
+        return self.sock
+
+    def reset(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
 class P2PTransport:
     """
     Responsible for efficient data transfer between Blobs, especially across the network.
+
+    Remote objects of at least `stream_threshold` bytes are fetched over
+    `streams` parallel connections, each receiving `chunk_size` chunks
+    straight into the destination blob's mapping. Every chunk is checked
+    against the CRC32 the source lists in its manifest and retried, over a
+    fresh connection, up to `retries` times.
+
+    If a fetch() still fails, the unsealed object is kept on the peer along
+    with the record of its verified chunks; fetching the same object into
+    the same peer again resumes with the missing chunks only (see abandon()).
+
+    With a `scheduler`, received bytes are shaped by its token buckets at
+    the transfer's priority: FOREGROUND for reads waiting on the data,
+    BACKGROUND for replication.
     """
+    def __init__(self, streams: int = 4, stream_threshold: int = 8 * 1024 * 1024, timeout: float = 30.0,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, retries: int = 3,
+                 scheduler: Optional[BandwidthScheduler] = None, priority: Priority = Priority.FOREGROUND):
+        self.streams = max(1, streams)
+        self.stream_threshold = stream_threshold
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.scheduler = scheduler
+        self.priority = priority
+
+        # (id(peer), object_id) -> (lease, object, progress) of failed fetches
+        self._resumable: Dict[Tuple[int, str], Tuple[Lease, Object, PartialObject]] = {}
+        self._lock = threading.Lock()
+
     def transfer(self, source: Blob, dest: Blob) -> None:
         """
         Transfers data from source Blob to dest Blob efficiently.
         """
         if isinstance(source, RemoteBlob):
-            self._transfer_from_remote(source, dest)
+            self._run(source, self._prepare(source, dest, None), dest, self.priority)
         else:
             self._transfer_local(source, dest)
 
-    def _transfer_from_remote(self, source: RemoteBlob, dest: Blob):
-        print(f"[P2P] Transferring {source.object_id} from {source.peer_address} to local blob...")
-        # TODO: Implement actual network transfer (HTTP/TCP/RDMA)
-        # For now, we just simulate it or leave it empty
-        pass
+    def fetch(self, source: RemoteBlob, peer: Peer, ttl: Optional[float] = None,
+              priority: Optional[Priority] = None) -> str:
+        """
+        Copy a remote object into a new sealed object of the same id on `peer`,
+        resuming an earlier failed fetch of it if there is one.
+        Returns the object id.
+        """
+        key = (id(peer), source.object_id)
+        with self._lock:
+            state = self._resumable.pop(key, None)
+        if state is not None and state[0].is_expired():
+            state = None
+
+        if state is None:
+            # Leave the peer's own default lease ttl in place unless one is given
+            ttl_arg = {} if ttl is None else {"ttl": ttl}
+            lease, obj = peer.acquire(source.object_id, AccessType.CREATE, meta=dict(source.meta), **ttl_arg)
+            progress = None
+        else:
+            lease, obj, progress = state
+            lease.renew()
+            logger.info(f"[P2P] Resuming {source.object_id}: {progress.count}/{progress.num_chunks} chunks already verified")
+
+        try:
+            progress = self._prepare(source, obj.blobs[0], progress)
+            self._run(source, progress, obj.blobs[0], self.priority if priority is None else priority)
+            peer.seal(lease.lease_id)
+        except (KeyError, OSError, RemoteError, ValueError) as e:
+            if progress is not None and progress.count:
+                # Keep what was verified; the next fetch picks up from here
+                with self._lock:
+                    self._resumable[key] = (lease, obj, progress)
+                logger.warning(f"[P2P] Fetch of {source.object_id} stopped at "
+                               f"{progress.count}/{progress.num_chunks} chunks: {e}")
+            else:
+                peer.discard(lease.lease_id)
+            raise
+        except BaseException:
+            peer.discard(lease.lease_id)
+            raise
+        peer.release(lease.lease_id)
+        return source.object_id
+
+    def abandon(self, peer: Peer, object_id: str) -> bool:
+        """Discard the partial copy a failed fetch left on `peer`, if any."""
+        with self._lock:
+            state = self._resumable.pop((id(peer), object_id), None)
+        if state is None:
+            return False
+        peer.discard(state[0].lease_id)
+        return True
+
+    def _prepare(self, source: RemoteBlob, dest: Blob, progress: Optional[PartialObject]) -> PartialObject:
+        """Fetch the source's CRC manifest and size `dest`, keeping `progress` if it still applies."""
+        manifest = source.manifest(self.chunk_size, 'crc32')
+        if progress is not None and (progress.size, progress.checksums) == (manifest["size"], manifest["checksums"]):
+            return progress
+
+        size = manifest["size"]
+        logger.debug(f"[P2P] Transferring {source.object_id} ({size} bytes) from {source.peer_address}")
+        dest.truncate(size)
+        view = None
+        if size:
+            try:
+                view = dest.memoryview("r+b")
+            except (ValueError, OSError, NotImplementedError):
+                view = None
+            if view is not None and len(view) < size:
+                view = None
+        return PartialObject(source.object_id, size, manifest["chunk_size"], manifest["checksums"],
+                             source.meta, view, digest='crc32')
+
+    def _run(self, source: RemoteBlob, progress: PartialObject, dest: Blob, priority: Priority):
+        missing = deque(progress.missing())
+        if not missing:
+            return
+        throttle = None
+        if self.scheduler is not None:
+            throttle = lambda n: self.scheduler.throttle(n, priority)
+
+        if progress.view is None:
+            self._transfer_unmapped(source, progress, dest, missing, throttle)
+            return
+
+        streams = self.streams if progress.size >= self.stream_threshold else 1
+        streams = min(streams, len(missing))
+        lock = threading.Lock()
+
+        def worker():
+            conn = _Connection(source.peer_address, self.timeout)
+            try:
+                while True:
+                    with lock:
+                        if not missing:
+                            return
+                        index = missing.popleft()
+                    offset, length = progress.chunk_range(index)
+                    part = progress.view[offset:offset + length]
+                    try:
+                        self._fetch_chunk(source, progress, index, part, conn, throttle)
+                        progress.mark(index)
+                    finally:
+                        part.release()
+            finally:
+                conn.reset()
+
+        if streams == 1:
+            worker()
+            return
+        with ThreadPoolExecutor(max_workers=streams) as pool:
+            futures = [pool.submit(worker) for _ in range(streams)]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                # Stop the other streams at their next chunk
+                with lock:
+                    missing.clear()
+                raise
+
+    def _fetch_chunk(self, source: RemoteBlob, progress: PartialObject, index: int, part: memoryview,
+                     conn: _Connection, throttle: Optional[Callable[[int], None]]):
+        """Receive and verify one chunk, retrying over a fresh connection on failure."""
+        offset = index * progress.chunk_size
+        for attempt in range(self.retries + 1):
+            try:
+                source.fetch_into(conn.get(), part, offset, throttle)
+                if not progress.verify(index, part):
+                    raise ChecksumError(f"CRC mismatch in chunk {index} of {source.object_id}")
+                return
+            except (OSError, RemoteError) as e:
+                conn.reset()
+                if attempt == self.retries:
+                    raise
+                logger.warning(f"[P2P] Chunk {index} of {source.object_id} failed ({e}); retrying")
+                time.sleep(min(0.1 * 2 ** attempt, 2.0))
+
+    def _transfer_unmapped(self, source: RemoteBlob, progress: PartialObject, dest: Blob,
+                           missing: deque, throttle: Optional[Callable[[int], None]]):
+        """Single stream, in order, for destinations that cannot be mapped writable."""
+        buf = bytearray(progress.chunk_size)
+        conn = _Connection(source.peer_address, self.timeout)
+        try:
+            # Writes append, so verified chunks always form a prefix
+            for index in missing:
+                part = memoryview(buf)[:progress.chunk_range(index)[1]]
+                self._fetch_chunk(source, progress, index, part, conn, throttle)
+                dest.write(part)
+                progress.mark(index)
+        finally:
+            conn.reset()
 
     def _transfer_local(self, source: Blob, dest: Blob):
         """
@@ -1,4 +1,6 @@
 from .tiered import TieredPeer
 from .memory import MemoryPeer
 from .fs import FileSystemPeer
-
+from .caching import CachingPeer
+from .remote import TransportPeer
+from .cluster import ClusterPeer, HashRing
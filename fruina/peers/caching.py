@@ -0,0 +1,216 @@
+import time
+import threading
+import logging
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+from ..core.peer import Peer
+from ..core.object import Object
+from ..core.lease import Lease, AccessType
+from .memory import MemoryPeer
+
+logger = logging.getLogger(__name__)
+
+class CachingPeer(Peer):
+    """
+    A node-local read-through cache in front of a shared Peer
+    (typically a SharedFSPeer).
+
+    READ misses copy the sealed object once from the upstream peer into
+    the local peer (memfd-backed MemoryPeer by default, or e.g. a
+    FileSystemPeer on local disk) and every read is then served with
+    local handles. Cached copies are kept within `max_bytes` in LRU order
+    and revalidated against the upstream `object_signature()` at most
+    every `revalidate_interval` seconds. A copy that is evicted or
+    invalidated while local leases are open is only dropped when the last
+    of them is released. CREATE and WRITE go straight to the upstream peer.
+    """
+    def __init__(self, upstream: Peer, local: Optional[Peer] = None, max_bytes: int = 1024 * 1024 * 1024,
+                 revalidate_interval: float = 1.0):
+        super().__init__()
+        self.upstream = upstream
+        self.local = local or MemoryPeer()
+        self.max_bytes = max_bytes
+        self.revalidate_interval = revalidate_interval
+
+        # object_id -> [signature, size, validated_at], in LRU order
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        # lease_id -> (peer, object_id)
+        self._lease_routes: Dict[str, Tuple[Peer, str]] = {}
+        self._fetching: Dict[str, threading.Event] = {}
+        # object_id -> open local leases; doomed copies wait for them to reach 0
+        self._pins: Dict[str, int] = {}
+        self._doomed = set()
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, object_id: Optional[str], access: AccessType, ttl: Optional[float] = None, meta: Optional[Dict[str, Any]] = None) -> Tuple[Lease, Object]:
+        if access != AccessType.READ:
+            lease, obj = self.upstream.acquire(object_id, access, ttl, meta)
+            if access == AccessType.WRITE:
+                # The upstream copy may change or disappear
+                self._invalidate(lease.object_id)
+            self._lease_routes[lease.lease_id] = (self.upstream, lease.object_id)
+            return lease, obj
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(object_id)
+                if entry is not None:
+                    self._entries.move_to_end(object_id)
+                    fresh = time.monotonic() - entry[2] < self.revalidate_interval
+                else:
+                    pending = self._fetching.get(object_id)
+                    if pending is None:
+                        # This thread fetches; concurrent readers wait for it
+                        self._fetching[object_id] = threading.Event()
+                        break
+            if entry is None:
+                pending.wait()
+                continue
+
+            if fresh or self._revalidate(object_id, entry):
+                result = self._acquire_local(object_id, ttl)
+                if result is not None:
+                    self.hits += 1
+                    return result
+            self._invalidate(object_id)
+
+        self.misses += 1
+        try:
+            self._fetch(object_id, ttl)
+        finally:
+            with self._lock:
+                self._fetching.pop(object_id).set()
+        result = self._acquire_local(object_id, ttl)
+        if result is None:
+            # Not cached (stale copy still pinned, or evicted again right away)
+            lease, obj = self.upstream.acquire(object_id, access, ttl, meta)
+            self._lease_routes[lease.lease_id] = (self.upstream, object_id)
+            return lease, obj
+        return result
+
+    def seal(self, lease_id: str):
+        route = self._lease_routes.get(lease_id)
+        if route is None:
+            raise KeyError(f"Lease {lease_id} not found")
+        route[0].seal(lease_id)
+
+    def discard(self, lease_id: str):
+        route = self._lease_routes.pop(lease_id, None)
+        if route is None:
+            raise KeyError(f"Lease {lease_id} not found")
+        route[0].discard(lease_id)
+
+    def renew(self, lease_id: str):
+        route = self._lease_routes.get(lease_id)
+        if route is None:
+            raise KeyError(f"Lease {lease_id} not found")
+        route[0].renew(lease_id)
+
+    def release(self, lease_id: str):
+        route = self._lease_routes.pop(lease_id, None)
+        if route is None:
+            return
+        peer, object_id = route
+        if peer is self.upstream:
+            peer.release(lease_id)
+            return
+
+        with self._lock:
+            self.local.release(lease_id)
+            self._pins[object_id] -= 1
+            if self._pins[object_id] == 0:
+                del self._pins[object_id]
+                if object_id in self._doomed:
+                    self._doomed.discard(object_id)
+                    self._discard_local(object_id)
+
+    def _acquire_local(self, object_id: str, ttl: Optional[float]):
+        with self._lock:
+            if object_id in self._doomed or object_id not in self._entries:
+                # Evicted between lookup and acquire
+                return None
+            lease, obj = self.local.acquire(object_id, AccessType.READ, ttl)
+            self._pins[object_id] = self._pins.get(object_id, 0) + 1
+            self._lease_routes[lease.lease_id] = (self.local, object_id)
+            return lease, obj
+
+    def _signature(self, object_id: str):
+        signature = getattr(self.upstream, 'object_signature', None)
+        # Peers without version tokens only hold immutable sealed objects
+        return signature(object_id) if signature else True
+
+    def _revalidate(self, object_id: str, entry) -> bool:
+        if self._signature(object_id) != entry[0]:
+            return False
+        with self._lock:
+            entry[2] = time.monotonic()
+        return True
+
+    def _fetch(self, object_id: str, ttl: Optional[float]):
+        """Copy object_id from upstream into the local peer."""
+        signature = self._signature(object_id)
+        src_lease, src_obj = self.upstream.acquire(object_id, AccessType.READ, ttl)
+        try:
+            src_blob = src_obj.blobs[0]
+            try:
+                src_view = src_blob.memoryview()
+            except ValueError:
+                # Not mappable (e.g. an empty object past its header)
+                src_view = memoryview(src_blob.read())
+            size = len(src_view)
+            try:
+                with self._lock:
+                    if object_id in self._doomed:
+                        # A stale copy is still pinned by readers; serve this read from upstream
+                        return
+                    self._ensure_capacity(size)
+                    lease, obj = self.local.acquire(object_id, AccessType.CREATE, ttl, dict(src_obj.meta))
+                blob = obj.blobs[0]
+                blob.truncate(size)
+                if size:
+                    dst_view = blob.memoryview("r+b")
+                    dst_view[:] = src_view
+                    dst_view.release()
+                with self._lock:
+                    self.local.seal(lease.lease_id)
+                    self.local.release(lease.lease_id)
+                    self._entries[object_id] = [signature, size, time.monotonic()]
+                    self._bytes += size
+            finally:
+                src_view.release()
+                src_blob.close()
+        finally:
+            self.upstream.release(src_lease.lease_id)
+
+    def _ensure_capacity(self, size: int):
+        with self._lock:
+            while self._bytes + size > self.max_bytes and self._entries:
+                victim_id, victim = self._entries.popitem(last=False)
+                self._bytes -= victim[1]
+                self._drop_local(victim_id)
+
+    def _invalidate(self, object_id: str):
+        with self._lock:
+            entry = self._entries.pop(object_id, None)
+            if entry is None:
+                return
+            self._bytes -= entry[1]
+            self._drop_local(object_id)
+
+    def _drop_local(self, object_id: str):
+        # Called with the lock held. Pinned copies are dropped on last release.
+        if self._pins.get(object_id):
+            self._doomed.add(object_id)
+        else:
+            self._discard_local(object_id)
+
+    def _discard_local(self, object_id: str):
+        try:
+            lease, _ = self.local.acquire(object_id, AccessType.WRITE)
+        except (KeyError, ValueError, FileNotFoundError):
+            return
+        self.local.discard(lease.lease_id)
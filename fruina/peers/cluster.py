@@ -0,0 +1,294 @@
+import uuid
+import bisect
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Tuple, List, Iterable, Union
+from ..core.peer import Peer
+from ..core.object import Object
+from ..core.lease import Lease, AccessType
+from .remote import TransportPeer
+
+logger = logging.getLogger(__name__)
+
+_NOT_HERE = (KeyError, ValueError, FileNotFoundError)
+
+class HashRing:
+    """
+    Consistent-hash ring with `vnodes` virtual points per node, so adding
+    or removing one of N nodes moves only about 1/N of the keys.
+    """
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 128):
+        self.vnodes = vnodes
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self._nodes: set = set()
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode('utf-8')).digest()[:8], 'big')
+
+    @property
+    def nodes(self) -> List[str]:
+        return sorted(self._nodes)
+
+    def add(self, node: str):
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for i in range(self.vnodes):
+            point = self._hash(f"{node}#{i}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: str):
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        keep = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in keep]
+        self._owners = [o for _, o in keep]
+
+    def owners(self, key: str, count: int = 1) -> List[str]:
+        """The first `count` distinct nodes clockwise from the key's position."""
+        if not self._points:
+            return []
+        count = min(count, len(self._nodes))
+        result: List[str] = []
+        index = bisect.bisect(self._points, self._hash(key))
+        for step in range(len(self._points)):
+            node = self._owners[(index + step) % len(self._points)]
+            if node not in result:
+                result.append(node)
+                if len(result) == count:
+                    break
+        return result
+
+class ClusterPeer(Peer):
+    """
+    A composite Peer that partitions the keyspace across a set of nodes
+    with a consistent-hash ring and keeps `replicas` copies of each object.
+
+    Nodes are Peers, or addresses reached through the HTTP/UDS transports
+    (see TransportPeer.connect). CREATE goes to the primary owner and the
+    object is copied to the other owners on seal. READ tries the owners,
+    then any other node known to hold a copy (e.g. mid-rebalance).
+    add_node/remove_node change the ring and run a rebalancing pass that
+    copies each object whose owner set changed to its new owners, then
+    drops copies from nodes that no longer own it.
+    """
+    def __init__(self, nodes: Dict[str, Union[Peer, str]], replicas: int = 1, vnodes: int = 128,
+                 migration_workers: int = 4):
+        super().__init__()
+        self.replicas = max(1, replicas)
+        self.migration_workers = migration_workers
+        self.nodes: Dict[str, Peer] = {name: TransportPeer.connect(target) for name, target in nodes.items()}
+        self.ring = HashRing(self.nodes, vnodes)
+
+        # object_id -> names of nodes holding a sealed copy
+        self._placement: Dict[str, set] = {}
+        # lease_id -> (node name, object_id, access, Object)
+        self._lease_routes: Dict[str, Tuple[str, str, AccessType, Object]] = {}
+        self._leaving: set = set()
+        self._lock = threading.RLock()
+        self._rebalance_lock = threading.Lock()
+        self._rebalance_thread: Optional[threading.Thread] = None
+        self.moved = 0
+
+        for name, peer in self.nodes.items():
+            for object_id in list(getattr(peer, 'objects', {})):
+                self._placement.setdefault(object_id, set()).add(name)
+
+    def owners(self, object_id: str) -> List[str]:
+        with self._lock:
+            return self.ring.owners(object_id, self.replicas)
+
+    def acquire(self, object_id: Optional[str], access: AccessType, ttl: Optional[float] = None, meta: Optional[Dict[str, Any]] = None) -> Tuple[Lease, Object]:
+        if access == AccessType.CREATE:
+            object_id = object_id or str(uuid.uuid4())
+            candidates = self.owners(object_id)[:1]
+        elif object_id is None:
+            raise ValueError(f"Cannot acquire {access.value} lease without object_id")
+        else:
+            candidates = self._holders(object_id)
+        if not candidates:
+            raise KeyError(f"Object {object_id} not found in cluster")
+
+        error: Exception = KeyError(f"Object {object_id} not found in cluster")
+        for name in candidates:
+            try:
+                lease, obj = self.nodes[name].acquire(object_id, access, ttl, meta)
+            except _NOT_HERE as e:
+                error = e
+                continue
+            with self._lock:
+                self._lease_routes[lease.lease_id] = (name, object_id, access, obj)
+            return lease, obj
+        raise error
+
+    def seal(self, lease_id: str):
+        route = self._lease_routes.get(lease_id)
+        if route is None:
+            raise KeyError(f"Lease {lease_id} not found")
+        name, object_id, access, _ = route
+        self.nodes[name].seal(lease_id)
+        if access != AccessType.CREATE:
+            return
+
+        with self._lock:
+            self._placement.setdefault(object_id, set()).add(name)
+        for owner in self.owners(object_id):
+            if owner != name:
+                self._replicate(object_id, name, owner)
+
+    def discard(self, lease_id: str):
+        route = self._lease_routes.pop(lease_id, None)
+        if route is None:
+            raise KeyError(f"Lease {lease_id} not found")
+        name, object_id, _, _ = route
+        self.nodes[name].discard(lease_id)
+
+        with self._lock:
+            holders = self._placement.pop(object_id, set())
+        for holder in holders - {name}:
+            self._drop(holder, object_id)
+
+    def renew(self, lease_id: str):
+        route = self._lease_routes.get(lease_id)
+        if route is None:
+            raise KeyError(f"Lease {lease_id} not found")
+        self.nodes[route[0]].renew(lease_id)
+
+    def release(self, lease_id: str):
+        route = self._lease_routes.pop(lease_id, None)
+        if route is None:
+            return
+        self.nodes[route[0]].release(lease_id)
+
+    def _holders(self, object_id: str) -> List[str]:
+        """Owners first, then any other node known to hold a copy."""
+        with self._lock:
+            owners = self.ring.owners(object_id, self.replicas)
+            extra = sorted(self._placement.get(object_id, set()) - set(owners))
+        return owners + [name for name in extra if name in self.nodes]
+
+    # --- Membership ---
+
+    def add_node(self, name: str, target: Union[Peer, str], background: bool = True):
+        with self._lock:
+            self.nodes[name] = TransportPeer.connect(target)
+            self._leaving.discard(name)
+            self.ring.add(name)
+        self.rebalance(background)
+
+    def remove_node(self, name: str, background: bool = True):
+        """Take `name` off the ring; it keeps serving reads until its objects have moved."""
+        with self._lock:
+            self.ring.remove(name)
+            self._leaving.add(name)
+        self.rebalance(background)
+
+    # --- Rebalancing ---
+
+    def rebalance(self, background: bool = False):
+        """Move objects whose owner set changed; with `background`, in a daemon thread."""
+        if not background:
+            self._rebalance()
+            return
+        thread = threading.Thread(target=self._rebalance, daemon=True)
+        self._rebalance_thread = thread
+        thread.start()
+
+    def wait_rebalanced(self, timeout: Optional[float] = None):
+        thread = self._rebalance_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _rebalance(self):
+        with self._rebalance_lock:
+            with self._lock:
+                plan = []
+                for object_id, holders in self._placement.items():
+                    owners = set(self.ring.owners(object_id, self.replicas))
+                    if owners != holders:
+                        plan.append((object_id, set(holders), owners))
+
+            # Bulk copies first, in parallel; surplus copies are only dropped
+            # once every new owner has its copy.
+            with ThreadPoolExecutor(max_workers=self.migration_workers) as pool:
+                list(pool.map(lambda step: self._migrate(*step), plan))
+
+            with self._lock:
+                for name in list(self._leaving):
+                    if not any(name in holders for holders in self._placement.values()):
+                        self._leaving.discard(name)
+                        del self.nodes[name]
+            logger.info(f"Rebalanced {len(plan)} objects ({self.moved} copies moved in total)")
+
+    def _migrate(self, object_id: str, holders: set, owners: set):
+        sources = sorted(holders)
+        for owner in sorted(owners - holders):
+            if not any(self._replicate(object_id, source, owner) for source in sources):
+                logger.warning(f"Could not migrate {object_id} to {owner}; keeping old copies")
+                return
+        for holder in holders - owners:
+            self._drop(holder, object_id)
+
+    def _replicate(self, object_id: str, source: str, dest: str) -> bool:
+        """Copy a sealed object between nodes. Returns True once dest holds it."""
+        try:
+            copy_object(self.nodes[source], self.nodes[dest], object_id)
+        except ValueError as e:
+            if "already exists" not in str(e):
+                logger.warning(f"Copy of {object_id} from {source} to {dest} failed: {e}")
+                return False
+        except (KeyError, OSError) as e:
+            logger.warning(f"Copy of {object_id} from {source} to {dest} failed: {e}")
+            return False
+        with self._lock:
+            self._placement.setdefault(object_id, set()).add(dest)
+            self.moved += 1
+        return True
+
+    def _drop(self, name: str, object_id: str):
+        peer = self.nodes.get(name)
+        if peer is not None:
+            try:
+                lease, _ = peer.acquire(object_id, AccessType.WRITE)
+                peer.discard(lease.lease_id)
+            except _NOT_HERE:
+                pass
+        with self._lock:
+            holders = self._placement.get(object_id)
+            if holders is not None:
+                holders.discard(name)
+
+def copy_object(source: Peer, dest: Peer, object_id: str):
+    """Copy one sealed object, data and meta, from `source` into a new sealed object on `dest`."""
+    src_lease, src_obj = source.acquire(object_id, AccessType.READ)
+    try:
+        src_blob = src_obj.blobs[0]
+        # Views may be cached by their blob (client-side views), so they are
+        # left for the blob to release rather than released here.
+        try:
+            src_view = src_blob.memoryview()
+        except ValueError:
+            src_view = memoryview(src_blob.read())
+        lease, obj = dest.acquire(object_id, AccessType.CREATE, meta=dict(src_obj.meta))
+        try:
+            blob = obj.blobs[0]
+            size = len(src_view)
+            blob.truncate(size)
+            if size:
+                blob.memoryview("r+b")[:size] = src_view
+            dest.seal(lease.lease_id)
+        except BaseException:
+            dest.discard(lease.lease_id)
+            raise
+        dest.release(lease.lease_id)
+    finally:
+        source.release(src_lease.lease_id)
@@ -0,0 +1,105 @@
+from typing import Optional, Dict, Any, List, Tuple, Union
+from ..core.peer import Peer
+from ..core.object import Object, ObjectState
+from ..core.lease import Lease, AccessType
+from ..transport.base import Transport, open_handle
+
+_INTENTS = {AccessType.READ: "read", AccessType.CREATE: "create", AccessType.WRITE: "write"}
+
+class TransportLease(Lease):
+    """A lease held on a remote Peer; its lifetime is managed by that Peer."""
+    def __init__(self, lease_id: str, object_id: str, access: AccessType, ttl: Optional[float] = None):
+        self._lease_id = lease_id
+        self._object_id = object_id
+        self._access = access
+        self._ttl = ttl
+
+    @property
+    def lease_id(self) -> str:
+        return self._lease_id
+
+    @property
+    def object_id(self) -> str:
+        return self._object_id
+
+    @property
+    def access(self) -> AccessType:
+        return self._access
+
+    @property
+    def ttl(self) -> Optional[float]:
+        return self._ttl
+
+    def is_expired(self) -> bool:
+        return False
+
+    def renew(self) -> None:
+        pass
+
+    def release(self) -> None:
+        pass
+
+class TransportPeer(Peer):
+    """
+    A Peer backed by another node's Peer, reached through a Transport
+    (HTTP, UDS, or Direct). Blobs are the client-side views of the
+    handles the remote Peer returns, so they work wherever those handles
+    do (fds passed over UDS, paths on a shared filesystem).
+    """
+    def __init__(self, transport: Transport):
+        super().__init__()
+        self.transport = transport
+        # lease_id -> Object holding the views opened for that lease
+        self._views: Dict[str, Object] = {}
+
+    @classmethod
+    def connect(cls, target: Union[str, Peer]) -> Peer:
+        """A Peer for `target`: Peers are used as-is, addresses as in fruina.connect()."""
+        if isinstance(target, Peer):
+            return target
+        if target.startswith("http://") or target.startswith("https://"):
+            from ..transport.http import HttpTransport
+            return cls(HttpTransport(target))
+        from ..transport.uds import UdsTransport
+        return cls(UdsTransport(target))
+
+    def acquire(self, object_id: Optional[str], access: AccessType, ttl: Optional[float] = None, meta: Optional[Dict[str, Any]] = None) -> Tuple[Lease, Object]:
+        info, handles = self.transport.acquire(object_id, _INTENTS[access], ttl, meta)
+        mode = "rb" if access == AccessType.READ else "r+b"
+        obj = Object(info['object_id'], [open_handle(h, mode=mode) for h in handles], info.get('meta') or meta)
+        if access == AccessType.READ:
+            obj.state = ObjectState.SEALED
+
+        lease = TransportLease(info['lease_id'], info['object_id'], access, ttl)
+        self.leases[lease.lease_id] = lease
+        self._views[lease.lease_id] = obj
+        return lease, obj
+
+    def seal(self, lease_id: str):
+        obj = self._views.get(lease_id)
+        if obj is not None:
+            for blob in obj.blobs:
+                blob.seal()
+        self.transport.seal(lease_id)
+
+    def discard(self, lease_id: str):
+        self._close(lease_id)
+        self.transport.discard(lease_id)
+
+    def renew(self, lease_id: str):
+        if self.transport.renew([lease_id]):
+            raise KeyError(f"Lease {lease_id} not found or expired")
+
+    def renew_many(self, lease_ids: List[str]) -> List[str]:
+        return self.transport.renew(lease_ids)
+
+    def release(self, lease_id: str):
+        self._close(lease_id)
+        self.transport.release(lease_id)
+
+    def _close(self, lease_id: str):
+        self.leases.pop(lease_id, None)
+        obj = self._views.pop(lease_id, None)
+        if obj is not None:
+            for blob in obj.blobs:
+                blob.close()
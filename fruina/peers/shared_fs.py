@@ -6,6 +6,9 @@ import logging
 import json
 import struct
 import math
+import hashlib
+import argparse
+from collections import OrderedDict
 from typing import Optional, Dict, Any, Tuple, List
 from pathlib import Path
 
@@ -13,16 +16,227 @@ from ..core.peer import Peer
 from ..core.object import Object
 from ..core.lease import Lease, AccessType
 from ..backends.shared_fs import SharedFSBlob
+from ..backends.packfile import PackStore, PackBlob
 
 logger = logging.getLogger(__name__)
 
+LAYOUT_FILE = 'layout.json'
+FANOUT_WIDTH = 256  # buckets per level, named by two hex digits
+EXPIRY_DIR = 'expiry'
+PACK_DIR = 'packs'
+GC_LOCK_FILE = 'gc.lock'
+CLAIM_TIMEOUT = 600  # seconds before a journal claimed by a crashed GC may be reclaimed
+
+def _bucket_parts(object_id: str, fanout: int) -> List[str]:
+    """Return the hashed bucket directory names for object_id."""
+    if fanout <= 0:
+        return []
+    digest = hashlib.md5(object_id.encode('utf-8')).hexdigest()
+    return [digest[i * 2:i * 2 + 2] for i in range(fanout)]
+
+def _lease_object_id(filename: str) -> str:
+    """Lease files are named <object_id>.<lease_id>; lease ids contain no dots."""
+    return filename.rsplit('.', 1)[0]
+
+def _iter_files(base: Path, depth: int):
+    """Yield a DirEntry for every file under base, descending exactly `depth` bucket levels."""
+    with os.scandir(base) as it:
+        entries = list(it)
+    for entry in entries:
+        if depth <= 0:
+            if entry.is_file():
+                yield entry
+        elif entry.is_dir():
+            yield from _iter_files(Path(entry.path), depth - 1)
+
+def _read_layout(root: Path) -> Optional[int]:
+    layout_path = root / LAYOUT_FILE
+    if not layout_path.exists():
+        return None
+    with open(layout_path) as f:
+        return int(json.load(f).get('fanout', 0))
+
+def _write_layout(root: Path, fanout: int):
+    tmp_path = root / f".{LAYOUT_FILE}.{uuid.uuid4()}"
+    with open(tmp_path, 'w') as f:
+        json.dump({'fanout': fanout, 'width': FANOUT_WIDTH}, f)
+    os.rename(tmp_path, root / LAYOUT_FILE)
+
+class HeaderCache:
+    """
+    In-process LRU of parsed headers for sealed SharedFS objects.
+
+    Entries are keyed by object_id and validated against (st_ino,
+    st_mtime_ns, st_size) of the opened file, so a replaced or rewritten
+    object is never served stale metadata. Recent misses are remembered
+    for `negative_ttl` seconds.
+    """
+    ENTRY_OVERHEAD = 256
+    MAX_MISSES = 65536
+
+    def __init__(self, max_bytes: int, negative_ttl: float):
+        self.max_bytes = max_bytes
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict = OrderedDict()  # object_id -> (signature, data_offset, meta, nbytes)
+        self._misses: OrderedDict = OrderedDict()   # object_id -> expires_at
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def signature(st: os.stat_result) -> Tuple[int, int, int]:
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def get(self, object_id: str) -> Optional[Tuple[Tuple[int, int, int], int, Dict[str, Any]]]:
+        """Return (signature, data_offset, meta) for object_id, if cached."""
+        with self._lock:
+            entry = self._entries.get(object_id)
+            if entry is None:
+                return None
+            self._entries.move_to_end(object_id)
+            return entry[0], entry[1], entry[2]
+
+    def put(self, object_id: str, st: os.stat_result, data_offset: int, meta: Dict[str, Any]):
+        if self.max_bytes <= 0:
+            return
+        nbytes = self.ENTRY_OVERHEAD + len(object_id) + len(json.dumps(meta))
+        with self._lock:
+            self._drop(object_id)
+            self._entries[object_id] = (self.signature(st), data_offset, meta, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+
+    def is_missing(self, object_id: str) -> bool:
+        if self.negative_ttl <= 0:
+            return False
+        with self._lock:
+            expires_at = self._misses.get(object_id)
+            if expires_at is None:
+                return False
+            if expires_at < time.monotonic():
+                del self._misses[object_id]
+                return False
+            return True
+
+    def add_miss(self, object_id: str):
+        if self.negative_ttl <= 0:
+            return
+        with self._lock:
+            self._misses.pop(object_id, None)
+            self._misses[object_id] = time.monotonic() + self.negative_ttl
+            if len(self._misses) > self.MAX_MISSES:
+                self._misses.popitem(last=False)
+
+    def invalidate(self, object_id: str):
+        with self._lock:
+            self._drop(object_id)
+            self._misses.pop(object_id, None)
+
+    def _drop(self, object_id: str):
+        entry = self._entries.pop(object_id, None)
+        if entry is not None:
+            self._bytes -= entry[3]
+
+class LeaderLock:
+    """
+    A fenced leader lease stored in a lock file on the shared root.
+
+    The file holds the holder's node id, a fencing epoch that increases
+    on every change of leader, and an expiry time. It is created with
+    O_EXCL, and a stale lock is taken over by first renaming it away, so
+    only one node can win either race. The holder renews it before it
+    expires. Work done under the lease should call `is_held()` between
+    batches, so a node that stalled past its lease stops once it notices
+    a newer epoch.
+    """
+    def __init__(self, path: Path, node_id: str, ttl: float):
+        self.path = path
+        self.node_id = node_id
+        self.ttl = ttl
+        self.epoch: Optional[int] = None
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # Half-written by a crashed node; treat as expired
+            return {'node_id': None, 'epoch': 0, 'expires_at': 0}
+
+    def _write(self, epoch: int, exclusive: bool, expires_at: Optional[float] = None):
+        if expires_at is None:
+            expires_at = time.time() + self.ttl
+        data = json.dumps({'node_id': self.node_id, 'epoch': epoch, 'expires_at': expires_at})
+        if exclusive:
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            try:
+                os.write(fd, data.encode('utf-8'))
+            finally:
+                os.close(fd)
+        else:
+            tmp_path = self.path.with_name(f".{self.path.name}.{self.node_id}")
+            with open(tmp_path, 'w') as f:
+                f.write(data)
+            os.rename(tmp_path, self.path)
+
+    def acquire(self) -> bool:
+        """Take or renew the lease. Returns True while this node is leader."""
+        current = self._read()
+        now = time.time()
+
+        if current is not None:
+            if current.get('node_id') == self.node_id and current.get('epoch') == self.epoch:
+                if current.get('expires_at', 0) > now:
+                    self._write(self.epoch, exclusive=False)
+                    return True
+            elif current.get('expires_at', 0) > now:
+                self.epoch = None
+                return False
+
+            # Expired: move it aside; only one contender's rename succeeds
+            stale = self.path.with_name(f".{self.path.name}.stale.{uuid.uuid4().hex}")
+            try:
+                os.rename(self.path, stale)
+            except FileNotFoundError:
+                self.epoch = None
+                return False
+            os.remove(stale)
+
+        epoch = (current or {}).get('epoch', 0) + 1
+        try:
+            self._write(epoch, exclusive=True)
+        except FileExistsError:
+            self.epoch = None
+            return False
+        self.epoch = epoch
+        logger.info(f"Node {self.node_id} is now GC leader (epoch {epoch})")
+        return True
+
+    def is_held(self) -> bool:
+        """Fencing check: the lock file still names this node and epoch."""
+        if self.epoch is None:
+            return False
+        current = self._read()
+        return (current is not None and current.get('node_id') == self.node_id
+                and current.get('epoch') == self.epoch and current.get('expires_at', 0) > time.time())
+
+    def release(self):
+        # Expire rather than delete the lock, so the epoch keeps increasing
+        if self.is_held():
+            self._write(self.epoch, exclusive=False, expires_at=0)
+        self.epoch = None
+
 class SharedFSLease(Lease):
-    def __init__(self, lease_id: str, object_id: str, access: AccessType, ttl: int, file_path: Optional[Path] = None):
+    def __init__(self, lease_id: str, object_id: str, access: AccessType, ttl: int, file_path: Optional[Path] = None,
+                 packed: bool = False):
         self._lease_id = lease_id
         self._object_id = object_id
         self._access = access
         self._ttl = ttl
         self.file_path = file_path
+        self.packed = packed
         self.created_at = time.time()
 
     @property
@@ -58,20 +272,120 @@ class SharedFSLease(Lease):
 class SharedFSPeer(Peer):
     """
     A Peer implementation that uses a Shared Filesystem for data and metadata
+
+    Objects and pending creates can be spread over `fanout` levels of
+    hashed bucket directories (256 buckets per level), so no single NFS
+    directory grows to millions of entries. The layout is recorded in
+    `root/layout.json` and every node mounting the root must agree on it;
+    use `migrate_layout` to convert an existing tree.
+
+    Expiry is index driven: every file with a TTL is journaled under
+    `root/expiry/<deadline bucket>/` when it is created or sealed, and GC
+    only reads the buckets that are due, at most `gc_batch_size` entries
+    per cycle. `gc_full_scan_every` > 0 additionally runs the legacy full
+    tree scan every N cycles, for trees written before the index existed.
+    Only one node at a time runs GC: maintenance threads contend for a
+    fenced `LeaderLock` in `root/gc.lock`, and non-leaders only read the
+    lock each interval, so GC I/O does not grow with the node count.
+
+    READ acquires consult a `HeaderCache` of up to `meta_cache_bytes`, so a
+    repeated get of a hot object costs one open (validated with fstat)
+    instead of an exists check, header parse and JSON decode. Misses are
+    cached for `negative_cache_ttl` seconds; objects sealed by other nodes
+    may stay invisible to this node for that long.
+
+    With `pack_threshold` > 0, sealed objects of at most that many bytes
+    are appended to shared pack segments (`root/packs/`) instead of
+    getting their own file; see `PackStore`. The GC leader compacts
+    segments whose live fraction drops below `pack_compact_ratio`.
     """
-    def __init__(self, mount_point: str, capacity: int = 1000):
+    def __init__(self, mount_point: str, capacity: int = 1000, fanout: Optional[int] = None,
+                 gc_batch_size: int = 10000, gc_bucket_seconds: int = 10, gc_full_scan_every: int = 0,
+                 meta_cache_bytes: int = 64 * 1024 * 1024, negative_cache_ttl: float = 1.0,
+                 gc_leader_ttl: Optional[float] = None, pack_threshold: int = 0,
+                 pack_segment_size: int = 256 * 1024 * 1024, pack_compact_ratio: float = 0.5):
         self.root = Path(mount_point)
         self.data_dir = self.root / 'data'
         self.leases_dir = self.root / 'leases'
+        self.expiry_dir = self.root / EXPIRY_DIR
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.leases_dir.mkdir(parents=True, exist_ok=True)
-        
+        self.expiry_dir.mkdir(parents=True, exist_ok=True)
+
+        existing = _read_layout(self.root)
+        if existing is None:
+            self.fanout = fanout or 0
+            if self.fanout:
+                _write_layout(self.root, self.fanout)
+        elif fanout is not None and fanout != existing:
+            raise ValueError(
+                f"{self.root} uses fanout={existing}, not {fanout}; run migrate_layout first"
+            )
+        else:
+            self.fanout = existing
+        self._known_buckets = set()
+
+        self.node_id = uuid.uuid4().hex
+        self.gc_batch_size = gc_batch_size
+        self.gc_bucket_seconds = gc_bucket_seconds
+        self.gc_full_scan_every = gc_full_scan_every
+        self.gc_leader_ttl = gc_leader_ttl
+        self._gc_leader: Optional[LeaderLock] = None
+        self._known_expiry_buckets = set()
+        self._header_cache = HeaderCache(meta_cache_bytes, negative_cache_ttl)
+
+        self.pack_threshold = pack_threshold
+        self.pack_compact_ratio = pack_compact_ratio
+        self._packs: Optional[PackStore] = None
+        if pack_threshold > 0 or (self.root / PACK_DIR).exists():
+            # Readers need the pack index even if they never pack themselves
+            self._packs = PackStore(self.root / PACK_DIR, self.node_id, pack_segment_size)
+
         self.capacity = capacity
         self._active_leases: Dict[str, SharedFSLease] = {}
         
         self._stop_maintenance = threading.Event()
         self._maintenance_thread = None
 
+    def _data_path(self, object_id: str) -> Path:
+        return self.data_dir.joinpath(*_bucket_parts(object_id, self.fanout), object_id)
+
+    def _lease_path(self, object_id: str, lease_id: str) -> Path:
+        return self.leases_dir.joinpath(*_bucket_parts(object_id, self.fanout), f"{object_id}.{lease_id}")
+
+    def _ensure_bucket(self, path: Path):
+        bucket = path.parent
+        if self.fanout and bucket not in self._known_buckets:
+            bucket.mkdir(parents=True, exist_ok=True)
+            self._known_buckets.add(bucket)
+
+    def _lookup_packed(self, object_id: str):
+        """Find a packed entry, refreshing the pack index once on a miss."""
+        if self._packs is None:
+            return None
+        entry = self._packs.lookup(object_id)
+        if entry is None:
+            self._packs.refresh()
+            entry = self._packs.lookup(object_id)
+        return entry
+
+    def _packed_blob(self, entry) -> PackBlob:
+        return PackBlob(str(self._packs.segment_path(entry.segment)), entry.offset, entry.length)
+
+    def object_signature(self, object_id: str) -> Optional[Tuple]:
+        """
+        Cheap version token for a sealed object: the pack location for packed
+        objects (no I/O), otherwise (inode, mtime_ns, size) from one stat.
+        Returns None if the object does not exist.
+        """
+        entry = self._packs.lookup(object_id) if self._packs else None
+        if entry is not None:
+            return ('pack', entry.segment, entry.offset, entry.generation)
+        try:
+            return HeaderCache.signature(os.stat(self._data_path(object_id)))
+        except FileNotFoundError:
+            return None
+
     def acquire(self, object_id: Optional[str], access: AccessType, ttl: Optional[float] = 300, meta: Optional[Dict[str, Any]] = None) -> Tuple[Lease, Object]:
         if object_id is None:
             object_id = str(uuid.uuid4())
@@ -80,8 +394,8 @@ class SharedFSPeer(Peer):
             # 1. Create lease file
             # Use object_id.lease_id as filename
             lease_id = str(uuid.uuid4())
-            lease_filename = f"{object_id}.{lease_id}"
-            lease_path = self.leases_dir / lease_filename
+            lease_path = self._lease_path(object_id, lease_id)
+            self._ensure_bucket(lease_path)
             
             # 2. Create Lease and Object
             meta = meta or {}
@@ -89,6 +403,7 @@ class SharedFSPeer(Peer):
             # Initial TTL is the Lease TTL, to ensure cleanup if client crashes before sealing
             ttl_ms = int(ttl * 1000)
             blob = SharedFSBlob(str(lease_path), mode="wb+", meta=meta, ttl=ttl_ms)
+            self._journal_expiry(lease_path, ttl_ms, time.time() + ttl)
             
             lease = SharedFSLease(lease_id, object_id, access, int(ttl), lease_path)
             self._active_leases[lease_id] = lease
@@ -97,9 +412,15 @@ class SharedFSPeer(Peer):
             return lease, obj
 
         elif access == AccessType.WRITE:
-            final_path = self.data_dir / object_id
+            final_path = self._data_path(object_id)
             if not final_path.exists():
-                raise FileNotFoundError(f"Object {object_id} not found")
+                entry = self._lookup_packed(object_id)
+                if entry is None:
+                    raise FileNotFoundError(f"Object {object_id} not found")
+                # Packed objects are immutable; a WRITE lease can only discard them
+                lease = SharedFSLease(str(uuid.uuid4()), object_id, access, int(ttl), packed=True)
+                self._active_leases[lease.lease_id] = lease
+                return lease, Object(object_id, [self._packed_blob(entry)], meta=dict(entry.meta))
             
             # Read Header to get Meta and DataOffset
             blob = SharedFSBlob(str(final_path), mode="r+b")
@@ -114,12 +435,41 @@ class SharedFSPeer(Peer):
             return lease, obj
 
         elif access == AccessType.READ:
-            final_path = self.data_dir / object_id
-            if not final_path.exists():
+            if self._header_cache.is_missing(object_id):
                 raise FileNotFoundError(f"Object {object_id} not found")
-            
-            blob = SharedFSBlob(str(final_path), mode="rb")
-            meta = blob.get_meta()
+
+            # Packed objects are served from the in-memory pack index
+            entry = self._packs.lookup(object_id) if self._packs else None
+            if entry is not None:
+                lease = SharedFSLease(str(uuid.uuid4()), object_id, access, int(ttl))
+                return lease, Object(object_id, [self._packed_blob(entry)], meta=dict(entry.meta))
+
+            final_path = self._data_path(object_id)
+            cached = self._header_cache.get(object_id)
+            try:
+                # With a cached data offset the header is not read at all
+                blob = SharedFSBlob(str(final_path), mode="rb", data_offset=cached[1] if cached else 0)
+            except FileNotFoundError:
+                entry = self._lookup_packed(object_id)
+                if entry is not None:
+                    lease = SharedFSLease(str(uuid.uuid4()), object_id, access, int(ttl))
+                    return lease, Object(object_id, [self._packed_blob(entry)], meta=dict(entry.meta))
+                self._header_cache.add_miss(object_id)
+                raise FileNotFoundError(f"Object {object_id} not found")
+
+            st = os.fstat(blob.file.fileno())
+            if cached and cached[0] == HeaderCache.signature(st):
+                blob.is_sealed = True
+                meta = dict(cached[2])
+            else:
+                if cached:
+                    blob.data_offset = 0
+                    blob._read_header_offset()
+                meta = blob.get_meta()
+                if blob.is_sealed:
+                    self._header_cache.put(object_id, st, blob.data_offset, dict(meta))
+                else:
+                    self._header_cache.invalidate(object_id)
 
             lease_id = str(uuid.uuid4())
             lease = SharedFSLease(lease_id, object_id, access, int(ttl))
@@ -136,29 +486,46 @@ class SharedFSPeer(Peer):
         
         if lease.access != AccessType.CREATE and lease.access != AccessType.WRITE:
             raise ValueError("Cannot seal a read lease")
+
+        if lease.packed:
+            del self._active_leases[lease_id]
+            return
             
         if not lease.file_path or not lease.file_path.exists():
             raise ValueError("Lease file missing")
             
         if lease.access == AccessType.CREATE:
-            final_path = self.data_dir / lease.object_id
+            final_path = self._data_path(lease.object_id)
+            packed = None
             
             try:
                 with SharedFSBlob(str(lease.file_path), mode="r+b") as blob:
                     # Check for Object TTL in metadata
-                    meta = blob.get_meta()
-                    object_ttl = meta.get('ttl')
+                    object_ttl = blob.get_meta_value('ttl')
                     
                     new_ttl_ms = 0 # Default to 0 (no expiration) for sealed objects
                     if object_ttl is not None:
                         new_ttl_ms = int(float(object_ttl) * 1000)
                     
                     blob.seal(new_ttl=new_ttl_ms)
+
+                    size = os.fstat(blob.file.fileno()).st_size - blob.data_offset
+                    if self._packs is not None and 0 <= size <= self.pack_threshold:
+                        data = os.pread(blob.file.fileno(), size, blob.data_offset)
+                        expires_at = time.time() + new_ttl_ms / 1000.0 if new_ttl_ms > 0 else 0.0
+                        packed = self._packs.put(lease.object_id, data, blob.get_meta(), expires_at)
             except Exception as e:
                 logger.error(f"Failed to update header for seal: {e}")
                 raise
 
-            os.rename(lease.file_path, final_path)
+            self._header_cache.invalidate(lease.object_id)
+            if packed is not None:
+                os.remove(lease.file_path)
+            else:
+                self._ensure_bucket(final_path)
+                os.rename(lease.file_path, final_path)
+                if new_ttl_ms > 0:
+                    self._journal_expiry(final_path, new_ttl_ms, time.time() + new_ttl_ms / 1000.0)
             
             lease.file_path = None
         
@@ -172,7 +539,9 @@ class SharedFSPeer(Peer):
         if not lease:
             return
 
-        if lease.file_path and lease.file_path.exists():
+        if lease.packed:
+            self._packs.delete(lease.object_id)
+        elif lease.file_path and lease.file_path.exists():
             try:
                 os.remove(lease.file_path)
             except OSError:
@@ -180,6 +549,13 @@ class SharedFSPeer(Peer):
         
         del self._active_leases[lease_id]
 
+    def renew(self, lease_id: str):
+        lease = self._active_leases.get(lease_id)
+        if lease is None:
+            raise KeyError(f"Lease {lease_id} not found or expired")
+        # Touches the lease file, which GC checks before removing it
+        lease.renew()
+
     def release(self, lease_id: str):
         lease = self._active_leases.get(lease_id)
         if not lease:
@@ -200,6 +576,10 @@ class SharedFSPeer(Peer):
         if self._maintenance_thread and self._maintenance_thread.is_alive():
             return
 
+        # The leader renews every interval, so allow a couple of missed cycles
+        leader_ttl = self.gc_leader_ttl or max(3 * interval, 1)
+        self._gc_leader = LeaderLock(self.root / GC_LOCK_FILE, self.node_id, leader_ttl)
+
         self._stop_maintenance.clear()
         self._maintenance_thread = threading.Thread(
             target=self._maintenance_loop,
@@ -214,20 +594,147 @@ class SharedFSPeer(Peer):
         if self._maintenance_thread:
             self._stop_maintenance.set()
             self._maintenance_thread.join()
+            self._gc_leader.release()
             logger.info("SharedFSPeer maintenance thread stopped")
 
     def _maintenance_loop(self, interval: int):
+        cycle = 0
         while not self._stop_maintenance.is_set():
             try:
-                self._cleanup_zombies()
+                if self._gc_leader.acquire():
+                    self._cleanup_zombies()
+                    cycle += 1
+                    if self.gc_full_scan_every > 0 and cycle % self.gc_full_scan_every == 0:
+                        self._full_scan()
+                    if self._packs is not None:
+                        self._packs.compact(self.pack_compact_ratio, should_continue=self._fenced)
+                        self._packs.purge_retired()
             except Exception as e:
                 logger.error(f"Error in maintenance loop: {e}")
             
-            time.sleep(interval)
+            self._stop_maintenance.wait(interval)
+
+    def _fenced(self) -> bool:
+        """True if GC may keep deleting: not running under a leader lock, or still holding it."""
+        return self._gc_leader is None or self._gc_leader.epoch is None or self._gc_leader.is_held()
+
+    # --- Expiry Index ---
+
+    def _expiry_bucket(self, deadline: float) -> str:
+        # Buckets are named by the time they end, so a bucket is only consumed
+        # once nobody can still be journaling deadlines into it.
+        end = math.ceil(deadline / self.gc_bucket_seconds) * self.gc_bucket_seconds
+        return f"{int(end):012d}"
+
+    def _journal_expiry(self, path: Path, ttl_ms: int, deadline: float):
+        """Record that `path` expires `ttl_ms` after its mtime, around `deadline`."""
+        bucket = self._expiry_bucket(deadline)
+        bucket_dir = self.expiry_dir / bucket
+        if bucket not in self._known_expiry_buckets:
+            bucket_dir.mkdir(parents=True, exist_ok=True)
+            self._known_expiry_buckets.add(bucket)
+
+        line = f"{ttl_ms} {path.relative_to(self.root)}\n".encode('utf-8')
+        fd = os.open(bucket_dir / f"{self.node_id}.log", os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
 
     def _cleanup_zombies(self):
         """
-        Cleanup old lease files and expired objects.
+        Expire the files journaled in due expiry buckets, oldest first,
+        processing at most gc_batch_size entries.
+        """
+        now = time.time()
+        budget = self.gc_batch_size
+        self._known_expiry_buckets = {b for b in self._known_expiry_buckets if int(b) > now}
+
+        with os.scandir(self.expiry_dir) as it:
+            due = sorted(e.name for e in it if e.is_dir() and e.name.isdigit() and int(e.name) <= now)
+
+        for bucket in due:
+            bucket_dir = self.expiry_dir / bucket
+            with os.scandir(bucket_dir) as it:
+                journals = [e for e in it if e.is_file()]
+
+            for journal in journals:
+                if budget <= 0 or not self._fenced():
+                    return
+                if journal.name.startswith('.'):
+                    # Claimed by another GC; only take over if it looks abandoned
+                    try:
+                        if now - journal.stat().st_mtime < CLAIM_TIMEOUT:
+                            continue
+                    except FileNotFoundError:
+                        continue
+
+                claimed = bucket_dir / f".{self.node_id}.{uuid.uuid4().hex}"
+                try:
+                    os.rename(journal.path, claimed)
+                    os.utime(claimed, None)
+                except FileNotFoundError:
+                    continue
+
+                with open(claimed, 'rb') as f:
+                    entries = f.read().splitlines()
+                todo, rest = entries[:budget], entries[budget:]
+                budget -= len(todo)
+
+                for line in todo:
+                    try:
+                        ttl_ms, relpath = line.decode('utf-8').split(' ', 1)
+                        self._expire_entry(self.root / relpath, int(ttl_ms), now)
+                    except (ValueError, OSError) as e:
+                        logger.warning(f"Skipping expiry entry {line!r}: {e}")
+
+                if rest:
+                    tmp_path = bucket_dir / f".{self.node_id}.{uuid.uuid4().hex}.tmp"
+                    with open(tmp_path, 'wb') as f:
+                        f.write(b"\n".join(rest) + b"\n")
+                    os.rename(tmp_path, bucket_dir / f"{self.node_id}.{uuid.uuid4().hex}.log")
+                os.remove(claimed)
+
+            try:
+                os.rmdir(bucket_dir)
+            except OSError:
+                pass
+
+    def _expire_entry(self, path: Path, ttl_ms: int, now: float):
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            # Sealed (lease renamed), released or already collected
+            return
+
+        if mtime + ttl_ms / 1000.0 > now:
+            # Renewed since it was journaled
+            self._journal_expiry(path, ttl_ms, mtime + ttl_ms / 1000.0)
+            return
+
+        # The path may have been re-created with a different TTL since it was
+        # journaled; confirm against the header before deleting.
+        try:
+            with SharedFSBlob(str(path), mode="rb") as blob:
+                actual_ttl_ms = blob.get_ttl()
+        except Exception:
+            actual_ttl_ms = ttl_ms
+        if actual_ttl_ms == 0:
+            return
+        if actual_ttl_ms != ttl_ms and mtime + actual_ttl_ms / 1000.0 > now:
+            self._journal_expiry(path, actual_ttl_ms, mtime + actual_ttl_ms / 1000.0)
+            return
+
+        logger.info(f"Removing expired file: {path} (TTL: {actual_ttl_ms / 1000.0}s)")
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _full_scan(self):
+        """
+        Cleanup old lease files and expired objects by walking the whole tree.
+        Only needed for files written before the expiry index existed.
         """
         now = time.time()
         
@@ -238,24 +745,100 @@ class SharedFSPeer(Peer):
             dirs_to_clean.append(self.data_dir)
 
         for d in dirs_to_clean:
-            for item in d.iterdir():
-                if item.is_file():
+            for item in _iter_files(d, self.fanout):
+                try:
                     try:
-                        try:
-                            # Use context manager since we added it
-                            with SharedFSBlob(str(item), mode="rb") as blob:
-                                ttl_ms = blob.get_ttl()
-                        except Exception:
-                            # Default TTL for unknown files (e.g. 1 hour)
-                            ttl_ms = 3600 * 1000
-                        
-                        ttl_sec = ttl_ms / 1000.0
-                        stat = item.stat()
-                        
-                        # If TTL is 0, it means no expiration (unless it's a zombie lease, but leases always have TTL)
-                        # Sealed objects with 0 TTL live forever.
-                        if ttl_sec > 0 and (now - stat.st_mtime > ttl_sec):
-                            logger.info(f"Removing expired file: {item} (TTL: {ttl_sec}s)")
-                            os.remove(item)
+                        # Use context manager since we added it
+                        with SharedFSBlob(item.path, mode="rb") as blob:
+                            ttl_ms = blob.get_ttl()
+                    except Exception:
+                        # Default TTL for unknown files (e.g. 1 hour)
+                        ttl_ms = 3600 * 1000
+                    
+                    ttl_sec = ttl_ms / 1000.0
+                    stat = item.stat()
+                    
+                    # If TTL is 0, it means no expiration (unless it's a zombie lease, but leases always have TTL)
+                    # Sealed objects with 0 TTL live forever.
+                    if ttl_sec > 0 and (now - stat.st_mtime > ttl_sec):
+                        logger.info(f"Removing expired file: {item.path} (TTL: {ttl_sec}s)")
+                        os.remove(item.path)
+                except OSError:
+                    pass
+
+# --- Layout Migration ---
+
+def migrate_layout(mount_point: str, fanout: int) -> int:
+    """
+    Move every data and lease file under mount_point into the bucket layout
+    for `fanout` levels (0 restores the flat layout), rewrite the expiry
+    journals to match and record the new layout. Run it while no node is
+    using the root.
+
+    Returns the number of files moved.
+    """
+    root = Path(mount_point)
+    current = _read_layout(root) or 0
+    moved = 0
+    created = set()
+
+    for d, is_lease in ((root / 'data', False), (root / 'leases', True)):
+        if not d.exists():
+            continue
+        for entry in list(_iter_files(d, current)):
+            item = Path(entry.path)
+            object_id = _lease_object_id(item.name) if is_lease else item.name
+            target = d.joinpath(*_bucket_parts(object_id, fanout), item.name)
+            if target == item:
+                continue
+            if target.parent not in created:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                created.add(target.parent)
+            os.rename(item, target)
+            moved += 1
+
+        # Drop the now-empty buckets of the old layout
+        if current > fanout:
+            for dirpath, dirnames, filenames in os.walk(d, topdown=False):
+                if Path(dirpath) != d and not dirnames and not filenames:
+                    try:
+                        os.rmdir(dirpath)
                     except OSError:
                         pass
+
+    # Point expiry journal entries at the new locations
+    expiry_dir = root / EXPIRY_DIR
+    if expiry_dir.exists() and moved:
+        for entry in list(_iter_files(expiry_dir, 1)):
+            if entry.name.startswith('.'):
+                continue
+            with open(entry.path, 'rb') as f:
+                lines = f.read().decode('utf-8').splitlines()
+            rewritten = []
+            for line in lines:
+                ttl_ms, relpath = line.split(' ', 1)
+                parts = Path(relpath).parts
+                name = parts[-1]
+                object_id = _lease_object_id(name) if parts[0] == 'leases' else name
+                new_rel = Path(parts[0]).joinpath(*_bucket_parts(object_id, fanout), name)
+                rewritten.append(f"{ttl_ms} {new_rel}\n")
+            tmp_path = Path(entry.path).with_name(f".{entry.name}.tmp")
+            with open(tmp_path, 'w') as f:
+                f.writelines(rewritten)
+            os.rename(tmp_path, entry.path)
+
+    _write_layout(root, fanout)
+    logger.info(f"Migrated {moved} files under {root} to fanout={fanout}")
+    return moved
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate a SharedFSPeer root to a new directory layout")
+    parser.add_argument("mount_point", help="SharedFS root directory")
+    parser.add_argument("--fanout", type=int, default=2, help="Levels of 256 hashed buckets (0 = flat)")
+    args = parser.parse_args()
+
+    moved = migrate_layout(args.mount_point, args.fanout)
+    print(f"Moved {moved} files; {args.mount_point} now uses fanout={args.fanout}")
+
+if __name__ == "__main__":
+    main()
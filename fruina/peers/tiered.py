@@ -7,6 +7,10 @@ class TieredPeer(Peer):
     """
     A composite Peer that manages a 'Hot' peer and a 'Cold' peer.
     Implements LRU eviction from Hot to Cold.
+
+    Keeps a routing table of which tier issued each lease and which tier
+    currently holds each object, so seal/discard/release are a single
+    lookup and dispatch instead of probing both tiers.
     """
     def __init__(self, hot_peer: Peer, cold_peer: Peer, max_items: int = 100):
         super().__init__()
@@ -14,94 +18,81 @@ class TieredPeer(Peer):
         self.cold = cold_peer
         self.max_items = max_items
         self.lru_list: List[str] = []
+        # lease_id -> (issuing tier, object_id)
+        self._lease_routes: Dict[str, Tuple[Peer, str]] = {}
+        # object_id -> tier currently holding the object
+        self._object_tiers: Dict[str, Peer] = {}
 
     def acquire(self, object_id: Optional[str], access: AccessType, ttl: Optional[float] = None, meta: Optional[Dict[str, Any]] = None) -> Tuple[Lease, Object]:
-        # 1. READ: Check Hot, then Cold
-        if access == AccessType.READ:
-            # Try hot first
-            try:
-                lease, obj = self.hot.acquire(object_id, access, ttl, meta)
+        # 1. READ / WRITE: Dispatch to the tier holding the object
+        if access in (AccessType.READ, AccessType.WRITE):
+            tier = self._object_tiers.get(object_id)
+            if tier is not None:
+                lease, obj = tier.acquire(object_id, access, ttl, meta)
+            else:
+                # Not indexed (e.g. written to a shared cold tier by another node):
+                # probe once and remember where it lives.
+                tier, lease, obj = self._locate(object_id, access, ttl, meta)
+                self._object_tiers[object_id] = tier
+
+            if tier is self.hot:
                 self._update_lru(object_id)
-                return lease, obj
-            except (KeyError, ValueError):
-                pass
-            
-            # Try cold
-            try:
-                return self.cold.acquire(object_id, access, ttl, meta)
-            except (KeyError, ValueError):
-                pass
-                
-            raise KeyError(f"Object {object_id} not found in tiered storage")
+            self._lease_routes[lease.lease_id] = (tier, object_id)
+            return lease, obj
 
         # 2. CREATE: Always create in Hot
         elif access == AccessType.CREATE:
             self._ensure_capacity()
-            
+
             # We don't know the object_id yet if it's None, so we let hot peer generate it
-            # But we need to know it to track LRU.
-            # So we might need to peek or handle the return.
             lease, obj = self.hot.acquire(object_id, access, ttl, meta)
             self._update_lru(obj.object_id)
+            self._object_tiers[obj.object_id] = self.hot
+            self._lease_routes[lease.lease_id] = (self.hot, obj.object_id)
             return lease, obj
 
-        # 3. WRITE: Check Hot, then Cold
-        elif access == AccessType.WRITE:
-            # Try hot first
-            try:
-                lease, obj = self.hot.acquire(object_id, access, ttl, meta)
-                self._update_lru(object_id)
-                return lease, obj
-            except (KeyError, ValueError):
-                pass
-            
-            # Try cold
-            try:
-                return self.cold.acquire(object_id, access, ttl, meta)
-            except (KeyError, ValueError):
-                pass
-                
-            raise KeyError(f"Object {object_id} not found in tiered storage")
-            
         raise ValueError(f"Unknown access type: {access}")
 
     def seal(self, lease_id: str):
-        try:
-            self.hot.seal(lease_id)
-            return
-        except (KeyError, ValueError):
-            pass
-            
-        try:
-            self.cold.seal(lease_id)
-            return
-        except (KeyError, ValueError):
-            pass
-            
-        raise KeyError(f"Lease {lease_id} not found")
+        route = self._lease_routes.get(lease_id)
+        if route is None:
+            raise KeyError(f"Lease {lease_id} not found")
+        tier, _ = route
+        tier.seal(lease_id)
 
     def discard(self, lease_id: str):
-        try:
-            if lease_id in self.hot.leases:
-                lease = self.hot.leases[lease_id]
-                if lease.object_id in self.lru_list:
-                    self.lru_list.remove(lease.object_id)
-                self.hot.discard(lease_id)
-                return
-        except Exception:
-            pass
+        route = self._lease_routes.pop(lease_id, None)
+        if route is None:
+            raise KeyError(f"Lease {lease_id} not found")
+        tier, object_id = route
 
-        try:
-            self.cold.discard(lease_id)
-            return
-        except Exception:
-            pass
-            
-        raise KeyError(f"Lease {lease_id} not found")
+        if self._object_tiers.get(object_id) is tier:
+            del self._object_tiers[object_id]
+            if tier is self.hot and object_id in self.lru_list:
+                self.lru_list.remove(object_id)
+        tier.discard(lease_id)
+
+    def renew(self, lease_id: str):
+        route = self._lease_routes.get(lease_id)
+        if route is None:
+            raise KeyError(f"Lease {lease_id} not found")
+        route[0].renew(lease_id)
 
     def release(self, lease_id: str):
-        self.hot.release(lease_id)
-        self.cold.release(lease_id)
+        route = self._lease_routes.pop(lease_id, None)
+        if route is None:
+            return
+        tier, _ = route
+        tier.release(lease_id)
+
+    def _locate(self, object_id: str, access: AccessType, ttl: Optional[float], meta: Optional[Dict[str, Any]]) -> Tuple[Peer, Lease, Object]:
+        for tier in (self.hot, self.cold):
+            try:
+                lease, obj = tier.acquire(object_id, access, ttl, meta)
+                return tier, lease, obj
+            except (KeyError, ValueError, FileNotFoundError):
+                pass
+        raise KeyError(f"Object {object_id} not found in tiered storage")
 
     def _update_lru(self, object_id: str):
         if object_id in self.lru_list:
@@ -115,7 +106,7 @@ class TieredPeer(Peer):
 
     def _evict_to_cold(self, object_id: str):
         print(f"[TieredPeer] Evicting {object_id} from Hot to Cold...")
-        
+
         # 1. Read from Hot
         try:
             read_lease, hot_obj = self.hot.acquire(object_id, AccessType.READ)
@@ -127,9 +118,9 @@ class TieredPeer(Peer):
 
         # 2. Write to Cold
         create_lease, cold_obj = self.cold.acquire(object_id, AccessType.CREATE)
-        
+
         cold_obj.blobs[0].truncate(len(blob_data))
-        
+
         # MemBlob.file is a file object, we can seek.
         if hasattr(cold_obj.blobs[0], 'file'):
              cold_obj.blobs[0].file.seek(0)
@@ -137,9 +128,10 @@ class TieredPeer(Peer):
         else:
              # Fallback if not MemBlob (though it should be)
              cold_obj.blobs[0].write(blob_data)
-        
+
         self.cold.seal(create_lease.lease_id)
         self.cold.release(create_lease.lease_id)
+        self._object_tiers[object_id] = self.cold
 
         # 3. Remove from Hot
         lease, _ = self.hot.acquire(object_id, AccessType.WRITE)
@@ -0,0 +1,286 @@
+import os
+import ssl
+import json
+import array
+import socket
+import asyncio
+from collections import deque
+from urllib.parse import urlsplit
+from typing import Any, Dict, List, Optional, Tuple
+from .direct import DirectTransport
+from .base import AcquireResult
+from .uds import FRAME_STRUCT, MAX_FRAME_SIZE, MAX_FDS, BATCH_SIZE
+
+RECV_SIZE = 256 * 1024
+
+class AsyncTransport:
+    """
+    Coroutine counterpart of Transport. acquire_many returns, per request,
+    either (lease_info, handles) or the exception that request raised.
+    """
+    async def acquire(self, object_id: Optional[str], intent: str, ttl: Optional[float] = None,
+                      meta: Optional[Dict] = None) -> Tuple[Dict, List[Any]]:
+        raise NotImplementedError
+
+    async def acquire_many(self, requests: List[Dict[str, Any]]) -> List[AcquireResult]:
+        return await asyncio.gather(*(self.acquire(r.get("object_id"), r["intent"], r.get("ttl_seconds"), r.get("meta"))
+                                      for r in requests), return_exceptions=True)
+
+    async def seal(self, lease_id: str) -> None:
+        raise NotImplementedError
+
+    async def discard(self, lease_id: str) -> None:
+        raise NotImplementedError
+
+    async def release(self, lease_id: str) -> None:
+        raise NotImplementedError
+
+    async def renew(self, lease_ids: List[str]) -> List[str]:
+        """Extend several leases in one request; returns the ids no longer held."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+class AsyncDirectTransport(AsyncTransport):
+    """In-process Peer; its calls only touch in-memory tables, so they run inline."""
+    def __init__(self, peer):
+        self.direct = DirectTransport(peer)
+
+    async def acquire(self, object_id, intent, ttl=None, meta=None):
+        return self.direct.acquire(object_id, intent, ttl, meta)
+
+    async def seal(self, lease_id: str) -> None:
+        self.direct.seal(lease_id)
+
+    async def discard(self, lease_id: str) -> None:
+        self.direct.discard(lease_id)
+
+    async def release(self, lease_id: str) -> None:
+        self.direct.release(lease_id)
+
+    async def renew(self, lease_ids: List[str]) -> List[str]:
+        return self.direct.renew(lease_ids)
+
+class AsyncUdsTransport(AsyncTransport):
+    """
+    One persistent, non-blocking connection to a UdsServer, shared by every
+    coroutine on the loop. Requests are framed and pipelined: each carries
+    an id and its response resolves the matching future, so thousands of
+    gets can be in flight at once. Memory objects come back as fds passed
+    with SCM_RIGHTS; they are queued in arrival order and handed to
+    responses by their "nfds" count.
+    """
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self._sock: Optional[socket.socket] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._connecting: Optional[asyncio.Lock] = None
+        self._send_lock: Optional[asyncio.Lock] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._buf = bytearray()
+        self._fds: deque = deque()
+
+    async def _ensure_connected(self) -> socket.socket:
+        if self._sock is not None:
+            return self._sock
+        if self._connecting is None:
+            self._connecting = asyncio.Lock()
+            self._send_lock = asyncio.Lock()
+        async with self._connecting:
+            if self._sock is None:
+                loop = asyncio.get_running_loop()
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                try:
+                    await loop.sock_connect(sock, self.socket_path)
+                except BaseException:
+                    sock.close()
+                    raise
+                loop.add_reader(sock.fileno(), self._on_readable)
+                self._loop, self._sock = loop, sock
+        return self._sock
+
+    async def _call(self, req: Dict[str, Any]) -> Tuple[Dict, List[int]]:
+        sock = await self._ensure_connected()
+        self._next_id += 1
+        req_id = self._next_id
+        future = self._loop.create_future()
+        self._pending[req_id] = future
+
+        body = json.dumps(dict(req, id=req_id)).encode('utf-8')
+        try:
+            async with self._send_lock:
+                await self._loop.sock_sendall(sock, FRAME_STRUCT.pack(len(body)) + body)
+        except BaseException:
+            self._pending.pop(req_id, None)
+            raise
+        return await future
+
+    def _on_readable(self):
+        while self._sock is not None:
+            try:
+                msg, ancdata, _, _ = self._sock.recvmsg(RECV_SIZE, socket.CMSG_SPACE(MAX_FDS * 4))
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                self._fail(e)
+                return
+            if not msg:
+                self._fail(ConnectionError("Connection closed by server"))
+                return
+            for level, kind, data in ancdata:
+                if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+                    fds = array.array("i")
+                    fds.frombytes(data[:len(data) - (len(data) % fds.itemsize)])
+                    self._fds.extend(fds)
+            self._buf += msg
+            self._dispatch()
+
+    def _dispatch(self):
+        header = FRAME_STRUCT.size
+        while len(self._buf) >= header:
+            (length,) = FRAME_STRUCT.unpack_from(self._buf)
+            if length > MAX_FRAME_SIZE:
+                self._fail(ValueError(f"Frame of {length} bytes exceeds the limit"))
+                return
+            if len(self._buf) < header + length:
+                return
+            resp = json.loads(bytes(self._buf[header:header + length]).decode('utf-8'))
+            del self._buf[:header + length]
+
+            nfds = resp.get("nfds", 0) + sum(r.get("nfds", 0) for r in resp.get("results", ()))
+            fds = [self._fds.popleft() for _ in range(min(nfds, len(self._fds)))]
+            future = self._pending.pop(resp.pop("id", None), None)
+            if future is None or future.done():
+                # The caller gave up (e.g. was cancelled); give back what it acquired
+                self._abandon(resp, fds)
+            else:
+                future.set_result((resp, fds))
+
+    def _abandon(self, resp: Dict, fds: List[int]):
+        for fd in fds:
+            os.close(fd)
+        leases = [resp.get("lease_id")] + [r.get("lease_id") for r in resp.get("results", ())]
+        for lease_id in filter(None, leases):
+            self._loop.create_task(self._call({"command": "release", "lease_id": lease_id}))
+
+    def _fail(self, error: Exception):
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            self._loop.remove_reader(sock.fileno())
+            sock.close()
+        for fd in self._fds:
+            os.close(fd)
+        self._fds.clear()
+        self._buf.clear()
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    @staticmethod
+    def _handles(resp: Dict, fds: List[int]) -> List[Any]:
+        return fds if fds else resp.get("handles", [])
+
+    async def acquire(self, object_id, intent, ttl=None, meta=None):
+        resp, fds = await self._call({"command": "acquire", "object_id": object_id, "intent": intent,
+                                      "ttl_seconds": ttl, "meta": meta})
+        if resp.get("status") == "error":
+            raise RuntimeError(resp.get("message"))
+        return resp, self._handles(resp, fds)
+
+    async def acquire_many(self, requests: List[Dict[str, Any]]) -> List[AcquireResult]:
+        batches = [requests[i:i + BATCH_SIZE] for i in range(0, len(requests), BATCH_SIZE)]
+        replies = await asyncio.gather(*(self._call({"command": "acquire_many", "requests": batch})
+                                         for batch in batches))
+        results: List[AcquireResult] = []
+        for resp, fds in replies:
+            if resp.get("status") == "error":
+                raise RuntimeError(resp.get("message"))
+            fds = deque(fds)
+            for item in resp["results"]:
+                item_fds = [fds.popleft() for _ in range(item.get("nfds", 0))]
+                if item.get("status") == "error":
+                    results.append(RuntimeError(item.get("message")))
+                else:
+                    results.append((item, self._handles(item, item_fds)))
+        return results
+
+    async def _command(self, command: str, lease_id: str):
+        resp, _ = await self._call({"command": command, "lease_id": lease_id})
+        if resp.get("status") == "error":
+            raise RuntimeError(resp.get("message"))
+
+    async def seal(self, lease_id: str) -> None:
+        await self._command("seal", lease_id)
+
+    async def discard(self, lease_id: str) -> None:
+        await self._command("discard", lease_id)
+
+    async def release(self, lease_id: str) -> None:
+        await self._command("release", lease_id)
+
+    async def renew(self, lease_ids: List[str]) -> List[str]:
+        resp, _ = await self._call({"command": "renew", "lease_ids": list(lease_ids)})
+        if resp.get("status") == "error":
+            raise RuntimeError(resp.get("message"))
+        return resp.get("lost", [])
+
+    async def close(self) -> None:
+        if self._sock is not None:
+            self._fail(ConnectionError("Transport closed"))
+
+class AsyncHttpTransport(AsyncTransport):
+    """HttpServer over asyncio streams, one short-lived connection per request."""
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+        url = urlsplit(self.base_url)
+        self.host = url.hostname or "127.0.0.1"
+        self.ssl = ssl.create_default_context() if url.scheme == "https" else None
+        self.port = url.port or (443 if self.ssl else 80)
+        self.prefix = url.path
+
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Tuple[int, bytes]:
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        try:
+            body = json.dumps(payload).encode('utf-8')
+            writer.write(f"POST {self.prefix}{path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                         f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                         f"Connection: close\r\n\r\n".encode('ascii') + body)
+            await writer.drain()
+            data = await reader.read()
+        finally:
+            writer.close()
+        head, _, content = data.partition(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1]) if head else 0
+        return status, content
+
+    async def acquire(self, object_id, intent, ttl=None, meta=None):
+        status, content = await self._post("/acquire", {"object_id": object_id, "intent": intent,
+                                                        "ttl_seconds": ttl, "meta": meta})
+        if status != 200:
+            raise RuntimeError(f"Acquire failed: {content.decode('utf-8', 'replace')}")
+        data = json.loads(content)
+        return data, data['handles']
+
+    async def _command(self, command: str, lease_id: str):
+        status, content = await self._post(f"/{command}", {"lease_id": lease_id})
+        if status != 200:
+            raise RuntimeError(f"{command.capitalize()} failed: {content.decode('utf-8', 'replace')}")
+
+    async def seal(self, lease_id: str) -> None:
+        await self._command("seal", lease_id)
+
+    async def discard(self, lease_id: str) -> None:
+        await self._command("discard", lease_id)
+
+    async def release(self, lease_id: str) -> None:
+        await self._command("release", lease_id)
+
+    async def renew(self, lease_ids: List[str]) -> List[str]:
+        status, content = await self._post("/renew", {"lease_ids": list(lease_ids)})
+        if status != 200:
+            raise RuntimeError(f"Renew failed: {content.decode('utf-8', 'replace')}")
+        return json.loads(content).get("lost", [])
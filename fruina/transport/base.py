@@ -1,5 +1,25 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Tuple, List
+from typing import Any, Dict, Optional, Tuple, List, Union
+from ..core.blob import BlobView
+from ..backends.memory import MemoryBlobView
+from ..backends.fs import FileBlobView
+
+def open_handle(handle: Any, mode: str = "rb", direct: bool = False) -> BlobView:
+    """
+    Open a client-side BlobView for a handle returned by Transport.acquire.
+    """
+    if isinstance(handle, int):
+        return MemoryBlobView(handle, mode=mode)
+    elif isinstance(handle, str):
+        return FileBlobView(handle, mode=mode)
+    elif isinstance(handle, dict) and handle.get('type') == 'shared_fs':
+        from ..backends.shared_fs import SharedFSBlobView
+        return SharedFSBlobView(handle['path'], mode=mode, data_offset=handle.get('data_offset', 0),
+                                length=handle.get('length'), direct=direct)
+    else:
+        raise ValueError(f"Unknown handle type: {type(handle)}")
+
+AcquireResult = Union[Tuple[Dict, List[Any]], Exception]
 
 class Transport(ABC):
     @abstractmethod
@@ -11,6 +31,20 @@ class Transport(ABC):
         """
         pass
 
+    def acquire_many(self, requests: List[Dict[str, Any]]) -> List[AcquireResult]:
+        """
+        Acquire several leases; returns, per request, either
+        (lease_info, handles) or the exception that request raised.
+        Transports that can batch round trips override this.
+        """
+        results: List[AcquireResult] = []
+        for r in requests:
+            try:
+                results.append(self.acquire(r.get("object_id"), r["intent"], r.get("ttl_seconds"), r.get("meta")))
+            except Exception as e:
+                results.append(e)
+        return results
+
     @abstractmethod
     def seal(self, lease_id: str) -> None:
         pass
@@ -22,3 +56,22 @@ class Transport(ABC):
     @abstractmethod
     def release(self, lease_id: str) -> None:
         pass
+
+    @abstractmethod
+    def renew(self, lease_ids: List[str]) -> List[str]:
+        """
+        Extend several leases by their ttl in one request; returns the ids
+        of those the server no longer holds (expired or released).
+        """
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection pool statistics; empty for transports without connections."""
+        return {}
+
+    def health_check(self) -> bool:
+        """Drop dead pooled connections and report whether the server answers."""
+        return True
+
+    def close(self) -> None:
+        pass
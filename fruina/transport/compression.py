@@ -0,0 +1,139 @@
+import os
+import lzma
+import zlib
+import struct
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+# Compressed payloads are a sequence of independently compressed chunks,
+# each framed as Length(I) + compressed bytes, so both ends can run the
+# codec on several chunks at once (zlib and lzma release the GIL).
+CHUNK_STRUCT = struct.Struct("!I")
+COMPRESSION_CHUNK = 1024 * 1024
+
+# Ranges smaller than this are not worth the round trip through a codec
+MIN_COMPRESS_SIZE = 64 * 1024
+# Sample-compress up to SAMPLE_COUNT pieces of SAMPLE_SIZE bytes; if they
+# shrink by less than this ratio, the payload is sent as-is.
+SAMPLE_SIZE = 16 * 1024
+SAMPLE_COUNT = 4
+MAX_RATIO = 0.8
+
+# Meta key an object can set to pick its codec ("zlib", "lzma" or "none")
+META_KEY = "compression"
+
+CODECS: Dict[str, Any] = {
+    "zlib": (lambda data: zlib.compress(data, 1), zlib.decompress),
+    "lzma": (lambda data: lzma.compress(data, preset=1), lzma.decompress),
+}
+# lzma is only used when an object asks for it in its meta
+DEFAULT_ACCEPT = ("zlib", "lzma")
+
+CODEC_WORKERS = os.cpu_count() or 4
+# Chunks in flight per stream, bounding the memory a transfer holds
+WINDOW = CODEC_WORKERS * 2
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+def codec_pool() -> ThreadPoolExecutor:
+    """Process-wide pool the codecs run on, one thread per core."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=CODEC_WORKERS, thread_name_prefix="fruina-codec")
+        return _pool
+
+def choose_codec(meta: Optional[Dict[str, Any]], length: int, accept: Iterable[str],
+                 read_sample: Callable[[int, int], Any]) -> Optional[str]:
+    """
+    Pick the codec for sending `length` bytes to a receiver that accepts
+    `accept`, or None to send them uncompressed. An object's meta decides
+    when it names a codec; otherwise zlib is used if a few samples of the
+    range, read with read_sample(offset, size), compress well.
+    """
+    accept = [codec for codec in accept if codec in CODECS]
+    if not accept or length < MIN_COMPRESS_SIZE:
+        return None
+
+    requested = (meta or {}).get(META_KEY)
+    if requested is not None:
+        return requested if requested in accept else None
+    if "zlib" not in accept:
+        return None
+
+    step = max(length // SAMPLE_COUNT, SAMPLE_SIZE)
+    raw = compressed = 0
+    for offset in range(0, length, step):
+        sample = bytes(read_sample(offset, min(SAMPLE_SIZE, length - offset)))
+        raw += len(sample)
+        compressed += len(zlib.compress(sample, 1))
+    return "zlib" if raw and compressed <= raw * MAX_RATIO else None
+
+def compress_chunks(read_range: Callable[[int, int], Any], length: int, codec: str,
+                    chunk_size: int = COMPRESSION_CHUNK) -> Iterator[bytes]:
+    """
+    Yield the framed compressed chunks of a `length` byte range, in order.
+    read_range(offset, size) returns the raw bytes at `offset` within the
+    range; reads and compression run ahead on the codec pool.
+    """
+    compress = CODECS[codec][0]
+    pool = codec_pool()
+
+    def job(offset: int, size: int) -> bytes:
+        data = compress(read_range(offset, size))
+        return CHUNK_STRUCT.pack(len(data)) + data
+
+    pending: deque = deque()
+    try:
+        for offset in range(0, length, chunk_size):
+            pending.append(pool.submit(job, offset, min(chunk_size, length - offset)))
+            if len(pending) >= WINDOW:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # The caller may close its source once we return; don't leave reads behind
+        _drain(pending)
+
+def decompress_into(recv_exact: Callable[[int], bytes], view: memoryview, codec: str,
+                    chunk_size: int = COMPRESSION_CHUNK) -> int:
+    """
+    Receive framed compressed chunks with recv_exact(n) and decompress them
+    into `view`, several at a time on the codec pool. Returns the number of
+    compressed bytes received.
+    """
+    decompress = CODECS[codec][1]
+    pool = codec_pool()
+
+    def job(data: bytes, offset: int, size: int):
+        out = decompress(data)
+        if len(out) != size:
+            raise ValueError(f"Compressed chunk at {offset} expanded to {len(out)} bytes, expected {size}")
+        view[offset:offset + size] = out
+
+    received = 0
+    pending: deque = deque()
+    try:
+        for offset in range(0, len(view), chunk_size):
+            (n,) = CHUNK_STRUCT.unpack(recv_exact(CHUNK_STRUCT.size))
+            data = recv_exact(n)
+            received += CHUNK_STRUCT.size + n
+            pending.append(pool.submit(job, data, offset, min(chunk_size, len(view) - offset)))
+            if len(pending) >= WINDOW:
+                pending.popleft().result()
+        while pending:
+            pending.popleft().result()
+    finally:
+        # Never return with a job still writing into the caller's view
+        _drain(pending)
+    return received
+
+def _drain(pending: deque):
+    for future in pending:
+        future.cancel()
+    for future in pending:
+        if not future.cancelled():
+            future.exception()
@@ -50,3 +50,6 @@ class DirectTransport(Transport):
 
     def release(self, lease_id: str) -> None:
         self.peer.release(lease_id)
+
+    def renew(self, lease_ids: List[str]) -> List[str]:
+        return self.peer.renew_many(lease_ids)
@@ -1,15 +1,28 @@
+import os
 import json
 import http.server
 import threading
 import requests
-from typing import Optional, Any, Dict, Tuple, List
+from contextlib import contextmanager
+from urllib.parse import parse_qs
+from typing import Optional, Any, Dict, Iterator, Tuple, List
 from ..core.peer import Peer
 from ..core.lease import AccessType
 from .base import Transport
+from .pool import ConnectionPool
+from .compression import choose_codec, compress_chunks, decompress_into, COMPRESSION_CHUNK, DEFAULT_ACCEPT
+
+# Content-Encoding tokens for the chunked codecs of compression.py
+ENCODING_PREFIX = "x-fruina-"
 
 # --- Server ---
 
 class RequestHandler(http.server.BaseHTTPRequestHandler):
+    # Keep-alive, so pooled clients reuse their connections; without
+    # TCP_NODELAY the separate header/body writes stall on delayed ACKs
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
     def __init__(self, peer: Peer, *args, **kwargs):
         self.peer = peer
         super().__init__(*args, **kwargs)
@@ -23,9 +36,71 @@ class RequestHandler(http.server.BaseHTTPRequestHandler):
             self.handle_discard()
         elif self.path == '/release':
             self.handle_release()
+        elif self.path == '/renew':
+            self.handle_renew()
+        else:
+            self.send_error(404)
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        if path.startswith('/objects/'):
+            self.handle_fetch(path[len('/objects/'):], parse_qs(query))
+        elif path == '/health':
+            self.send_json(200, {"status": "ok"})
         else:
             self.send_error(404)
 
+    def handle_fetch(self, object_id: str, params: Dict[str, List[str]]):
+        """
+        Serve a byte range of a sealed object. The body is compressed when
+        Accept-Encoding lists one of our codecs and the data compresses well.
+        """
+        from ..p2p.server import open_source, send_range
+
+        try:
+            lease, obj = self.peer.acquire(object_id, AccessType.READ)
+        except (KeyError, ValueError, FileNotFoundError) as e:
+            self.send_json(404, {"error": str(e)})
+            return
+
+        try:
+            blob = obj.blobs[0]
+            fd, base, size = open_source(blob)
+            try:
+                offset = min(max(int(params.get('offset', ['0'])[0]), 0), size)
+                length = int(params.get('length', ['-1'])[0])
+                if length < 0 or offset + length > size:
+                    length = size - offset
+                if fd is not None:
+                    read_range = lambda start, n: os.pread(fd, n, base + offset + start)
+                else:
+                    read_range = lambda start, n: blob.read(n, offset + start)
+
+                accept = [token.strip()[len(ENCODING_PREFIX):] for token in self.headers.get('Accept-Encoding', '').split(',')
+                          if token.strip().startswith(ENCODING_PREFIX)]
+                codec = choose_codec(obj.meta, length, accept, read_range)
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/octet-stream')
+                self.send_header('X-Fruina-Length', str(length))
+                if codec is None:
+                    self.send_header('Content-Length', str(length))
+                    self.end_headers()
+                    send_range(self.connection, blob, fd, base + offset, length, offset)
+                else:
+                    # Compressed size is unknown up front; the body ends with the connection
+                    self.send_header('Content-Encoding', ENCODING_PREFIX + codec)
+                    self.send_header('X-Fruina-Chunk-Size', str(COMPRESSION_CHUNK))
+                    self.close_connection = True
+                    self.end_headers()
+                    for frame in compress_chunks(read_range, length, codec):
+                        self.wfile.write(frame)
+            finally:
+                if fd is not None:
+                    os.close(fd)
+        finally:
+            self.peer.release(lease.lease_id)
+
     def handle_acquire(self):
         try:
             length = int(self.headers.get('content-length', 0))
@@ -54,7 +129,8 @@ class RequestHandler(http.server.BaseHTTPRequestHandler):
                 "object_id": lease.object_id,
                 "intent": intent,
                 "handles": handles, # List of paths
-                "ttl_seconds": ttl
+                "ttl_seconds": ttl,
+                "meta": obj.meta if obj else {}
             }
             
             self.send_json(200, response)
@@ -96,11 +172,22 @@ class RequestHandler(http.server.BaseHTTPRequestHandler):
         except Exception as e:
             self.send_json(400, {"error": str(e)})
 
+    def handle_renew(self):
+        try:
+            length = int(self.headers.get('content-length', 0))
+            data = json.loads(self.rfile.read(length))
+            lost = self.peer.renew_many(data['lease_ids'])
+            self.send_json(200, {"status": "renewed", "lost": lost})
+        except Exception as e:
+            self.send_json(400, {"error": str(e)})
+
     def send_json(self, code, data):
+        body = json.dumps(data).encode('utf-8')
         self.send_response(code)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode('utf-8'))
+        self.wfile.write(body)
 
 class HttpServer:
     def __init__(self, peer: Peer, port: int = 8080):
@@ -113,7 +200,9 @@ class HttpServer:
         def handler_factory(*args, **kwargs):
             return RequestHandler(self.peer, *args, **kwargs)
         
-        self.server = http.server.HTTPServer(('0.0.0.0', self.port), handler_factory)
+        # A thread per connection: keep-alive clients each hold one open
+        self.server = http.server.ThreadingHTTPServer(('0.0.0.0', self.port), handler_factory)
+        self.server.daemon_threads = True
         print(f"HTTP Server listening on port {self.port}")
         self.thread = threading.Thread(target=self.server.serve_forever)
         self.thread.daemon = True
@@ -127,18 +216,47 @@ class HttpServer:
 # --- Client ---
 
 class HttpTransport(Transport):
-    def __init__(self, base_url: str):
+    """
+    Client for an HttpServer. Thread-safe: each request borrows a
+    requests.Session, with its keep-alive connection, from a bounded pool.
+    """
+    def __init__(self, base_url: str, compression: Tuple[str, ...] = DEFAULT_ACCEPT,
+                 pool_size: int = 16, pool_timeout: float = 30.0, timeout: Optional[float] = 60.0):
         self.base_url = base_url.rstrip('/')
+        self.compression = tuple(compression)
+        self.timeout = timeout
+        self.pool = ConnectionPool(requests.Session, requests.Session.close, max_size=pool_size,
+                                   timeout=pool_timeout, check=self._ping)
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> requests.Response:
+        with self.pool.connection() as session:
+            return session.post(f"{self.base_url}{path}", json=payload, timeout=self.timeout)
+
+    def _ping(self, session: requests.Session) -> bool:
+        return session.get(f"{self.base_url}/health", timeout=self.timeout).status_code == 200
+
+    def stats(self) -> Dict[str, Any]:
+        return self.pool.stats()
+
+    def health_check(self) -> bool:
+        self.pool.health_check()
+        try:
+            with self.pool.connection() as session:
+                return self._ping(session)
+        except (OSError, requests.RequestException, RuntimeError):
+            return False
+
+    def close(self) -> None:
+        self.pool.close()
 
     def acquire(self, object_id: Optional[str], intent: str, ttl: Optional[float] = None, meta: Optional[Dict] = None) -> Tuple[Dict, List[Any]]:
-        url = f"{self.base_url}/acquire"
         payload = {
             "object_id": object_id,
             "intent": intent,
             "ttl_seconds": ttl,
             "meta": meta
         }
-        resp = requests.post(url, json=payload)
+        resp = self._post("/acquire", payload)
         if resp.status_code != 200:
             raise RuntimeError(f"Acquire failed: {resp.text}")
             
@@ -147,19 +265,72 @@ class HttpTransport(Transport):
         return data, data['handles']
 
     def seal(self, lease_id: str) -> None:
-        url = f"{self.base_url}/seal"
-        resp = requests.post(url, json={"lease_id": lease_id})
+        resp = self._post("/seal", {"lease_id": lease_id})
         if resp.status_code != 200:
             raise RuntimeError(f"Seal failed: {resp.text}")
 
     def discard(self, lease_id: str) -> None:
-        url = f"{self.base_url}/discard"
-        resp = requests.post(url, json={"lease_id": lease_id})
+        resp = self._post("/discard", {"lease_id": lease_id})
         if resp.status_code != 200:
             raise RuntimeError(f"Discard failed: {resp.text}")
 
     def release(self, lease_id: str) -> None:
-        url = f"{self.base_url}/release"
-        resp = requests.post(url, json={"lease_id": lease_id})
+        resp = self._post("/release", {"lease_id": lease_id})
         if resp.status_code != 200:
             raise RuntimeError(f"Release failed: {resp.text}")
+
+    def renew(self, lease_ids: List[str]) -> List[str]:
+        resp = self._post("/renew", {"lease_ids": list(lease_ids)})
+        if resp.status_code != 200:
+            raise RuntimeError(f"Renew failed: {resp.text}")
+        return resp.json().get("lost", [])
+
+    def fetch(self, object_id: str, offset: int = 0, length: int = -1) -> bytes:
+        """
+        Read a byte range of a sealed object over HTTP, for clients that
+        cannot open the handles (e.g. on another host).
+        """
+        with self._get(object_id, offset, length) as resp:
+            buf = bytearray(int(resp.headers['X-Fruina-Length']))
+            self._receive(resp, memoryview(buf))
+        return bytes(buf)
+
+    def fetch_into(self, object_id: str, view: memoryview, offset: int = 0) -> None:
+        """Read len(view) bytes starting at `offset` straight into `view`."""
+        with self._get(object_id, offset, len(view)) as resp:
+            if int(resp.headers['X-Fruina-Length']) != len(view):
+                raise ValueError(f"Server returned {resp.headers['X-Fruina-Length']} bytes for a {len(view)} byte range")
+            self._receive(resp, view)
+
+    @contextmanager
+    def _get(self, object_id: str, offset: int, length: int) -> Iterator[requests.Response]:
+        url = f"{self.base_url}/objects/{object_id}"
+        encodings = ", ".join(ENCODING_PREFIX + codec for codec in self.compression) or "identity"
+        # The session stays checked out until the streamed body has been read
+        with self.pool.connection() as session:
+            with session.get(url, params={"offset": offset, "length": length},
+                             headers={"Accept-Encoding": encodings}, stream=True, timeout=self.timeout) as resp:
+                if resp.status_code == 404:
+                    raise KeyError(f"Object {object_id} not found")
+                if resp.status_code != 200:
+                    raise RuntimeError(f"Fetch failed: {resp.text}")
+                yield resp
+
+    @staticmethod
+    def _receive(resp: requests.Response, view: memoryview):
+        def recv_exact(n: int) -> bytes:
+            data = resp.raw.read(n)
+            if len(data) != n:
+                raise ConnectionError("Connection closed by server")
+            return data
+
+        encoding = resp.headers.get('Content-Encoding', '')
+        if encoding.startswith(ENCODING_PREFIX):
+            decompress_into(recv_exact, view, encoding[len(ENCODING_PREFIX):], int(resp.headers['X-Fruina-Chunk-Size']))
+            return
+        received = 0
+        while received < len(view):
+            n = resp.raw.readinto(view[received:])
+            if not n:
+                raise ConnectionError("Connection closed by server")
+            received += n
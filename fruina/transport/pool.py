@@ -0,0 +1,160 @@
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+class PoolTimeout(TimeoutError):
+    """No connection became free within the pool's timeout."""
+
+class ConnectionPool:
+    """
+    A bounded pool of persistent connections shared by many threads.
+
+    connection() checks one out for the duration of a request. A thread
+    gets back the connection it used last when that one is idle (per-thread
+    affinity keeps a thread on a warm connection without pinning it), else
+    any idle one, else a new one while fewer than `max_size` exist, else it
+    waits up to `timeout` seconds. A connection whose request raised is
+    closed rather than returned, since it may be mid-message. Idle
+    connections unused for `check_interval` seconds are checked with
+    `check` before being handed out.
+    """
+    def __init__(self, factory: Callable[[], Any], close: Callable[[Any], None], max_size: int = 16,
+                 timeout: float = 30.0, check: Optional[Callable[[Any], bool]] = None,
+                 check_interval: float = 30.0):
+        self.factory = factory
+        self.close_connection = close
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.check = check
+        self.check_interval = check_interval
+
+        self._idle: List[Any] = []
+        self._last_used: Dict[int, float] = {}
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._stats = {"created": 0, "reused": 0, "affinity_hits": 0, "waits": 0, "wait_seconds": 0.0,
+                       "broken": 0, "failed_checks": 0, "requests": 0}
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn = self._checkout()
+        try:
+            yield conn
+        except BaseException:
+            self._discard(conn)
+            raise
+        with self._cond:
+            if self._closed:
+                self._size -= 1
+                self.close_connection(conn)
+                return
+            self._last_used[id(conn)] = time.monotonic()
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def _checkout(self) -> Any:
+        while True:
+            conn, fresh = self._take()
+            if fresh or not self._stale(conn) or self._check(conn):
+                self._local.conn = conn
+                return conn
+
+    def _take(self):
+        """(connection, newly created) -- an idle one if possible."""
+        deadline = None
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+            self._stats["requests"] += 1
+            while True:
+                preferred = getattr(self._local, "conn", None)
+                if preferred is not None and any(c is preferred for c in self._idle):
+                    self._idle = [c for c in self._idle if c is not preferred]
+                    self._stats["affinity_hits"] += 1
+                    return preferred, False
+                if self._idle:
+                    # Most recently used first, keeping the warmest connections busy
+                    self._stats["reused"] += 1
+                    return self._idle.pop(), False
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + self.timeout
+                    self._stats["waits"] += 1
+                if now >= deadline:
+                    raise PoolTimeout(f"No connection free after {self.timeout}s ({self.max_size} in use)")
+                self._cond.wait(deadline - now)
+                self._stats["wait_seconds"] += time.monotonic() - now
+        try:
+            conn = self.factory()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["created"] += 1
+        return conn, True
+
+    def _stale(self, conn: Any) -> bool:
+        return self.check is not None and time.monotonic() - self._last_used.get(id(conn), 0) > self.check_interval
+
+    def _check(self, conn: Any) -> bool:
+        try:
+            healthy = self.check(conn)
+        except Exception:
+            healthy = False
+        if not healthy:
+            with self._cond:
+                self._stats["failed_checks"] += 1
+            self._discard(conn, broken=False)
+        return healthy
+
+    def _discard(self, conn: Any, broken: bool = True):
+        with self._cond:
+            self._size -= 1
+            self._last_used.pop(id(conn), None)
+            if broken:
+                self._stats["broken"] += 1
+            self._cond.notify()
+        try:
+            self.close_connection(conn)
+        except Exception:
+            pass
+
+    def health_check(self) -> int:
+        """Check every idle connection now, dropping dead ones. Returns how many were dropped."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        dropped = 0
+        for conn in idle:
+            if self.check is None or self._check(conn):
+                with self._cond:
+                    self._last_used[id(conn)] = time.monotonic()
+                    self._idle.append(conn)
+                    self._cond.notify()
+            else:
+                dropped += 1
+        return dropped
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return dict(self._stats, size=self._size, idle=len(self._idle), in_use=self._size - len(self._idle),
+                        max_size=self.max_size)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            try:
+                self.close_connection(conn)
+            except Exception:
+                pass
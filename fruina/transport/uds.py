@@ -4,10 +4,52 @@ import json
 import struct
 import threading
 import array
+from collections import deque
 from typing import Optional, List, Any, Dict, Tuple
 from ..core.peer import Peer
 from ..core.lease import AccessType
-from .base import Transport
+from .base import Transport, AcquireResult
+from .pool import ConnectionPool
+
+# Framed connections (see UdsServer._serve_framed): Length(I) + JSON body
+FRAME_STRUCT = struct.Struct("!I")
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+# SCM_RIGHTS carries at most 253 fds per message on Linux
+MAX_FDS = 253
+# Objects per acquire_many frame, keeping the fds of one message under MAX_FDS
+BATCH_SIZE = 128
+
+def send_frame(sock: socket.socket, message: dict, fds: List[int] = ()) -> None:
+    body = json.dumps(message).encode('utf-8')
+    data = FRAME_STRUCT.pack(len(body)) + body
+    if not fds:
+        sock.sendall(data)
+        return
+    sent = sock.sendmsg([data], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", fds))])
+    if sent < len(data):
+        sock.sendall(data[sent:])
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            return None
+        buf += chunk
+    return bytes(buf)
+
+def recv_frame(sock: socket.socket) -> Optional[dict]:
+    """Receive one frame; None once the peer has closed the connection."""
+    header = _recv_exact(sock, FRAME_STRUCT.size)
+    if header is None:
+        return None
+    (length,) = FRAME_STRUCT.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {length} bytes exceeds the limit")
+    body = _recv_exact(sock, length)
+    if body is None:
+        return None
+    return json.loads(body.decode('utf-8'))
 
 # --- Server ---
 
@@ -53,6 +95,11 @@ class UdsServer:
     def _handle_client(self, sock: socket.socket):
         try:
             with sock:
+                # Legacy clients send bare JSON; framed clients start with a length
+                first = sock.recv(1, socket.MSG_PEEK)
+                if first and first != b'{':
+                    self._serve_framed(sock)
+                    return
                 while True:
                     data = sock.recv(4096)
                     if not data:
@@ -70,70 +117,128 @@ class UdsServer:
         except Exception as e:
             print(f"Client handler error: {e}")
 
+    def _serve_framed(self, sock: socket.socket):
+        """
+        Persistent, pipelined connection: every request is a frame carrying
+        an "id" that is echoed in its response, errors are reported without
+        closing the connection, and fds travel with the response that lists
+        them in "nfds".
+        """
+        while True:
+            req = recv_frame(sock)
+            if req is None:
+                break
+            try:
+                resp, fds = self._handle(req)
+            except Exception as e:
+                resp, fds = {"status": "error", "message": str(e)}, []
+            resp = dict(resp or {"status": "ok"})
+            resp["id"] = req.get("id")
+            if fds and "results" not in resp:
+                resp["nfds"] = len(fds)
+            send_frame(sock, resp, fds)
+
     def _process_request(self, sock: socket.socket, data: dict):
+        resp, fds = self._handle(data)
+        if resp is None:
+            return
+        if fds:
+            self._send_response_with_fds(sock, resp, fds)
+        else:
+            self._send_response(sock, resp)
+
+    def _handle(self, data: dict) -> Tuple[Optional[dict], List[int]]:
+        """Run one request; returns (response, fds to pass along with it)."""
         cmd = data.get('command')
         
         if cmd == 'acquire':
-            object_id = data.get('object_id')
-            intent = data['intent']
-            ttl = data.get('ttl_seconds')
-            meta = data.get('meta')
-            
-            if intent == 'create':
-                access = AccessType.CREATE
-            elif intent == 'write':
-                access = AccessType.WRITE
-            else:
-                access = AccessType.READ
-            
-            lease, obj = self.peer.acquire(object_id, access, ttl, meta)
-            
-            resp = {
-                "status": "ok",
-                "lease_id": lease.lease_id,
-                "object_id": lease.object_id,
-                "intent": intent
-            }
-            
-            handles = []
-            if obj:
-                handles = [b.get_handle() for b in obj.blobs]
-            
-            fds = []
-            paths = []
-            
-            for h in handles:
-                if isinstance(h, int):
-                    fds.append(h)
-                else:
-                    paths.append(h)
-            
-            if fds:
-                self._send_response_with_fds(sock, resp, fds)
-            else:
-                resp["handles"] = paths
-                self._send_response(sock, resp)
+            return self._acquire(data)
+
+        elif cmd == 'acquire_many':
+            results, fds = [], []
+            for item in data['requests']:
+                try:
+                    resp, item_fds = self._acquire(item)
+                except Exception as e:
+                    resp, item_fds = {"status": "error", "message": str(e)}, []
+                resp["nfds"] = len(item_fds)
+                results.append(resp)
+                fds.extend(item_fds)
+            if len(fds) > MAX_FDS:
+                # Too many for one message; give the leases back
+                for resp in results:
+                    if resp.get("lease_id"):
+                        self.peer.release(resp["lease_id"])
+                raise ValueError(f"Batch would pass {len(fds)} fds; the limit is {MAX_FDS}")
+            return {"status": "ok", "results": results}, fds
 
         elif cmd == 'truncate':
-            pass
+            return None, []
+
+        elif cmd == 'ping':
+            return {"status": "ok"}, []
 
         elif cmd == 'seal':
             lease_id = data['lease_id']
             self.peer.seal(lease_id)
-            self._send_response(sock, {"status": "sealed"})
+            return {"status": "sealed"}, []
 
         elif cmd == 'discard':
             lease_id = data['lease_id']
             self.peer.discard(lease_id)
-            self._send_response(sock, {"status": "discarded"})
+            return {"status": "discarded"}, []
 
         elif cmd == 'release':
             lease_id = data['lease_id']
             self.peer.release(lease_id)
-            self._send_response(sock, {"status": "released"})
+            return {"status": "released"}, []
+
+        elif cmd == 'renew':
+            lost = self.peer.renew_many(data['lease_ids'])
+            return {"status": "renewed", "lost": lost}, []
         
         else:
-            self._send_error(sock, "Unknown command")
+            return {"status": "error", "message": "Unknown command"}, []
+
+    def _acquire(self, data: dict) -> Tuple[dict, List[int]]:
+        object_id = data.get('object_id')
+        intent = data['intent']
+        ttl = data.get('ttl_seconds')
+        meta = data.get('meta')
+        
+        if intent == 'create':
+            access = AccessType.CREATE
+        elif intent == 'write':
+            access = AccessType.WRITE
+        else:
+            access = AccessType.READ
+        
+        lease, obj = self.peer.acquire(object_id, access, ttl, meta)
+        
+        resp = {
+            "status": "ok",
+            "lease_id": lease.lease_id,
+            "object_id": lease.object_id,
+            "intent": intent,
+            "meta": obj.meta if obj else {}
+        }
+        
+        handles = []
+        if obj:
+            handles = [b.get_handle() for b in obj.blobs]
+        
+        fds = []
+        paths = []
+        
+        for h in handles:
+            if isinstance(h, int):
+                fds.append(h)
+            else:
+                paths.append(h)
+        
+        if not fds:
+            resp["handles"] = paths
+        return resp, fds
 
     def _send_response(self, sock: socket.socket, data: dict):
         msg = json.dumps(data).encode('utf-8')
@@ -149,80 +254,125 @@ class UdsServer:
 
 # --- Client ---
 
-class UdsTransport(Transport):
-    def __init__(self, socket_path: str):
-        self.socket_path = socket_path
+class UdsConnection:
+    """One persistent framed connection; a request at a time."""
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(socket_path)
+        except BaseException:
+            self.sock.close()
+            raise
+        self._next_id = 0
 
-    def _connect(self):
-        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        sock.connect(self.socket_path)
-        return sock
+    def call(self, req: dict) -> Tuple[dict, List[int]]:
+        self._next_id += 1
+        send_frame(self.sock, dict(req, id=self._next_id))
+        resp, fds = self._recv_with_fds()
+        if resp.get("id") != self._next_id:
+            for fd in fds:
+                os.close(fd)
+            raise ConnectionError(f"Response {resp.get('id')} does not match request {self._next_id}")
+        return resp, fds
 
-    def _recv_fds(self, sock, msglen, maxfds):
+    def _recv_with_fds(self) -> Tuple[dict, List[int]]:
         fds = array.array("i")
-        msg, ancdata, flags, addr = sock.recvmsg(msglen, socket.CMSG_LEN(maxfds * fds.itemsize))
-        for cmsg_level, cmsg_type, cmsg_data in ancdata:
-            if cmsg_level == socket.SOL_SOCKET and cmsg_type == socket.SCM_RIGHTS:
-                fds.frombytes(cmsg_data[:len(cmsg_data) - (len(cmsg_data) % fds.itemsize)])
-        return msg, list(fds)
+        buf = bytearray()
+        need = FRAME_STRUCT.size
+        while len(buf) < need:
+            msg, ancdata, _, _ = self.sock.recvmsg(need - len(buf), socket.CMSG_SPACE(MAX_FDS * fds.itemsize))
+            for level, kind, data in ancdata:
+                if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+                    fds.frombytes(data[:len(data) - (len(data) % fds.itemsize)])
+            if not msg:
+                for fd in fds:
+                    os.close(fd)
+                raise ConnectionError("Connection closed by server")
+            buf += msg
+            if need == FRAME_STRUCT.size and len(buf) == need:
+                (length,) = FRAME_STRUCT.unpack(buf)
+                if length > MAX_FRAME_SIZE:
+                    raise ValueError(f"Frame of {length} bytes exceeds the limit")
+                need += length
+        return json.loads(bytes(buf[FRAME_STRUCT.size:]).decode('utf-8')), list(fds)
+
+    def ping(self) -> bool:
+        resp, _ = self.call({"command": "ping"})
+        return resp.get("status") == "ok"
+
+    def close(self):
+        self.sock.close()
+
+class UdsTransport(Transport):
+    """
+    Client for a UdsServer. Thread-safe: requests go over a bounded pool of
+    persistent connections (see ConnectionPool), so any number of threads
+    can share one transport.
+    """
+    def __init__(self, socket_path: str, pool_size: int = 16, pool_timeout: float = 30.0,
+                 timeout: Optional[float] = 60.0):
+        self.socket_path = socket_path
+        self.pool = ConnectionPool(lambda: UdsConnection(socket_path, timeout), UdsConnection.close,
+                                   max_size=pool_size, timeout=pool_timeout, check=UdsConnection.ping)
+
+    def _call(self, req: dict) -> Tuple[dict, List[int]]:
+        with self.pool.connection() as conn:
+            resp, fds = conn.call(req)
+        if resp.get("status") == "error":
+            for fd in fds:
+                os.close(fd)
+            raise RuntimeError(resp.get("message"))
+        return resp, fds
 
     def acquire(self, object_id: Optional[str], intent: str, ttl: Optional[float] = None, meta: Optional[Dict] = None) -> Tuple[Dict, List[Any]]:
-        sock = self._connect()
-        try:
-            req = {
-                "command": "acquire",
-                "object_id": object_id,
-                "intent": intent,
-                "ttl_seconds": ttl,
-                "meta": meta
-            }
-            sock.sendall(json.dumps(req).encode('utf-8'))
-            
-            msg, fds = self._recv_fds(sock, 4096, 16)
-            resp = json.loads(msg.decode('utf-8'))
-            
-            if resp.get("status") == "error":
-                raise RuntimeError(resp.get("message"))
-                
-            handles = []
-            if fds:
-                handles = fds
-            else:
-                handles = resp.get("handles", [])
-                
-            return resp, handles
-        finally:
-            sock.close()
+        req = {
+            "command": "acquire",
+            "object_id": object_id,
+            "intent": intent,
+            "ttl_seconds": ttl,
+            "meta": meta
+        }
+        resp, fds = self._call(req)
+        handles = fds if fds else resp.get("handles", [])
+        return resp, handles
+
+    def acquire_many(self, requests: List[Dict[str, Any]]) -> List[AcquireResult]:
+        results: List[AcquireResult] = []
+        for i in range(0, len(requests), BATCH_SIZE):
+            resp, fds = self._call({"command": "acquire_many", "requests": requests[i:i + BATCH_SIZE]})
+            fds = deque(fds)
+            for item in resp["results"]:
+                item_fds = [fds.popleft() for _ in range(item.get("nfds", 0))]
+                if item.get("status") == "error":
+                    results.append(RuntimeError(item.get("message")))
+                else:
+                    results.append((item, item_fds if item_fds else item.get("handles", [])))
+        return results
 
     def seal(self, lease_id: str) -> None:
-        sock = self._connect()
-        try:
-            req = {"command": "seal", "lease_id": lease_id}
-            sock.sendall(json.dumps(req).encode('utf-8'))
-            resp = json.loads(sock.recv(4096).decode('utf-8'))
-            if resp.get("status") == "error":
-                raise RuntimeError(resp.get("message"))
-        finally:
-            sock.close()
+        self._call({"command": "seal", "lease_id": lease_id})
 
     def discard(self, lease_id: str) -> None:
-        sock = self._connect()
-        try:
-            req = {"command": "discard", "lease_id": lease_id}
-            sock.sendall(json.dumps(req).encode('utf-8'))
-            resp = json.loads(sock.recv(4096).decode('utf-8'))
-            if resp.get("status") == "error":
-                raise RuntimeError(resp.get("message"))
-        finally:
-            sock.close()
+        self._call({"command": "discard", "lease_id": lease_id})
 
     def release(self, lease_id: str) -> None:
-        sock = self._connect()
+        self._call({"command": "release", "lease_id": lease_id})
+
+    def renew(self, lease_ids: List[str]) -> List[str]:
+        resp, _ = self._call({"command": "renew", "lease_ids": list(lease_ids)})
+        return resp.get("lost", [])
+
+    def stats(self) -> Dict[str, Any]:
+        return self.pool.stats()
+
+    def health_check(self) -> bool:
+        self.pool.health_check()
         try:
-            req = {"command": "release", "lease_id": lease_id}
-            sock.sendall(json.dumps(req).encode('utf-8'))
-            resp = json.loads(sock.recv(4096).decode('utf-8'))
-            if resp.get("status") == "error":
-                raise RuntimeError(resp.get("message"))
-        finally:
-            sock.close()
+            with self.pool.connection() as conn:
+                return conn.ping()
+        except (OSError, ValueError, RuntimeError):
+            return False
+
+    def close(self) -> None:
+        self.pool.close()